@@ -1,9 +1,15 @@
 import configparser
+import hashlib
+import json
 from flask import Flask, render_template_string, request, redirect, url_for, flash
 import os # 👈 AJOUTÉ : Importation nécessaire pour exécuter la commande système
 
 # --- Configuration (MAIN CHANGES HERE) ---
 INI_FILE_PATH = "/home/owl/owl/config/DAY_SENSITIVITY_2.ini"
+# Fichier d'état écrit par OWL après chaque rechargement à chaud de la configuration
+STATUS_FILE_PATH = os.path.splitext(INI_FILE_PATH)[0] + ".status.json"
+# Port du serveur intégré à OWL ([Server] port) qui diffuse l'aperçu des détections
+OWL_SERVER_PORT = 8001
 
 # Définition des clés à modifier dans une liste de dictionnaires.
 CONFIG_KEYS = [
@@ -19,6 +25,24 @@ app = Flask(__name__)
 app.secret_key = 'une_cle_secrete_aleatoire'
 
 
+def read_owl_status():
+    """Lit l'état de la configuration appliquée par OWL et indique si le fichier actuel a été pris en compte."""
+    try:
+        with open(STATUS_FILE_PATH) as status_file:
+            status = json.load(status_file)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        with open(INI_FILE_PATH, 'rb') as ini_file:
+            current_sha1 = hashlib.sha1(ini_file.read()).hexdigest()
+    except OSError:
+        current_sha1 = None
+
+    status['pending'] = status.get('sha1') != current_sha1
+    return status
+
+
 # --- La page web principale (l'interface) ---
 @app.route('/', methods=['GET', 'POST'])
 def config_page():
@@ -50,14 +74,16 @@ def config_page():
                 config.set(section, key, new_value)
         
         # 3. Écrire les modifications dans le fichier .ini (après avoir tout mis à jour)
+        # On écrit dans un fichier temporaire puis on le renomme : OWL ne lit jamais un fichier à moitié écrit.
         try:
-            with open(INI_FILE_PATH, 'w') as configfile:
+            tmp_path = INI_FILE_PATH + ".tmp"
+            with open(tmp_path, 'w') as configfile:
                 config.write(configfile)
-                
-            # Au lieu d'afficher le message de succès et de rediriger vers la page principale,
-            # nous redirigeons vers la nouvelle route de redémarrage.
-            flash("Succès ! Configuration sauvegardée. Redémarrage en cours...", 'success')
-            return redirect(url_for('reboot_now')) # 👈 MODIFICATION CLÉ
+            os.replace(tmp_path, INI_FILE_PATH)
+
+            # OWL surveille le fichier et applique la nouvelle configuration sans redémarrage.
+            flash("Succès ! Configuration sauvegardée. OWL l'appliquera dans quelques secondes.", 'success')
+            return redirect(url_for('config_page'))
             
         except Exception as e:
             flash(f"Erreur lors de l'écriture du fichier : {e}", 'error')
@@ -112,6 +138,9 @@ def config_page():
             .flash { padding: 10px; margin-bottom: 15px; border-radius: 6px; font-weight: bold; }
             .flash.success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
             .flash.error { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
+            .flash.pending { background: #fff3cd; color: #856404; border: 1px solid #ffeeba; }
+            .status { margin-bottom: 20px; color: #555; }
+            .reboot { display: block; text-align: center; margin-top: 15px; color: #888; }
         </style>
     </head>
     <body>
@@ -126,6 +155,17 @@ def config_page():
               {% endif %}
             {% endwith %}
 
+            {% if owl_status %}
+            <div class="status">
+                {% if owl_status.status == 'rejected' %}
+                  <div class="flash error">Configuration refusée par OWL : {{ owl_status.error }}</div>
+                {% elif owl_status.pending %}
+                  <div class="flash pending">En attente d'application par OWL...</div>
+                {% endif %}
+                Version appliquée : <b>{{ owl_status.version }}</b> ({{ owl_status.timestamp }})
+            </div>
+            {% endif %}
+
             <form method="POST">
                 
                 {% for item in config_data %}
@@ -144,14 +184,18 @@ def config_page():
                 </div>
                 {% endfor %}
 
-                <button type="submit">Enregistrer et Redémarrer le Raspberry Pi</button> </form>
+                <button type="submit">Enregistrer et Appliquer</button> </form>
+            <a class="reboot" href="{{ preview_url }}" target="_blank">Aperçu en direct des détections</a>
+            <a class="reboot" href="{{ url_for('reboot_now') }}">Redémarrer le Raspberry Pi</a>
         </div>
     </body>
     </html>
     """
     
     # Rendre le HTML en lui passant la liste complète des données
-    return render_template_string(HTML_TEMPLATE, config_data=config_data)
+    preview_url = f"http://{request.host.split(':')[0]}:{OWL_SERVER_PORT}/preview"
+    return render_template_string(HTML_TEMPLATE, config_data=config_data, owl_status=read_owl_status(),
+                                  preview_url=preview_url)
 
 
 # 🟢 NOUVELLE ROUTE : Gère l'exécution de la commande de redémarrage
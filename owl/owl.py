@@ -5,10 +5,16 @@ import sys
 import numpy as np
 import logging
 import argparse
+import json
 import time
 from datetime import datetime
 from multiprocessing import Process, Value
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from threading import Thread
+
+# process start time for the startup profile
+STARTUP_TIME = time.perf_counter()
 
 def get_python_env():
     """Get current Python environment status"""
@@ -63,14 +69,15 @@ try:
 
    from utils.input_manager import UteController, AdvancedController, get_rpi_version
    from utils.output_manager import RelayController, HeadlessStatusIndicator, UteStatusIndicator, AdvancedStatusIndicator
-   from utils.directory_manager import DirectorySetup
+   from utils.output_manager import GroupedRelayController, relay_backend
    from utils.video_manager import VideoStream
-   from utils.image_sampler import ImageRecorder
-   from utils.algorithms import fft_blur
    from utils.greenonbrown import GreenOnBrown
-   from utils.frame_reader import FrameReader
-   from utils.config_manager import ConfigValidator
+   from utils.actuation import ActuationPolicy, LaneMapper, parse_class_filter
+   from utils.camera_array import parse_cameras
+   from utils.clock import SystemClock
+   from utils.config_manager import ConfigValidator, ConfigWatcher
    from utils.log_manager import LogManager
+   from utils.startup_profiler import StartupProfiler
    import utils.error_manager as errors
    from version import SystemInfo, VERSION
 
@@ -84,14 +91,29 @@ except ImportError as e:
 
 logger.info("All required modules imported successfully")
 
+# optional features (data collection, recording, metrics server, preview) import their modules when enabled
+startup_profiler = StartupProfiler(start=STARTUP_TIME)
+startup_profiler.mark('imports')
+
 def nothing(x):
     pass
 
 class Owl:
+    # settings POST /settings may change, plain values read by the detection loop every frame. The actuation policy,
+    # lane mapping and algorithm are built from the config and change with a config reload.
+    MUTABLE_SETTINGS = {'actuation_duration', 'delay', 'confidence', 'exg_min', 'exg_max', 'hue_min', 'hue_max',
+                        'saturation_min', 'saturation_max', 'brightness_min', 'brightness_max', 'min_detection_area',
+                        'invert_hue'}
+
+    # [System] keys only read at startup, a config reload reports them as needing a restart
+    RESTART_REQUIRED_SYSTEM_KEYS = {'relay_num', 'input_file_or_directory', 'relay_backend', 'fast_start', 'hot_reload'}
+
     def __init__(self, show_display=False,
                  focus=False,
                  input_file_or_directory=None,
-                 config_file='config/DAY_SENSITIVITY_2.ini'):
+                 config_file='config/DAY_SENSITIVITY_2.ini',
+                 fast_start=None,
+                 clock=None):
         # set up the logger
         log_dir = Path(os.path.join(os.path.dirname(__file__), 'logs'))
         LogManager.setup(
@@ -100,17 +122,36 @@ class Owl:
         self.logger = LogManager.get_logger(__name__)
 
         self.logger.info("Initializing OWL...")
-        self._log_system_info()
+        # relay timing, frame pacing and start-up waits run on this clock, a VirtualClock for simulated passes
+        self.clock = clock or SystemClock()
+        self.startup_profiler = startup_profiler
 
         # read the config file
         self._config_path = Path(__file__).parent / config_file
         try:
-            self.config = ConfigValidator.load_and_validate_config(self._config_path)
+            with self.startup_profiler.stage('config'):
+                self.config = ConfigValidator.load_and_validate_config(self._config_path)
         except errors.OWLConfigError as e:
             self.logger.error(f"Configuration error: {e}", exc_info=True)
             raise
 
         self.config.read(self._config_path)
+
+        # the model is the slowest part of startup, so it loads and runs a warm-up inference in the background while
+        # the relays and camera are set up. hoot waits for it to be ready.
+        self._startup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='OwlStartup')
+        self.weed_detector = None
+        self._detector_future = self._startup_pool.submit(self._load_detector)
+
+        # fast start: the camera also opens in the background, camera warm-up and settle delays are skipped and
+        # the system information is read from a cache. Set on the command line with --fast-start or in the config.
+        if fast_start is None:
+            fast_start = self.config.getboolean('System', 'fast_start', fallback=False)
+        self.fast_start = fast_start
+
+        with self.startup_profiler.stage('system_info'):
+            self._log_system_info(cache_path=log_dir / 'system_info.json' if fast_start else None)
+
         self.RPI_VERSION = get_rpi_version()
         self.logger.info(msg=f'Raspberry Pi version: {self.RPI_VERSION}')
 
@@ -124,15 +165,8 @@ class Owl:
         if self.focus:
             self.show_display = True
 
-        # threshold parameters for different algorithms
-        self.exg_min = self.config.getint('GreenOnBrown', 'exg_min')
-        self.exg_max = self.config.getint('GreenOnBrown', 'exg_max')
-        self.hue_min = self.config.getint('GreenOnBrown', 'hue_min')
-        self.hue_max = self.config.getint('GreenOnBrown', 'hue_max')
-        self.saturation_min = self.config.getint('GreenOnBrown', 'saturation_min')
-        self.saturation_max = self.config.getint('GreenOnBrown', 'saturation_max')
-        self.brightness_min = self.config.getint('GreenOnBrown', 'brightness_min')
-        self.brightness_max = self.config.getint('GreenOnBrown', 'brightness_max')
+        # threshold parameters for different algorithms, actuation timing and detection confidence
+        self._load_runtime_settings(self.config)
 
         # time spent on each image when looping over a directory
         self.image_loop_time = self.config.getint('Visualisation', 'image_loop_time')
@@ -155,6 +189,33 @@ class Owl:
                            self.config.getint('Camera', 'resolution_height'))
         self.exp_compensation = self.config.getint('Camera', 'exp_compensation')
 
+        # Check which Raspberry Pi is being used and adjust the resolution accordingly.
+        # Use `cat /proc-device-tree/model` to check the model of the Raspberry Pi.
+        total_pixels = self.resolution[0] * self.resolution[1]
+
+        if (self.RPI_VERSION in ['rpi-3', 'rpi-4']) and total_pixels > (832 * 640):
+            # change here if you want to test higher resolutions, but be warned, backup your current image!
+            self.resolution = (640, 480)
+            self.logger.warning(f"Resolution {self.config.getint('Camera', 'resolution_width')}, "
+                                 f"{self.config.getint('Camera', 'resolution_height')} selected is dangerously high. ")
+        else:
+            self.logger.warning(f'High resolution, expect low framerate. Resolution set to {self.resolution[0]}x{self.resolution[1]}.')
+
+        # check if test video or videostream from camera
+        # is the source a directory/file
+        if len(self.config.get('System', 'input_file_or_directory')) > 0:
+            self.input_file_or_directory = self.config.get('System', 'input_file_or_directory')
+
+        self.input_file_or_directory = input_file_or_directory
+
+        if len(self.config.get('System', 'input_file_or_directory')) > 0 and input_file_or_directory is not None:
+            self.logger.warning('[WARNING] two paths to image/videos provided. Defaulting to the command line flag.')
+
+        # several cameras across the boom, each driving its own relays. A file or directory source takes precedence
+        self.cameras = [] if self.input_file_or_directory else parse_cameras(self.config)
+
+        camera_future = self._startup_pool.submit(self._open_camera) if fast_start else None
+
         # Relay Dict maps the reference relay number to a boardpin on the embedded device
         self.relay_dict = {}
 
@@ -162,9 +223,34 @@ class Owl:
         for key, value in self.config['Relays'].items():
             self.relay_dict[int(key)] = int(value)
 
+        # as-applied map of relay on intervals, summarised with utils.spray_map
+        self.spray_map = None
+        if self.config.getboolean('SprayMap', 'enable', fallback=False):
+            from utils.spray_map import SprayMap, location_from_config
+
+            self.spray_map = SprayMap(directory=log_dir / 'spray_maps',
+                                      relay_num=self.config.getint('System', 'relay_num'),
+                                      boom_width=self.config.getfloat('SprayMap', 'boom_width'),
+                                      location=location_from_config(self.config, clock=self.clock),
+                                      clock=self.clock)
+
         # instantiate the relay controller - successful start should beep the buzzer
         try:
-            self.relay_controller = RelayController(relay_dict=self.relay_dict)
+            with self.startup_profiler.stage('relays'):
+                # lgpio switches every relay that changes at the same time in one group write
+                backend = relay_backend(self.config.get('System', 'relay_backend', fallback='gpiozero'),
+                                        self.relay_dict, clock=self.clock)
+                if backend is not None:
+                    self.relay_controller = GroupedRelayController(relay_dict=self.relay_dict,
+                                                                   backend=backend,
+                                                                   settle_time=0 if fast_start else 1.0,
+                                                                   spray_map=self.spray_map,
+                                                                   clock=self.clock)
+                else:
+                    self.relay_controller = RelayController(relay_dict=self.relay_dict,
+                                                            settle_time=0 if fast_start else 1.0,
+                                                            spray_map=self.spray_map,
+                                                            clock=self.clock)
         except errors.OWLAlreadyRunningError:
             self.logger.critical("OWL initialization failed: GPIO pin conflict. Another OWL instance may be running.",
                                  exc_info=True)
@@ -195,18 +281,47 @@ class Owl:
             self.save_directory = self.config.get('DataCollection', 'save_directory')
             self.camera_name = self.config.get('DataCollection', 'camera_name')
 
+            from utils.directory_manager import DirectorySetup
+            from utils.image_sampler import ImageRecorder
+
             self.directory_manager = DirectorySetup(save_directory=self.save_directory)
             self.save_directory, self.save_subdirectory = self.directory_manager.setup_directories()
 
             self.image_recorder = ImageRecorder(save_directory=self.save_subdirectory, mode=self.sample_method)
+
+        # sample_images says the recorder was set up, recording_images whether frames are sent to it right now. The
+        # controller's recording switch and a full drive only change the latter.
+        self.recording_images = self.sample_images
+
+        # binary detection records, read back with utils.detection_sink.load_detections
+        self.detection_sink = None
+        if self.config.getboolean('DataCollection', 'log_detections', fallback=False):
+            from utils.detection_sink import DetectionSink
+            self.detection_sink = DetectionSink(directory=log_dir / 'detections')
+
+        # frames, detections and relay events in one file, replayed with python -m utils.session <file> --replay
+        self.session_recorder = None
+        if self.config.getboolean('DataCollection', 'record_session', fallback=False):
+            from utils.session import SessionRecorder
+            self.session_recorder = SessionRecorder(
+                directory=log_dir / 'sessions',
+                config=self.config,
+                compression=self.config.get('DataCollection', 'session_compression', fallback='png'),
+                clock=self.clock)
+            self.relay_controller.relay_listeners.append(self.session_recorder)
         ############################
 
         # initialise controller buttons and async management
+        self.sensitivity_profiles = None
         if self.controller_type != 'none':
             self.detection_state = Value('b', False)
             self.sample_state = Value('b', False)
             self.stop_flag = Value('b', False)
 
+            # the controller runs in its own process, its switch changes reach the detection loop through here
+            from utils.control_block import ControlBlock
+            self.control_block = ControlBlock()
+
             # 'ute controller' that fits in a cupholder. Only one switch to toggle recording OR detection on/off.
             if self.controller_type == 'ute':
                 self.status_indicator = UteStatusIndicator(
@@ -221,7 +336,7 @@ class Owl:
                     detection_state=self.detection_state,
                     sample_state=self.sample_state,
                     stop_flag=self.stop_flag,
-                    owl_instance=self,
+                    control_block=self.control_block,
                     status_indicator=self.status_indicator,
                     switch_board_pin=f'BOARD{self.switch_pin}',
                     switch_purpose=self.switch_purpose
@@ -239,18 +354,18 @@ class Owl:
                 sensitivity_pin = self.config.getint('Controller', 'sensitivity_pin')
                 detection_mode_pin_up = self.config.getint('Controller', 'detection_mode_pin_up')
                 detection_mode_pin_down = self.config.getint('Controller', 'detection_mode_pin_down')
-                low_sensitivity_config = self.config.get('Controller', 'low_sensitivity_config')
-                high_sensitivity_config = self.config.get('Controller', 'high_sensitivity_config')
+
+                # both sensitivity configs are compiled now, the sensitivity switch only selects one
+                from utils.sensitivity import SensitivityProfiles
+                self.sensitivity_profiles = SensitivityProfiles.from_config(self.config, confidence=self.confidence)
 
                 self.controller = AdvancedController(
                     recording_state=self.sample_state,
                     sensitivity_state=self.sensitivity_state,
                     detection_mode_state=self.detection_mode_state,
                     stop_flag=self.stop_flag,
-                    owl_instance=self,
+                    control_block=self.control_block,
                     status_indicator=self.status_indicator,
-                    low_sensitivity_config=low_sensitivity_config,
-                    high_sensitivity_config=high_sensitivity_config,
                     recording_bpin=f'BOARD{recording_pin}',
                     sensitivity_bpin=f'BOARD{sensitivity_pin}',
                     detection_mode_bpin_up=f'BOARD{detection_mode_pin_up}',
@@ -266,41 +381,18 @@ class Owl:
 
         else:
             self.controller = None
+            self.control_block = None
             if self.sample_images:
-                self.status_indicator = HeadlessStatusIndicator(save_directory=self.save_directory)
+                self.status_indicator = HeadlessStatusIndicator(save_directory=self.save_directory, clock=self.clock)
                 self.status_indicator.start_storage_indicator()
 
             else:
-                self.status_indicator = HeadlessStatusIndicator(save_directory=None, no_save=True)
+                self.status_indicator = HeadlessStatusIndicator(save_directory=None, no_save=True, clock=self.clock)
 
         self.relay_vis = None
 
-        # Check which Raspberry Pi is being used and adjust the resolution accordingly.
-        # Use `cat /proc-device-tree/model` to check the model of the Raspberry Pi.
-        total_pixels = self.resolution[0] * self.resolution[1]
-
-        if (self.RPI_VERSION in ['rpi-3', 'rpi-4']) and total_pixels > (832 * 640):
-            # change here if you want to test higher resolutions, but be warned, backup your current image!
-            self.resolution = (640, 480)
-            self.logger.warning(f"Resolution {self.config.getint('Camera', 'resolution_width')}, "
-                                 f"{self.config.getint('Camera', 'resolution_height')} selected is dangerously high. ")
-        else:
-            self.logger.warning(f'High resolution, expect low framerate. Resolution set to {self.resolution[0]}x{self.resolution[1]}.')
-
-        # check if test video or videostream from camera
-        # is the source a directory/file
-        if len(self.config.get('System', 'input_file_or_directory')) > 0:
-            self.input_file_or_directory = self.config.get('System', 'input_file_or_directory')
-
-        self.input_file_or_directory = input_file_or_directory
-
-        if len(self.config.get('System', 'input_file_or_directory')) > 0 and input_file_or_directory is not None:
-            self.logger.warning('[WARNING] two paths to image/videos provided. Defaulting to the command line flag.')
-
         if self.input_file_or_directory:
-            self.cam = FrameReader(path=self.input_file_or_directory,
-                                   resolution=self.resolution,
-                                   loop_time=self.image_loop_time)
+            self.cam = camera_future.result() if camera_future else self._open_camera()
             self.frame_width, self.frame_height = self.cam.resolution
 
             self.logger.info(f'[INFO] Using {self.cam.input_type} from {self.input_file_or_directory}...')
@@ -308,9 +400,7 @@ class Owl:
         # if no video, start the camera with the provided parameters
         else:
             try:
-                self.cam = VideoStream(resolution=self.resolution,
-                                       exp_compensation=self.exp_compensation)
-                self.cam.start()
+                self.cam = camera_future.result() if camera_future else self._open_camera()
 
                 self.frame_width = self.cam.frame_width
                 self.frame_height = self.cam.frame_height
@@ -323,7 +413,7 @@ class Owl:
                 missing_module = str(e).split("'")[-2]
                 error_message = f"Missing required module: {missing_module}. Please install it and try again."
                 self.status_indicator.error(1)
-                time.sleep(2)
+                self.clock.sleep(2)
                 raise ModuleNotFoundError(error_message) from None
 
             except Exception as e:
@@ -331,13 +421,14 @@ class Owl:
                 self.logger.info(error_detail)
                 self.relay_controller.relay.beep(duration=1, repeats=1)
                 self.status_indicator.error(1)
-                time.sleep(5)
+                self.clock.sleep(5)
 
                 sys.exit(1)
 
-        time.sleep(1.0)
+        if not fast_start:
+            self.clock.sleep(1.0)
 
-        # sensitivity and weed size to be added
+        # name of the active sensitivity profile, weed size to be added
         self.sensitivity = None
         self.lane_coords = {}
 
@@ -357,59 +448,133 @@ class Owl:
         self.lane_coords_int = {k: int(v) for k, v in self.lane_coords.items()}
         self.lane_starts = np.array([self.lane_coords_int[i] for i in range(self.relay_num)])
         self.lane_ends = self.lane_starts + self.lane_width
+        self.relay_map = np.arange(self.relay_num)
+
+        # with several cameras each camera's width is split between its own relays
+        if self.cameras:
+            self.lane_starts, self.lane_ends, self.relay_map = self.cam.lane_bounds()
+            self.camera_offsets = [i * self.cam.camera_width for i in range(len(self.cameras))]
+
+        self.lane_mapper = LaneMapper.from_config(self.config, self.lane_starts, self.lane_ends, self.frame_height)
+
+        # watch the config file so changes made from the web interface apply without a reboot
+        self.config_watcher = None
+        if self.config.getboolean('System', 'hot_reload', fallback=True):
+            self.config_watcher = ConfigWatcher(self._config_path, prepare=self._prepare_config)
+
+        # embedded HTTP/JSON endpoint for live metrics and runtime setting changes
+        self.metrics = None
+        self.metrics_server = None
+        self.preview = None
+        if self.config.getboolean('Server', 'enable', fallback=False):
+            from utils.metrics_server import MetricsServer, OwlMetrics
+
+            try:
+                self.metrics = OwlMetrics()
+                self.metrics_server = MetricsServer(snapshot=self._metrics_snapshot,
+                                                    settings=self._runtime_settings,
+                                                    validate_settings=self._validate_settings,
+                                                    host=self.config.get('Server', 'host', fallback='0.0.0.0'),
+                                                    port=self.config.getint('Server', 'port', fallback=8001))
+            except OSError as e:
+                self.logger.error(f"[ERROR] Could not start metrics server, continuing without it: {e}")
+                self.metrics = None
+                self.metrics_server = None
+
+        # MJPEG preview of the detections, served by the metrics server at /preview
+        if self.metrics_server and self.config.getboolean('Server', 'preview', fallback=False):
+            from utils.preview_stream import PreviewStream
+
+            self.preview = PreviewStream(max_fps=self.config.getfloat('Server', 'preview_fps', fallback=5.0),
+                                         width=self.config.getint('Server', 'preview_width', fallback=480),
+                                         quality=self.config.getint('Server', 'preview_quality', fallback=60))
+            self.metrics_server.add_route('GET', '/preview', self.preview.handle_page)
+            self.metrics_server.add_route('GET', '/preview.mjpg', self.preview.handle_stream)
+
+        if self.metrics_server:
+            self.metrics_server.add_route('POST', '/recording', self._handle_recording_request)
 
     def hoot(self):
-        self.record_video = False  # Flag to control video recording
-        self.video_writer = None
+        # video recording is toggled with 'r' on the display, or with POST /recording on the metrics server
+        self.record_video = self.config.getboolean('Recorder', 'record_on_start', fallback=False)
+        self.video_recorder = None
 
-        algorithm = self.config.get('System', 'algorithm')
         log_fps = self.config.getboolean('DataCollection', 'log_fps')
         if self.controller:
             self.controller.update_state()
 
         # track FPS and framecount
         frame_count = 0
+        frame_id = 0
 
         if log_fps:
             fps = FPS().start()
 
-        try:
-            if algorithm == 'gog':
-                from utils.greenongreen import GreenOnGreen
-                model_path = self.config.get('GreenOnGreen', 'model_path')
-                confidence = self.config.getfloat('GreenOnGreen', 'confidence')
+        if self.focus:
+            from utils.sharpness import SharpnessEngine
 
-                weed_detector = GreenOnGreen(model_path=model_path)
+            sharpness = SharpnessEngine.from_config(self.config)
 
-            else:
-                min_detection_area = self.config.getint('GreenOnBrown', 'min_detection_area')
-                invert_hue = self.config.getboolean('GreenOnBrown', 'invert_hue')
+        try:
+            wait_start = time.perf_counter()
+            self.weed_detector = self._detector_future.result()
+            waited = time.perf_counter() - wait_start
+            if waited > 0.1:
+                self.logger.info(f"[INFO] Waited {waited:.2f} s for the detection model to be ready.")
 
-                weed_detector = GreenOnBrown(algorithm=algorithm)
+            self.detector_settings = self._detector_settings(self.config)
+            if self.sensitivity_profiles:
+                self.sensitivity_profiles.register(self.weed_detector)
 
         except (ModuleNotFoundError, IndexError, FileNotFoundError, ValueError) as e:
-            algo_error = errors.AlgorithmError(algorithm, e)
+            algo_error = errors.AlgorithmError(self.algorithm, e)
             algo_error.handle(self)
 
         except Exception as e:
-            algo_error = errors.AlgorithmError(algorithm, e)
+            algo_error = errors.AlgorithmError(self.algorithm, e)
             algo_error.handle(self)
 
+        if self.config_watcher:
+            self.config_watcher.start()
+
+        if self.metrics_server:
+            self.metrics_server.start()
+
+        if self.preview:
+            self.preview.start()
+
         if self.show_display:
             self.relay_vis = self.relay_controller.relay_vis
             self.relay_vis.setup()
             self.relay_controller.vis = True
 
-        try:
-            actuation_duration = self.config.getfloat('System', 'actuation_duration')
-            delay = self.config.getfloat('System', 'delay')
+        self._startup_pool.shutdown(wait=False)
+        awaiting_first_spray = True
 
+        try:
             while True:
-                frame = self.cam.read()
+                loop_start = time.perf_counter()
 
-                if self.focus:
-                    grey = cv2.cvtColor(frame.copy(), cv2.COLOR_BGR2GRAY)
-                    blurriness = fft_blur(grey, size=30)
+                # apply any config changes between frames so a frame never sees a half-updated config
+                if self.config_watcher:
+                    reloaded = self.config_watcher.poll()
+                    if reloaded:
+                        self._apply_config(*reloaded)
+
+                if self.metrics_server:
+                    changes = self.metrics_server.poll_settings()
+                    if changes:
+                        self._apply_settings(changes)
+
+                # one version check per frame, the controller switches rarely change anything
+                if self.control_block:
+                    control = self.control_block.poll()
+                    if control:
+                        self._apply_control(control)
+
+                frame = self.cam.read()
+                capture_time = self.clock.time()
+                capture_done = detection_done = actuation_done = time.perf_counter()
 
                 if frame is None:
                     if log_fps:
@@ -422,6 +587,16 @@ class Owl:
                         self.stop()
                         break
 
+                if self.session_recorder:
+                    self.session_recorder.add_frame(frame_id, frame, capture_time)
+
+                if self.focus:
+                    focus_values = sharpness.update(frame)
+
+                if frame_id == 0:
+                    self.startup_profiler.mark('first_frame')
+                    self.startup_profiler.report()
+
                 # retrieve the trackbar positions for thresholds
                 if self.show_display:
                     self.exg_min = cv2.getTrackbarPos("ExG-Min", self.window_name)
@@ -435,13 +610,25 @@ class Owl:
 
                 # pass image, thresholds to green_on_brown function
                 if not self.disable_detection:
-                    if algorithm == 'gog':
-                        cnts, boxes, weed_centres, image_out = weed_detector.inference(frame,
-                                                                                       confidence=confidence,
-                                                                                       show_display=self.show_display)
+                    if self.algorithm == 'gog' and self.cameras:
+                        # one batched prediction for all cameras, boxes are returned in mosaic coordinates
+                        cnts, boxes, weed_centres, images_out = self.weed_detector.inference_batch(
+                            self.cam.split(frame),
+                            confidence=self.confidence,
+                            show_display=self.show_display,
+                            classes=self.class_filter,
+                            offsets=self.camera_offsets)
+                        image_out = np.hstack(images_out) if self.show_display else None
+
+                    elif self.algorithm == 'gog':
+                        cnts, boxes, weed_centres, image_out = self.weed_detector.inference(
+                            frame,
+                            confidence=self.confidence,
+                            show_display=self.show_display,
+                            classes=self.class_filter)
 
                     else:
-                        cnts, boxes, weed_centres, image_out = weed_detector.inference(
+                        cnts, boxes, weed_centres, image_out = self.weed_detector.inference(
                             frame,
                             exg_min=self.exg_min,
                             exg_max=self.exg_max,
@@ -452,37 +639,83 @@ class Owl:
                             brightness_min=self.brightness_min,
                             brightness_max=self.brightness_max,
                             show_display=self.show_display,
-                            min_detection_area=min_detection_area,
-                            invert_hue=invert_hue,
+                            min_detection_area=self.min_detection_area,
+                            invert_hue=self.invert_hue,
                             label='WEED'
                         )
 
+                    detection_done = time.perf_counter()
+                    if frame_id == 0:
+                        first_detection_ms = 1000 * (detection_done - capture_done)
+                        self.logger.info(f"[INFO] First frame detection took {first_detection_ms:.0f} ms")
+
+                    if self.detection_sink and len(boxes) > 0:
+                        # the relay of each box under the configured lane mapping, -1 when it activates none
+                        lanes = self.lane_mapper.box_lanes(boxes)
+                        lanes = np.where(lanes >= 0, self.relay_map[lanes], -1)
+                        self.detection_sink.write(frame_id=frame_id,
+                                                  timestamp=capture_time,
+                                                  boxes=boxes,
+                                                  centres=weed_centres,
+                                                  lanes=lanes,
+                                                  confidences=getattr(self.weed_detector, 'confidences', None),
+                                                  class_ids=getattr(self.weed_detector, 'class_ids', None))
+
                     if len(weed_centres) > 0:
                         if self.controller:
                             self.controller.weed_detect_indicator()
 
                         weed_centres_array = np.array(weed_centres)
-                        filtered_centres = weed_centres_array[weed_centres_array[:, 1] > self.yAct]
+                        actuate = weed_centres_array[:, 1] > self.yAct
+                        durations = np.full(len(weed_centres_array), self.actuation_duration)
+
+                        # per-class and per-confidence durations and minimum box sizes
+                        if self.actuation_policy.active:
+                            keep, durations = self.actuation_policy.apply(
+                                boxes,
+                                confidences=getattr(self.weed_detector, 'confidences', None),
+                                class_ids=getattr(self.weed_detector, 'class_ids', None),
+                                duration=self.actuation_duration)
+                            actuate &= keep
+
+                        # every lane each box overlaps, with the longest duration of the boxes in that lane
+                        active_lanes, lane_durations = self.lane_mapper.map(np.asarray(boxes)[actuate],
+                                                                            durations[actuate])
 
                     else:
-                        filtered_centres = []
-
-                    # Iterate over filtered centres
-                    for centre in filtered_centres:
-                        centre_x = centre[0]
-                        matching_lanes = np.where((self.lane_starts <= centre_x) & (centre_x < self.lane_ends))[0]
-
-                        actuation_time = time.time()
-                        for lane in matching_lanes:
-                            self.relay_controller.receive(
-                                relay=lane,
-                                delay=delay,
-                                time_stamp=actuation_time,
-                                duration=actuation_duration)
+                        active_lanes, lane_durations = [], []
+
+                    actuation_time = self.clock.time()
+                    for lane, duration in zip(active_lanes, lane_durations):
+                        self.relay_controller.receive(
+                            relay=int(self.relay_map[lane]),
+                            delay=self.delay,
+                            time_stamp=actuation_time,
+                            duration=float(duration))
+                    self.relay_controller.commit()
+
+                    if self.session_recorder:
+                        self.session_recorder.add_detections(frame_id, actuation_time, boxes,
+                                                             relays=[self.relay_map[lane] for lane in active_lanes],
+                                                             durations=lane_durations,
+                                                             delay=self.delay)
+
+                    if awaiting_first_spray and len(active_lanes) > 0:
+                        awaiting_first_spray = False
+                        self.logger.info(f"[INFO] Time to first spray: "
+                                         f"{self.startup_profiler.mark('first_spray'):.2f} s after launch")
+
+                    actuation_done = time.perf_counter()
+
+                # only hands over a reference, the preview thread does the resizing, drawing and encoding
+                if self.preview and self.preview.clients:
+                    self.preview.submit(frame,
+                                        boxes=None if self.disable_detection else boxes,
+                                        text=f'{self.algorithm} | {self.metrics.fps:.1f} FPS')
 
                 ##### IMAGE SAMPLER #####
                 # record sample images if required of weeds detected. sampleFreq specifies how often
-                if self.sample_images:
+                if self.recording_images:
                     # only record every sampleFreq number of frames. If sample_frequency = 60, this will activate every 60th frame
                     if frame_count % self.sample_frequency == 0:
                         if self.sample_method == 'whole':
@@ -498,11 +731,22 @@ class Owl:
                             self.status_indicator.image_write_indicator()
 
                         if self.status_indicator.DRIVE_FULL:
-                            self.sample_images = False
+                            self.recording_images = False
                             self.image_recorder.stop()
                             self.status_indicator.error(5)
 
+                ##### VIDEO RECORDER #####
+                # frames are queued with their capture time, encoding happens on the recorder thread
+                if self.record_video != (self.video_recorder is not None):
+                    self._toggle_video_recorder()
+
+                if self.video_recorder:
+                    self.video_recorder.add_frame(frame, capture_time,
+                                                  boxes=None if self.disable_detection else boxes,
+                                                  centres=None if self.disable_detection else weed_centres)
+
                 frame_count = frame_count + 1 if frame_count < 900 else 1
+                frame_id += 1
 
                 if log_fps and frame_count % 100 == 0:
                     fps.stop()
@@ -517,43 +761,31 @@ class Owl:
                     if self.disable_detection:
                         image_out = frame.copy()
 
-                    if self.record_video:
-                        if self.video_writer is None:
-                            # Initialize video writer
-                            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            video_filename = f"owl_recording_{timestamp}.mp4"
-                            self.video_writer = cv2.VideoWriter(video_filename, fourcc, 30.0,
-                                                                (frame.shape[1], frame.shape[0]))
-
-                        # Write the frame with detections
-                        self.video_writer.write(image_out)
-
-                    cv2.putText(image_out, f'OWL-gorithm: {algorithm}', (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.75,
+                    cv2.putText(image_out, f'OWL-gorithm: {self.algorithm}', (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.75,
                                 (80, 80, 255), 1)
-                    cv2.putText(image_out, f'Press "S" to save {algorithm} thresholds to file.',
+                    cv2.putText(image_out, f'Press "S" to save {self.algorithm} thresholds to file.',
                                 (20, int(image_out.shape[1 ] *0.72)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (80, 80, 255), 1)
                     if self.focus:
-                        cv2.putText(image_out, f'Blurriness: {blurriness:.2f}', (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 1,
-                                    (80, 80, 255), 1)
+                        for line, (metric, value) in enumerate(focus_values.items()):
+                            cv2.putText(image_out, f'{metric}: {value:.2f}', (20, 70 + 35 * line),
+                                        cv2.FONT_HERSHEY_SIMPLEX, 1, (80, 80, 255), 1)
 
                     cv2.imshow("Detection Output", image_out)
 
+                if self.metrics:
+                    self.metrics.update(capture=capture_done - loop_start,
+                                        detection=detection_done - capture_done,
+                                        actuation=actuation_done - detection_done,
+                                        output=time.perf_counter() - actuation_done)
+
                 k = cv2.waitKey(1) & 0xFF
                 if k == ord('s'):
                     self.save_parameters()
                     self.logger.info("[INFO] Parameters saved.")
 
                 elif k == ord('r'):
-                    # Toggle video recording
+                    # Toggle video recording, the recorder is started or stopped at the next frame
                     self.record_video = not self.record_video
-                    if self.record_video:
-                        self.logger.info("[INFO] Started video recording.")
-                    else:
-                        if self.video_writer:
-                            self.video_writer.release()
-                            self.video_writer = None
-                        self.logger.info("[INFO] Stopped video recording.")
 
                 elif k == 27:
                     if log_fps:
@@ -580,15 +812,35 @@ class Owl:
             self.stop()
 
     def stop(self):
-        self.relay_controller.running = False
+        self.relay_controller.stop()
         self.relay_controller.relay.all_off()
         self.relay_controller.relay.beep(duration=0.1)
         self.relay_controller.relay.beep(duration=0.1)
+        # releases the GPIO lines held by the lgpio backend
+        self.relay_controller.relay.stop()
 
         self.cam.stop()
 
-        if self.video_writer:
-            self.video_writer.release()
+        if self.config_watcher:
+            self.config_watcher.stop()
+
+        if self.preview:
+            self.preview.stop()
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+
+        if self.video_recorder:
+            self.video_recorder.stop()
+
+        if self.detection_sink:
+            self.detection_sink.stop()
+
+        if self.session_recorder:
+            self.session_recorder.stop()
+
+        if self.spray_map:
+            self.spray_map.stop()
 
         if self.controller:
             if hasattr(self, 'controller'):
@@ -596,8 +848,9 @@ class Owl:
                 if hasattr(self, 'controller_process'):
                     self.controller_process.join()
 
+        # the recorder processes are not daemons, sys.exit waits on them unless they are stopped
+        self.status_indicator.stop()
         if self.sample_images:
-            self.status_indicator.stop()
             self.image_recorder.stop()
 
         if self.show_display:
@@ -605,6 +858,377 @@ class Owl:
 
         sys.exit()
 
+    def _open_camera(self):
+        """Open the image source. Runs on a startup thread on fast start, errors are handled by the caller."""
+        with self.startup_profiler.stage('camera'):
+            if str(self.input_file_or_directory).endswith('.owlsession'):
+                from utils.session import SessionReplay
+
+                return SessionReplay(self.input_file_or_directory, clock=self.clock)
+
+            if self.input_file_or_directory:
+                from utils.frame_reader import FrameReader
+
+                return FrameReader(path=self.input_file_or_directory,
+                                   resolution=self.resolution,
+                                   loop_time=self.image_loop_time,
+                                   clock=self.clock)
+
+            if self.cameras:
+                from utils.camera_array import CameraArray
+
+                return CameraArray(self.cameras,
+                                   resolution=self.resolution,
+                                   exp_compensation=self.exp_compensation,
+                                   warmup_time=0 if self.fast_start else 2.0,
+                                   exposure_controller_factory=self._exposure_controller)
+
+            cam = VideoStream(resolution=self.resolution,
+                              exp_compensation=self.exp_compensation,
+                              warmup_time=0 if self.fast_start else 2.0,
+                              exposure_controller=self._exposure_controller())
+            cam.start()
+
+            return cam
+
+    def _exposure_controller(self):
+        """A new histogram exposure controller per camera when [Camera] exposure_control is on."""
+        if not self.config.getboolean('Camera', 'exposure_control', fallback=False):
+            return None
+
+        from utils.exposure import ExposureController
+
+        return ExposureController.from_config(self.config)
+
+    def _load_detector(self):
+        """Build the detector and warm it up. Runs on a startup thread, errors are raised in hoot."""
+        load_start = time.perf_counter()
+        with self.startup_profiler.stage('model_load'):
+            detector = self._create_detector(self.config)
+
+        with self.startup_profiler.stage('model_warmup'):
+            latencies = self._warm_up_detector(detector, self.config)
+
+        self.startup_profiler.mark('model_ready')
+        message = f"[INFO] Detection model ready {time.perf_counter() - load_start:.2f} s after starting to load"
+        if latencies:
+            message += f", warm-up inference {1000 * latencies[0]:.0f} ms cold / {1000 * latencies[-1]:.0f} ms warm"
+        self.logger.info(message)
+
+        return detector
+
+    @staticmethod
+    def _warm_up_detector(detector, config):
+        """Run warm-up inferences on a blank frame of the configured size, for detectors that need it."""
+        if not hasattr(detector, 'warmup'):
+            return []
+
+        frame_shape = (config.getint('Camera', 'resolution_height'), config.getint('Camera', 'resolution_width'), 3)
+        return detector.warmup(frame_shape, batch=max(len(parse_cameras(config)), 1))
+
+    def _load_runtime_settings(self, config):
+        """Read the settings that can be changed while OWL is running, either at startup or on a config reload."""
+        self.algorithm = config.get('System', 'algorithm')
+        self.actuation_duration = config.getfloat('System', 'actuation_duration')
+        self.delay = config.getfloat('System', 'delay')
+
+        self.confidence = config.getfloat('GreenOnGreen', 'confidence', fallback=0.5)
+        self.class_filter = parse_class_filter(config.get('GreenOnGreen', 'class_filter_id', fallback=None))
+        self.actuation_policy = ActuationPolicy.from_config(config)
+
+        self.exg_min = config.getint('GreenOnBrown', 'exg_min')
+        self.exg_max = config.getint('GreenOnBrown', 'exg_max')
+        self.hue_min = config.getint('GreenOnBrown', 'hue_min')
+        self.hue_max = config.getint('GreenOnBrown', 'hue_max')
+        self.saturation_min = config.getint('GreenOnBrown', 'saturation_min')
+        self.saturation_max = config.getint('GreenOnBrown', 'saturation_max')
+        self.brightness_min = config.getint('GreenOnBrown', 'brightness_min')
+        self.brightness_max = config.getint('GreenOnBrown', 'brightness_max')
+        self.min_detection_area = config.getfloat('GreenOnBrown', 'min_detection_area')
+        self.invert_hue = config.getboolean('GreenOnBrown', 'invert_hue', fallback=False)
+
+    def _runtime_settings(self):
+        return {
+            'algorithm': self.algorithm,
+            'actuation_duration': self.actuation_duration,
+            'delay': self.delay,
+            'confidence': self.confidence,
+            'class_filter': self.class_filter,
+            'actuation_policy': self.actuation_policy.describe(),
+            'lane_mapping': self.lane_mapper.mode,
+            'seconds_per_pixel': self.lane_mapper.seconds_per_pixel,
+            'exg_min': self.exg_min,
+            'exg_max': self.exg_max,
+            'hue_min': self.hue_min,
+            'hue_max': self.hue_max,
+            'saturation_min': self.saturation_min,
+            'saturation_max': self.saturation_max,
+            'brightness_min': self.brightness_min,
+            'brightness_max': self.brightness_max,
+            'min_detection_area': self.min_detection_area,
+            'invert_hue': self.invert_hue
+        }
+
+    @staticmethod
+    def _detector_settings(config):
+        """The settings that require a new detector (and for GreenOnGreen, a model load) when changed."""
+        algorithm = config.get('System', 'algorithm')
+        if algorithm == 'gog':
+            return (algorithm,
+                    config.get('GreenOnGreen', 'model_path'),
+                    config.getboolean('GreenOnGreen', 'auto_select_model', fallback=False),
+                    config.getfloat('GreenOnGreen', 'target_fps', fallback=10.0))
+
+        return (algorithm,
+                config.getboolean('GreenOnBrown', 'connected_components', fallback=False),
+                config.getfloat('GreenOnBrown', 'processing_scale', fallback=1.0),
+                config.getboolean('GreenOnBrown', 'normalise_brightness', fallback=False),
+                config.getint('GreenOnBrown', 'normalise_interval', fallback=10),
+                config.getfloat('GreenOnBrown', 'normalise_smoothing', fallback=0.2),
+                config.getfloat('GreenOnBrown', 'normalise_intensity', fallback=0.8))
+
+    @staticmethod
+    def _create_detector(config):
+        algorithm = config.get('System', 'algorithm')
+        if algorithm == 'gog':
+            from utils.greenongreen import GreenOnGreen
+            model_path = config.get('GreenOnGreen', 'model_path')
+            input_size = None
+
+            # pick the most accurate variant in models/manifest.json that reaches the target FPS on this Pi
+            if config.getboolean('GreenOnGreen', 'auto_select_model', fallback=False):
+                from utils.model_selector import resolve_model
+                model_path, input_size = resolve_model(model_path,
+                                                       rpi_version=get_rpi_version(),
+                                                       target_fps=config.getfloat('GreenOnGreen', 'target_fps',
+                                                                                  fallback=10.0))
+
+            return GreenOnGreen(model_path=model_path, input_size=input_size)
+
+        connected_components = config.getboolean('GreenOnBrown', 'connected_components', fallback=False)
+        processing_scale = config.getfloat('GreenOnBrown', 'processing_scale', fallback=1.0)
+
+        normaliser = None
+        if config.getboolean('GreenOnBrown', 'normalise_brightness', fallback=False):
+            from utils.brightness import BrightnessNormaliser
+            normaliser = BrightnessNormaliser.from_config(config)
+
+        return GreenOnBrown(algorithm=algorithm,
+                            use_connected_components=connected_components,
+                            processing_scale=processing_scale,
+                            normaliser=normaliser)
+
+    def _prepare_config(self, config):
+        """
+        Runs on the config watcher thread. Builds a new detector only when the algorithm, model path or
+        GreenOnBrown processing options have changed, so the main loop never waits on a model load.
+        """
+        detector_settings = self._detector_settings(config)
+        if detector_settings == self.detector_settings:
+            return detector_settings, None
+
+        detector = self._create_detector(config)
+        self._warm_up_detector(detector, config)
+
+        return detector_settings, detector
+
+    def _apply_config(self, config, prepared):
+        """Swap in a reloaded config between frames and report what changed back to the config status file."""
+        detector_settings, detector = prepared
+        previous = self._runtime_settings()
+
+        # only the detection and actuation settings are live, anything else is picked up on the next start
+        restart_required = []
+        for section in config.sections():
+            for key, value in config[section].items():
+                if self.config.get(section, key, fallback=None) == value:
+                    continue
+                if section not in ('System', 'GreenOnBrown', 'GreenOnGreen', 'ActuationByClass',
+                                   'ActuationByConfidence') or key in self.RESTART_REQUIRED_SYSTEM_KEYS:
+                    restart_required.append(f'{section}.{key}')
+
+        self.config = config
+        self._load_runtime_settings(config)
+        self.lane_mapper = LaneMapper.from_config(config, self.lane_starts, self.lane_ends, self.frame_height)
+
+        changes = {key: value for key, value in self._runtime_settings().items() if previous[key] != value}
+        if detector is not None:
+            self.weed_detector = detector
+            self.detector_settings = detector_settings
+            changes['detector'] = list(detector_settings)
+            if self.sensitivity_profiles:
+                self.sensitivity_profiles.register(detector)
+
+        self._update_trackbars()
+
+        if restart_required:
+            self.logger.warning(f"[WARNING] Config changes to {', '.join(restart_required)} require a restart to apply.")
+
+        self.config_watcher.report_applied(changes)
+
+    def _toggle_video_recorder(self):
+        if self.record_video:
+            from utils.video_recorder import VideoRecorder
+
+            try:
+                self.video_recorder = VideoRecorder(
+                    save_directory=getattr(self, 'save_subdirectory', None) or os.getcwd(),
+                    codec=self.config.get('Recorder', 'codec', fallback='mp4v'),
+                    fps=self.config.getfloat('Recorder', 'fps', fallback=30.0),
+                    max_queue=self.config.getint('Recorder', 'max_queue', fallback=64),
+                    annotate=self.config.getboolean('Recorder', 'annotate', fallback=True))
+                self.logger.info("[INFO] Started video recording.")
+
+            except ValueError as e:
+                self.logger.error(f"[ERROR] Could not start video recording: {e}")
+                self.record_video = False
+
+        else:
+            # flushing the queue can take a moment, so don't hold up the detection loop
+            Thread(target=self.video_recorder.stop, daemon=False).start()
+            self.video_recorder = None
+            self.logger.info("[INFO] Stopped video recording.")
+
+    def _handle_recording_request(self, request):
+        """POST /recording with {"enabled": true|false}. Runs on the server thread, applied at the next frame."""
+        try:
+            length = int(request.headers.get('Content-Length', 0))
+            self.record_video = self._parse_bool(json.loads(request.rfile.read(length) or b'{}').get('enabled', True))
+        except (ValueError, AttributeError) as e:
+            request.send_json({'error': f'Expected {{"enabled": true|false}}: {e}'}, status=400)
+            return
+
+        request.send_json({'recording': self.record_video}, status=202)
+
+    @staticmethod
+    def _parse_bool(value):
+        """A JSON true or false, or the strings "true" and "false". Anything else raises ValueError."""
+        if isinstance(value, bool):
+            return value
+
+        if isinstance(value, str) and value.strip().lower() in ('true', 'false'):
+            return value.strip().lower() == 'true'
+
+        raise ValueError(f"expected true or false, got {value!r}")
+
+    def _validate_settings(self, changes):
+        """Check setting changes received by the metrics server. Runs on the server thread."""
+        current = self._runtime_settings()
+        accepted = {}
+        for key, value in changes.items():
+            if key not in self.MUTABLE_SETTINGS:
+                raise ValueError(f"{key} cannot be changed at runtime, change it in the config file")
+
+            is_valid, message = ConfigValidator.validate_value(key, str(value), set())
+            if not is_valid:
+                raise ValueError(f"{key}: {message}")
+
+            # bool is a subclass of int, check it first and never take true or false as a number
+            if isinstance(current[key], bool):
+                accepted[key] = self._parse_bool(value)
+            elif isinstance(value, bool):
+                raise ValueError(f"{key} must be a number, got {value}")
+            elif isinstance(current[key], int):
+                # int() would truncate 30.5, only whole numbers are accepted
+                try:
+                    accepted[key] = int(str(value).strip())
+                except ValueError:
+                    raise ValueError(f"{key} must be a whole number, got {value}")
+            else:
+                accepted[key] = type(current[key])(value)
+
+        return accepted
+
+    def _apply_settings(self, changes):
+        """Apply validated runtime setting changes between frames."""
+        for key, value in changes.items():
+            setattr(self, key, value)
+
+        self._update_trackbars()
+        self.logger.info(f"[INFO] Runtime settings updated: {changes}")
+
+    def _apply_control(self, control):
+        """Apply controller switch changes from the control block between frames."""
+        from utils.control_block import DETECTION_ON, DETECTION_OFF, ALL_NOZZLES_ON, THRESHOLDS
+
+        mode = control.get('detection_mode')
+        if mode is not None:
+            self.disable_detection = mode != DETECTION_ON
+            if mode == ALL_NOZZLES_ON:
+                self.relay_controller.relay.all_on()
+            elif mode == DETECTION_OFF:
+                self.relay_controller.relay.all_off()
+
+        if 'recording' in control:
+            # a full drive stops the image recorder for good
+            self.recording_images = (self.sample_images and bool(control['recording'])
+                                     and not self.status_indicator.DRIVE_FULL)
+
+        if 'sensitivity' in control and self.sensitivity_profiles:
+            # profiles are compiled at startup, switching only swaps the active one
+            profile = self.sensitivity_profiles.select(control['sensitivity'])
+            if profile:
+                for key, value in profile.settings.items():
+                    setattr(self, key, value)
+                self.confidence = profile.confidence
+                self.sensitivity = profile.name
+                self._update_trackbars()
+
+        thresholds = [key for key in THRESHOLDS if key in control]
+        for key in thresholds:
+            setattr(self, key, control[key])
+        if thresholds:
+            self._update_trackbars()
+
+        self.logger.info(f"[INFO] Controller state updated: {control}")
+
+    def _update_trackbars(self):
+        if not self.show_display:
+            return
+
+        cv2.setTrackbarPos("ExG-Min", self.window_name, self.exg_min)
+        cv2.setTrackbarPos("ExG-Max", self.window_name, self.exg_max)
+        cv2.setTrackbarPos("Hue-Min", self.window_name, self.hue_min)
+        cv2.setTrackbarPos("Hue-Max", self.window_name, self.hue_max)
+        cv2.setTrackbarPos("Sat-Min", self.window_name, self.saturation_min)
+        cv2.setTrackbarPos("Sat-Max", self.window_name, self.saturation_max)
+        cv2.setTrackbarPos("Bright-Min", self.window_name, self.brightness_min)
+        cv2.setTrackbarPos("Bright-Max", self.window_name, self.brightness_max)
+
+    def _metrics_snapshot(self):
+        """Assemble the live metrics served on /metrics. Runs on the server thread and only reads state."""
+        from utils.metrics_server import get_cpu_temperature, get_storage
+
+        image_recorder = getattr(self, 'image_recorder', None)
+        snapshot = self.metrics.snapshot()
+        snapshot.update({
+            'algorithm': self.algorithm,
+            'detection_enabled': not self.disable_detection,
+            'sensitivity': self.sensitivity,
+            'recording': getattr(self, 'video_recorder', None) is not None,
+            'config_version': self.config_watcher.version if self.config_watcher else None,
+            'relays': {
+                'duty_cycle': self.relay_controller.duty_cycles(),
+                'activations': list(self.relay_controller.activations)
+            },
+            'queue_depths': {
+                'relays': self.relay_controller.queue_depths(),
+                'image_recorder': image_recorder.queue.qsize() if image_recorder else None,
+                'detection_log': LogManager().detection_queue.qsize(),
+                'detection_sink': self.detection_sink.queue.qsize() if self.detection_sink else None
+            },
+            'dropped_frames': {
+                'camera': getattr(self.cam, 'frames_dropped', None),
+                'image_recorder': image_recorder.dropped_frames if image_recorder else None,
+                'video_recorder': self.video_recorder.dropped_frames if getattr(self, 'video_recorder', None) else None
+            },
+            'startup': self.startup_profiler.summary(),
+            'cpu_temperature_c': get_cpu_temperature(),
+            'storage': get_storage(self.save_directory or os.path.dirname(os.path.abspath(__file__)))
+        })
+
+        return snapshot
+
     def save_parameters(self):
         timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
         new_config_filename = f"{timestamp}_{self._config_path.name}"
@@ -629,12 +1253,19 @@ class Owl:
 
         self.logger.info(f"[INFO] Configuration saved to {new_config_path}")
 
-    def _log_system_info(self):
-        """Log system information on startup"""
+    def _log_system_info(self, cache_path=None):
+        """Log system information on startup, from the cache at cache_path if given"""
         self.logger.info(f"Starting OWL version {VERSION}")
 
+        cached = {}
+        if cache_path is not None:
+            try:
+                cached = SystemInfo.get_cached_info(cache_path)
+            except Exception as e:
+                self.logger.warning(f"Failed to read cached system information: {e}")
+
         try:
-            sys_info = SystemInfo.get_os_info()
+            sys_info = cached['os'] if 'os' in cached else SystemInfo.get_os_info()
             self.logger.info(
                 f"System Information: OS: {sys_info['system']} {sys_info['release']}, "
                 f"Machine: {sys_info['machine']}"
@@ -643,7 +1274,7 @@ class Owl:
             self.logger.warning(f"Failed to retrieve OS information: {e}")
 
         try:
-            python_info = SystemInfo.get_python_info()
+            python_info = cached['python'] if 'python' in cached else SystemInfo.get_python_info()
             self.logger.info(
                 f"Python Version: {python_info['version']}, "
                 f"Implementation: {python_info['implementation']}, "
@@ -653,7 +1284,7 @@ class Owl:
             self.logger.warning(f"Failed to retrieve Python information: {e}")
 
         try:
-            rpi_info = SystemInfo.get_rpi_info()
+            rpi_info = cached['rpi'] if 'rpi' in cached else SystemInfo.get_rpi_info()
             if rpi_info:
                 self.logger.info(f"Hardware: {rpi_info}")
             else:
@@ -662,7 +1293,7 @@ class Owl:
             self.logger.warning(f"Failed to retrieve Raspberry Pi information: {e}")
 
         try:
-            git_info = SystemInfo.get_git_info()
+            git_info = cached['git'] if 'git' in cached else SystemInfo.get_git_info()
             if git_info:
                 self.logger.info(f"Git: branch={git_info['branch']}, commit={git_info['commit']}")
             else:
@@ -678,7 +1309,10 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument('--show-display', action='store_true', default=False, help='show display windows')
     ap.add_argument('--focus', action='store_true', default=False, help='add FFT blur to output frame')
-    ap.add_argument('--input', type=str, default=None, help='path to image directory, single image or video file')
+    ap.add_argument('--input', type=str, default=None,
+                    help='path to image directory, single image, video file or .owlsession file')
+    ap.add_argument('--fast-start', action='store_true', default=None,
+                    help='start camera, relays and model together and skip warm-up delays')
 
     args = ap.parse_args()
 
@@ -687,7 +1321,8 @@ if __name__ == "__main__":
         config_file='config/DAY_SENSITIVITY_2.ini',
         show_display=args.show_display,
         focus=args.focus,
-        input_file_or_directory=args.input
+        input_file_or_directory=args.input,
+        fast_start=args.fast_start
     )
 
     # start the targeting!
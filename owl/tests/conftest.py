@@ -0,0 +1,6 @@
+import sys
+
+from pathlib import Path
+
+# the OWL modules import each other as utils.*, relative to the owl directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
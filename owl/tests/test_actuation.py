@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from configparser import ConfigParser
+from utils.actuation import LaneMapper
+
+# 4 lanes of 100 px across a 400 x 300 frame
+STARTS = np.arange(4) * 100.0
+ENDS = STARTS + 100
+FRAME_HEIGHT = 300
+
+
+def lanes_for(boxes, **kwargs):
+    lanes, _ = LaneMapper(STARTS, ENDS, FRAME_HEIGHT, **kwargs).map(boxes, np.full(len(boxes), 0.25))
+    return lanes.tolist()
+
+
+@pytest.mark.parametrize('boxes, expected', [
+    ([[10, 0, 50, 50]], [0]),
+    ([[80, 0, 40, 40]], [0, 1]),
+    ([[50, 0, 300, 20]], [0, 1, 2, 3]),
+    ([[390, 0, 20, 20]], [3]),
+    ([[100, 0, 100, 10]], [1]),
+    ([[110, 0, 10, 10], [150, 0, 30, 60]], [1]),
+    ([[10, 0, 20, 20], [310, 0, 20, 20]], [0, 3]),
+])
+def test_extent_activates_every_overlapped_lane(boxes, expected):
+    assert lanes_for(boxes) == expected
+
+
+def test_box_ending_on_a_boundary_does_not_reach_the_next_lane():
+    assert lanes_for([[50, 0, 50, 10]]) == [0]
+
+
+@pytest.mark.parametrize('min_overlap, expected', [
+    (0.0, [0, 1]),
+    (0.1, [0, 1]),
+    (0.25, [1]),
+    (0.4, [1]),
+    (0.5, []),
+])
+def test_min_lane_overlap(min_overlap, expected):
+    # 10 px into lane 0 and 40 px into lane 1
+    assert lanes_for([[90, 0, 50, 40]], min_overlap=min_overlap) == expected
+
+
+@pytest.mark.parametrize('mode', ['extent', 'centre'])
+def test_empty_input(mode):
+    mapper = LaneMapper(STARTS, ENDS, FRAME_HEIGHT, mode=mode)
+    lanes, durations = mapper.map([], [])
+
+    assert lanes.shape == (0,)
+    assert durations.shape == (0,)
+    assert mapper.lane_mask(np.empty((0, 4))).shape == (0, 4)
+
+
+@pytest.mark.parametrize('boxes, extent, centre', [
+    ([[80, 0, 40, 40]], [0, 1], [1]),
+    ([[60, 0, 60, 40]], [0, 1], [0]),
+    ([[50, 0, 300, 20]], [0, 1, 2, 3], [2]),
+    ([[10, 0, 50, 50]], [0], [0]),
+])
+def test_centre_mode_against_extent_mode(boxes, extent, centre):
+    assert lanes_for(boxes, mode='extent') == extent
+    assert lanes_for(boxes, mode='centre') == centre
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        LaneMapper(STARTS, ENDS, FRAME_HEIGHT, mode='nearest')
+
+
+def test_seconds_per_pixel():
+    # a 300 px frame covering 0.6 m at 7.2 km/h (2 m/s): 0.001 s per pixel row
+    assert LaneMapper(STARTS, ENDS, FRAME_HEIGHT, travel_speed=7.2, ground_height=0.6).seconds_per_pixel == \
+        pytest.approx(0.001)
+    assert LaneMapper(STARTS, ENDS, FRAME_HEIGHT, travel_speed=0, ground_height=0.6).seconds_per_pixel == 0.0
+    assert LaneMapper(STARTS, ENDS, FRAME_HEIGHT, travel_speed=7.2, ground_height=0).seconds_per_pixel == 0.0
+
+
+def test_duration_scales_with_box_height():
+    mapper = LaneMapper(STARTS, ENDS, FRAME_HEIGHT, travel_speed=7.2, ground_height=0.6)
+    lanes, durations = mapper.map([[10, 0, 20, 15], [210, 0, 50, 150]], [0.25, 0.25])
+
+    assert lanes.tolist() == [0, 2]
+    assert durations == pytest.approx([0.265, 0.40])
+
+
+def test_duration_without_height_scaling_is_unchanged():
+    _, durations = LaneMapper(STARTS, ENDS, FRAME_HEIGHT).map([[10, 0, 20, 150]], [0.25])
+
+    assert durations == pytest.approx([0.25])
+
+
+def test_lane_hit_by_several_boxes_takes_the_longest_duration():
+    mapper = LaneMapper(STARTS, ENDS, FRAME_HEIGHT, travel_speed=7.2, ground_height=0.6)
+    lanes, durations = mapper.map([[110, 0, 10, 10], [150, 0, 30, 100], [80, 0, 40, 5]], [0.25, 0.25, 0.5])
+
+    assert lanes.tolist() == [0, 1]
+    assert durations == pytest.approx([0.505, 0.505])
+
+
+def test_from_config():
+    config = ConfigParser()
+    config.read_dict({'System': {'lane_mapping': ' Centre ', 'min_lane_overlap': '0.2', 'travel_speed': '7.2',
+                                 'ground_height': '0.6'}})
+    mapper = LaneMapper.from_config(config, STARTS, ENDS, FRAME_HEIGHT)
+
+    assert mapper.mode == 'centre'
+    assert mapper.min_overlap_px == pytest.approx(np.full(4, 20.0))
+    assert mapper.seconds_per_pixel == pytest.approx(0.001)
+
+
+def test_from_config_without_lane_mapping_keeps_centre():
+    mapper = LaneMapper.from_config(ConfigParser(), STARTS, ENDS, FRAME_HEIGHT)
+
+    assert mapper.mode == 'centre'
+    assert mapper.min_overlap_px == pytest.approx(np.zeros(4))
+
+
+@pytest.mark.parametrize('mode, expected', [
+    ('extent', [0, 0, 3, -1]),
+    ('centre', [1, 0, 3, -1]),
+])
+def test_box_lanes(mode, expected):
+    boxes = [[80, 0, 40, 40], [60, 0, 30, 30], [310, 0, 20, 20], [500, 0, 20, 20]]
+
+    assert LaneMapper(STARTS, ENDS, FRAME_HEIGHT, mode=mode).box_lanes(boxes).tolist() == expected
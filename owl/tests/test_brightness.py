@@ -0,0 +1,52 @@
+import numpy as np
+
+from utils.brightness import BrightnessNormaliser
+
+# the YUV round trip rounds each channel, which moves 2G - R - B by a few counts
+ROUNDING = 6
+
+
+def field_frame(seed=0):
+    """
+    A dim 120 x 160 BGR frame of soil, with a green plant and a patch of straw. The soil fills the luminance
+    histogram, so the equalisation is steep across the straw's channel values.
+    """
+    rng = np.random.default_rng(seed)
+    frame = np.empty((120, 160, 3), dtype=np.int16)
+    frame[:] = (50, 55, 65)
+    frame += rng.integers(-4, 5, frame.shape, dtype=np.int16)
+    frame[40:80, 60:100] = (30, 80, 40)
+    frame[90:110, 10:40] = (50, 60, 78)
+
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def excess_green(image):
+    """2G - R - B per pixel, before utils.algorithms.exg clips the negative values to zero."""
+    image = image.astype(np.int16)
+
+    return 2 * image[..., 1] - image[..., 2] - image[..., 0]
+
+
+def assert_exg_sign_kept(frame, normalised):
+    index = excess_green(frame)
+    clear = np.abs(index) > ROUNDING
+
+    assert np.array_equal(np.sign(excess_green(normalised))[clear], np.sign(index)[clear])
+
+
+def test_exg_sign_is_kept():
+    frame = field_frame()
+    normalised = BrightnessNormaliser(interval=1).apply(frame)
+
+    assert normalised.mean() > frame.mean()
+    assert_exg_sign_kept(frame, normalised)
+    assert (excess_green(normalised)[90:110, 10:40] < 0).all()
+
+
+def test_exg_sign_is_kept_for_cached_mapping():
+    normaliser = BrightnessNormaliser(interval=10)
+    normaliser.apply(field_frame(seed=0))
+
+    frame = field_frame(seed=1)
+    assert_exg_sign_kept(frame, normaliser.apply(frame))
@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+
+from utils.clock import VirtualClock
+from utils.output_manager import FakeRelayBackend, GroupedRelayController, relay_backend, testing
+
+LANES = list(range(4))
+
+
+@pytest.fixture
+def grouped():
+    """A GroupedRelayController on the fake backend, driven by a virtual clock so edge times are exact."""
+    clock = VirtualClock(start=1000.0)
+    backend = FakeRelayBackend({lane: lane for lane in LANES}, clock=clock)
+    controller = GroupedRelayController({lane: lane for lane in LANES}, backend=backend, settle_time=0, clock=clock)
+
+    yield controller, backend, clock
+
+    controller.stop()
+
+
+def test_lanes_from_one_frame_switch_in_one_write(grouped):
+    controller, backend, clock = grouped
+    fired = clock.time()
+    for lane in LANES:
+        controller.receive(relay=lane, time_stamp=fired, duration=0.5)
+
+    writes = backend.writes
+    controller.commit()
+    clock.sleep(1.0)
+
+    assert backend.skew(LANES, on=True) == 0
+    assert backend.skew(LANES, on=False) == 0
+    assert backend.writes - writes == 2
+    assert [edge_time - fired for edge_time, _, _ in backend.edges] == pytest.approx([0] * 4 + [0.5] * 4)
+
+
+def test_jobs_are_staged_until_commit(grouped):
+    controller, backend, clock = grouped
+    controller.receive(relay=0, time_stamp=clock.time(), duration=0.5)
+    clock.sleep(0.2)
+
+    assert not backend.edges
+
+    controller.commit()
+    clock.sleep(0.1)
+
+    assert [(relay, on) for _, relay, on in backend.edges] == [(0, True)]
+
+
+def test_delay_and_overlapping_jobs(grouped):
+    controller, backend, clock = grouped
+    fired = clock.time()
+    controller.receive(relay=0, time_stamp=fired, duration=0.3)
+    controller.receive(relay=1, time_stamp=fired, delay=0.2, duration=0.3)
+    controller.commit()
+    clock.sleep(0.1)
+
+    # a later frame extends lane 0 while it is on, so it switches off once, at the end of the second job
+    controller.receive(relay=0, time_stamp=clock.time(), duration=0.5)
+    controller.commit()
+    clock.sleep(1.0)
+
+    assert [(round(edge_time - fired, 6), relay, on) for edge_time, relay, on in backend.edges] == [
+        (0.0, 0, True), (0.2, 1, True), (0.5, 1, False), (0.6, 0, False)]
+    assert backend.skew([0, 1], on=True) == pytest.approx(0.2)
+    assert controller.activations == [1, 1, 0, 0]
+
+
+def test_skew_needs_an_edge_on_every_relay():
+    backend = FakeRelayBackend({lane: lane for lane in LANES}, clock=VirtualClock(start=0.0))
+    backend.write({0: True, 1: True})
+
+    assert backend.skew([0, 1]) == 0
+    assert backend.skew([0, 1, 2]) is None
+
+
+@pytest.mark.skipif(not testing, reason='lgpio is only replaced by the fake backend without GPIO')
+def test_lgpio_without_gpio_warns_and_uses_fake_backend(caplog):
+    with caplog.at_level(logging.WARNING, logger='utils.output_manager'):
+        backend = relay_backend('lgpio', {lane: lane for lane in LANES})
+
+    assert isinstance(backend, FakeRelayBackend)
+    assert 'fake relay backend' in caplog.text
@@ -0,0 +1,255 @@
+import numpy as np
+
+from configparser import ConfigParser
+from typing import Dict, List, Optional, Tuple
+
+CLASS_SECTION = 'ActuationByClass'
+CONFIDENCE_SECTION = 'ActuationByConfidence'
+LANE_MAPPINGS = ('extent', 'centre')
+
+
+def parse_class_filter(value: Optional[str]) -> Optional[List[int]]:
+    """Parse [GreenOnGreen] class_filter_id: 'none' or blank for all classes, otherwise class ids like '0, 2'."""
+    if value is None or value.strip().strip("'\"").lower() in ('', 'none'):
+        return None
+
+    try:
+        return [int(class_id) for class_id in value.replace(' ', '').split(',') if class_id]
+    except ValueError:
+        raise ValueError(f"class_filter_id must be 'none' or comma separated class ids, got '{value}'") from None
+
+
+def _parse_pair(value: str, section: str, key: str) -> Tuple[float, float]:
+    # 'duration' or 'duration, min_area'
+    parts = [part.strip() for part in value.split(',')]
+    try:
+        first = float(parts[0])
+        min_area = float(parts[1]) if len(parts) > 1 and parts[1] else 0.0
+    except (ValueError, IndexError):
+        raise ValueError(f"[{section}] {key} = {value}: expected a number and optional minimum box area") from None
+
+    if first < 0 or min_area < 0 or len(parts) > 2:
+        raise ValueError(f"[{section}] {key} = {value}: expected two non-negative numbers at most")
+
+    return first, min_area
+
+
+class ActuationPolicy:
+    """
+    Per-class and per-confidence actuation rules, applied to all detections of a frame at once before jobs are sent to
+    the RelayController.
+
+    [ActuationByClass]          class id = spray duration in seconds, minimum box area in pixels
+    0 = 0.25, 0
+    1 = 0.40, 400
+
+    [ActuationByConfidence]     lower confidence bound = duration scale, minimum box area in pixels
+    0.0 = 0.8, 600
+    0.6 = 1.0, 0
+
+    Classes without an entry use [System] actuation_duration. Each detection then uses the highest confidence band it
+    reaches: its duration is scaled and the larger of the class and band minimum areas applies. Detections without a
+    class or confidence (GreenOnBrown) skip the matching rule.
+    """
+
+    def __init__(self, class_policies: Optional[Dict[int, Tuple[float, float]]] = None,
+                 confidence_bands: Optional[Dict[float, Tuple[float, float]]] = None):
+        self.class_policies = class_policies or {}
+        bands = sorted((confidence_bands or {}).items())
+        self.band_bounds = np.array([bound for bound, _ in bands], dtype=np.float32)
+        self.band_scales = np.array([scale for _, (scale, _) in bands], dtype=np.float32)
+        self.band_min_areas = np.array([min_area for _, (_, min_area) in bands], dtype=np.float32)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.class_policies) or len(self.band_bounds) > 0
+
+    def describe(self) -> Dict[str, Dict[str, List[float]]]:
+        """Plain version of the rules, for comparing configs and reporting changes."""
+        return {
+            'classes': {str(class_id): list(policy) for class_id, policy in sorted(self.class_policies.items())},
+            'confidence': {f'{bound:g}': [float(scale), float(min_area)] for bound, scale, min_area in
+                           zip(self.band_bounds, self.band_scales, self.band_min_areas)}
+        }
+
+    @classmethod
+    def from_config(cls, config: ConfigParser) -> 'ActuationPolicy':
+        """Build the policy from the optional config sections, raising ValueError on malformed entries."""
+        class_policies = {}
+        if config.has_section(CLASS_SECTION):
+            for key, value in config[CLASS_SECTION].items():
+                try:
+                    class_id = int(key)
+                except ValueError:
+                    raise ValueError(f"[{CLASS_SECTION}] keys must be class ids (0, 1, 2, etc.), got '{key}'") from None
+                class_policies[class_id] = _parse_pair(value, CLASS_SECTION, key)
+
+        confidence_bands = {}
+        if config.has_section(CONFIDENCE_SECTION):
+            for key, value in config[CONFIDENCE_SECTION].items():
+                try:
+                    bound = float(key)
+                except ValueError:
+                    bound = -1
+                if not 0 <= bound <= 1:
+                    raise ValueError(f"[{CONFIDENCE_SECTION}] keys must be confidences between 0 and 1, got '{key}'")
+                confidence_bands[bound] = _parse_pair(value, CONFIDENCE_SECTION, key)
+
+        return cls(class_policies=class_policies, confidence_bands=confidence_bands)
+
+    def apply(self, boxes, confidences, class_ids, duration: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return a keep mask and the spray duration for each detection.
+        :param boxes: (N, 4) x, y, w, h
+        :param confidences: (N,) detection confidences, or None
+        :param class_ids: (N,) class ids, or None
+        :param duration: default spray duration in seconds
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        areas = boxes[:, 2] * boxes[:, 3]
+        durations = np.full(len(boxes), duration, dtype=np.float32)
+        min_areas = np.zeros(len(boxes), dtype=np.float32)
+
+        if self.class_policies and class_ids is not None and len(class_ids) == len(boxes):
+            class_ids = np.asarray(class_ids)
+            for class_id, (class_duration, class_min_area) in self.class_policies.items():
+                matches = class_ids == class_id
+                durations[matches] = class_duration
+                min_areas[matches] = class_min_area
+
+        if len(self.band_bounds) and confidences is not None and len(confidences) == len(boxes):
+            band = np.searchsorted(self.band_bounds, np.asarray(confidences, dtype=np.float32), side='right') - 1
+            in_band = band >= 0
+            durations[in_band] *= self.band_scales[band[in_band]]
+            min_areas[in_band] = np.maximum(min_areas[in_band], self.band_min_areas[band[in_band]])
+
+        return areas >= min_areas, durations
+
+
+class LaneMapper:
+    """
+    Maps the boxes of a frame to relay lanes. In 'extent' mode every lane a box overlaps by more than min_overlap of
+    the lane width is activated, so a weed straddling a lane boundary is sprayed by both nozzles. 'centre' mode keeps
+    the original behaviour of one lane per box, chosen by the box centre, and is used when a config file does not
+    set lane_mapping.
+
+    When the travel speed and the ground distance covered by the frame height are known, the time a box takes to pass
+    under the nozzle (box height / speed) is added to each spray duration, so tall weeds get a longer spray than
+    seedlings and the duration keeps up with the vehicle speed.
+    """
+
+    def __init__(self, lane_starts, lane_ends, frame_height: int, mode: str = 'extent', min_overlap: float = 0.0,
+                 travel_speed: float = 0.0, ground_height: float = 0.0):
+        """
+        :param lane_starts: (L,) left edge of each lane in pixels
+        :param lane_ends: (L,) right edge of each lane in pixels
+        :param frame_height: frame height in pixels
+        :param mode: 'extent' or 'centre'
+        :param min_overlap: fraction of the lane width a box must cover to activate it in extent mode
+        :param travel_speed: vehicle speed in km/h, 0 disables height scaling
+        :param ground_height: distance on the ground covered by the frame height in metres, 0 disables height scaling
+        """
+        if mode not in LANE_MAPPINGS:
+            raise ValueError(f"lane_mapping must be one of {', '.join(LANE_MAPPINGS)}, got '{mode}'")
+
+        self.lane_starts = np.asarray(lane_starts, dtype=np.float32)
+        self.lane_ends = np.asarray(lane_ends, dtype=np.float32)
+        self.mode = mode
+        self.min_overlap_px = min_overlap * (self.lane_ends - self.lane_starts)
+
+        # seconds for the ground under one pixel row to pass the nozzle
+        if travel_speed > 0 and ground_height > 0:
+            self.seconds_per_pixel = (ground_height / frame_height) / (travel_speed / 3.6)
+        else:
+            self.seconds_per_pixel = 0.0
+
+    @classmethod
+    def from_config(cls, config: ConfigParser, lane_starts, lane_ends, frame_height: int) -> 'LaneMapper':
+        return cls(lane_starts, lane_ends, frame_height,
+                   mode=config.get('System', 'lane_mapping', fallback='centre').strip().lower(),
+                   min_overlap=config.getfloat('System', 'min_lane_overlap', fallback=0.0),
+                   travel_speed=config.getfloat('System', 'travel_speed', fallback=0.0),
+                   ground_height=config.getfloat('System', 'ground_height', fallback=0.0))
+
+    def lane_mask(self, boxes) -> np.ndarray:
+        """(N, L) boolean mask of the lanes each x, y, w, h box activates."""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        left = boxes[:, 0:1]
+        right = left + boxes[:, 2:3]
+
+        if self.mode == 'centre':
+            centre_x = left + boxes[:, 2:3] // 2
+            return (self.lane_starts <= centre_x) & (centre_x < self.lane_ends)
+
+        overlap = np.minimum(right, self.lane_ends) - np.maximum(left, self.lane_starts)
+        return (overlap > 0) & (overlap >= self.min_overlap_px)
+
+    def box_lanes(self, boxes) -> np.ndarray:
+        """(N,) the first lane each box activates, -1 for a box that activates none, for one lane per detection."""
+        mask = self.lane_mask(boxes)
+
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+    def map(self, boxes, durations) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the lanes to activate and the spray duration for each. A lane hit by several boxes gets one job with
+        the longest of their durations.
+        :param boxes: (N, 4) x, y, w, h of the boxes to spray
+        :param durations: (N,) base spray duration for each box in seconds
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        if len(boxes) == 0:
+            return np.empty(0, dtype=int), np.empty(0, dtype=np.float32)
+
+        durations = np.asarray(durations, dtype=np.float32) + boxes[:, 3] * self.seconds_per_pixel
+        mask = self.lane_mask(boxes)
+
+        lanes = np.flatnonzero(mask.any(axis=0))
+        lane_durations = np.where(mask, durations[:, None], 0).max(axis=0)[lanes]
+
+        return lanes, lane_durations
+
+
+if __name__ == "__main__":
+    import time
+
+    # run from the owl directory: python -m utils.actuation
+    # checks the lane mapping on synthetic geometries: 4 lanes of 100 px across a 400 x 300 frame
+    starts = np.arange(4) * 100.0
+    mapper = LaneMapper(starts, starts + 100, frame_height=300)
+
+    cases = [
+        ('inside one lane', [[10, 0, 50, 50]], [0]),
+        ('straddling two lanes', [[80, 0, 40, 40]], [0, 1]),
+        ('spanning all lanes', [[50, 0, 300, 20]], [0, 1, 2, 3]),
+        ('touching a boundary', [[100, 0, 100, 10]], [1]),
+        ('two boxes in one lane', [[110, 0, 10, 10], [150, 0, 30, 60]], [1]),
+    ]
+    for name, boxes, expected in cases:
+        lanes, _ = mapper.map(boxes, np.full(len(boxes), 0.25))
+        assert lanes.tolist() == expected, f"{name}: {lanes.tolist()} != {expected}"
+        print(f"extent  {name:<24} lanes {lanes.tolist()}")
+
+    centre_lanes, _ = LaneMapper(starts, starts + 100, 300, mode='centre').map([[80, 0, 40, 40]], [0.25])
+    assert centre_lanes.tolist() == [1]
+    print(f"centre  {'straddling two lanes':<24} lanes {centre_lanes.tolist()}")
+
+    overlap_lanes, _ = LaneMapper(starts, starts + 100, 300, min_overlap=0.25).map([[90, 0, 50, 40]], [0.25])
+    assert overlap_lanes.tolist() == [1]
+    print(f"extent  {'10 px into lane 0':<24} lanes {overlap_lanes.tolist()} with min_overlap 0.25")
+
+    # 300 px frame covers 0.6 m, at 7.2 km/h (2 m/s) a 150 px (0.3 m) weed takes 0.15 s to pass
+    scaled = LaneMapper(starts, starts + 100, 300, travel_speed=7.2, ground_height=0.6)
+    _, durations = scaled.map([[10, 0, 20, 15], [210, 0, 50, 150]], [0.25, 0.25])
+    assert np.allclose(durations, [0.265, 0.40]), durations
+    print(f"scaled  durations {', '.join(f'{d:.3f}' for d in durations)} s for 15 px and 150 px boxes at 7.2 km/h")
+
+    # a lane hit by two boxes takes the longer duration
+    _, durations = scaled.map([[110, 0, 10, 10], [150, 0, 30, 100]], [0.25, 0.25])
+    assert np.allclose(durations, [0.35]), durations
+
+    boxes = np.random.default_rng(0).integers(0, 300, size=(200, 4))
+    start = time.perf_counter()
+    for _ in range(1000):
+        mapper.map(boxes, np.full(len(boxes), 0.25))
+    print(f"{time.perf_counter() - start:.3f} ms per frame of {len(boxes)} boxes")
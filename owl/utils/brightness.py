@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+
+
+class BrightnessNormaliser:
+    """
+    Cached histogram equalisation for GreenOnBrown. normalize_brightness converts every frame to YUV, equalises and
+    converts back. Here the equalisation mapping is rebuilt only every interval frames, from a subsampled
+    luminance histogram, and blended with the previous mapping so it changes smoothly between frames. Like
+    normalize_brightness it is applied to the Y plane only: changing Y moves B, G and R by the same amount, so the
+    chroma and ExG-type indices are left as they were, apart from channels that clip at 0 or 255.
+    """
+
+    def __init__(self, interval: int = 10, smoothing: float = 0.2, intensity: float = 0.8, step: int = 8):
+        """
+        :param interval: frames between rebuilding the mapping
+        :param smoothing: weight of the new mapping when blending with the previous one (1 = no smoothing)
+        :param intensity: output scale, as in normalize_brightness
+        :param step: subsampling step for the histogram
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"normalise_smoothing must be in (0, 1], got {smoothing}")
+
+        self.interval = max(interval, 1)
+        self.smoothing = smoothing
+        self.intensity = intensity
+        self.step = max(step, 1)
+
+        self.mapping = None
+        self.lut = None
+        self.frames = 0
+
+    @classmethod
+    def from_config(cls, config) -> 'BrightnessNormaliser':
+        return cls(interval=config.getint('GreenOnBrown', 'normalise_interval', fallback=10),
+                   smoothing=config.getfloat('GreenOnBrown', 'normalise_smoothing', fallback=0.2),
+                   intensity=config.getfloat('GreenOnBrown', 'normalise_intensity', fallback=0.8))
+
+    def equalisation_mapping(self, image: np.ndarray) -> np.ndarray:
+        """The equalizeHist mapping of the subsampled Y plane, scaled by intensity, as 256 floats."""
+        sample = image[::self.step, ::self.step]
+        cdf = np.cumsum(np.bincount(sample.ravel(), minlength=256)[:256]).astype(np.float32)
+        cdf_min = cdf[np.argmax(cdf > 0)]
+        span = max(cdf[-1] - cdf_min, 1.0)
+
+        return np.clip((cdf - cdf_min) / span * 255, 0, 255) * self.intensity
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        img_yuv = cv2.cvtColor(image, cv2.COLOR_BGR2YUV)
+        luminance = img_yuv[:, :, 0]
+        if self.frames % self.interval == 0:
+            mapping = self.equalisation_mapping(luminance)
+            if self.mapping is None:
+                self.mapping = mapping
+            else:
+                self.mapping += self.smoothing * (mapping - self.mapping)
+
+            self.lut = np.clip(np.rint(self.mapping), 0, 255).astype(np.uint8)
+
+        self.frames += 1
+
+        img_yuv[:, :, 0] = cv2.LUT(luminance, self.lut)
+
+        return cv2.cvtColor(img_yuv, cv2.COLOR_YUV2BGR)
+
+
+if __name__ == "__main__":
+    import time
+    from utils.algorithms import normalize_brightness
+
+    # run from the owl directory: python -m utils.brightness
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(rng.integers(20, 140, (768, 1024, 3), dtype=np.uint8), (5, 5), 0)
+    normaliser = BrightnessNormaliser(interval=10)
+    runs = 100
+
+    for name, function in (('normalize_brightness', normalize_brightness), ('BrightnessNormaliser', normaliser.apply)):
+        function(frame)
+        start = time.perf_counter()
+        for _ in range(runs):
+            output = function(frame)
+        print(f"{name:<22}{1000 * (time.perf_counter() - start) / runs:.2f} ms per frame, "
+              f"mean {frame.mean():.1f} -> {output.mean():.1f}")
@@ -0,0 +1,120 @@
+import cv2
+import numpy as np
+
+from typing import Callable, List, Optional, Tuple
+from utils.log_manager import LogManager
+
+
+def parse_cameras(config) -> List[Tuple[str, str, List[int]]]:
+    """
+    Read the optional [Cameras] section, one line per camera from left to right across the boom:
+
+        name = source, relays
+
+    source is a camera index or a video/image path and relays lists the relays the camera drives from left to
+    right, e.g. 'left = 0, 0 1 2 3 4'. Returns (name, source, relays) tuples, empty for a single camera setup.
+    """
+    if not config.has_section('Cameras'):
+        return []
+
+    cameras = []
+    for name, value in config['Cameras'].items():
+        source, _, relays = value.partition(',')
+        try:
+            relays = [int(relay) for relay in relays.split()]
+        except ValueError:
+            raise ValueError(f"[Cameras] {name} = {value}: relays must be whole numbers separated by spaces") from None
+
+        if not source.strip() or not relays:
+            raise ValueError(f"[Cameras] {name} = {value}: expected a source and at least one relay")
+
+        cameras.append((name, source.strip(), relays))
+
+    used = [relay for _, _, relays in cameras for relay in relays]
+    if len(used) != len(set(used)):
+        raise ValueError('[Cameras] each relay can only be driven by one camera')
+
+    return cameras
+
+
+class CameraArray:
+    """
+    Several cameras read as one. Each read() places the latest frame from every camera side by side in one mosaic
+    frame, so detection boxes, previews and recordings share one coordinate space. split() returns per-camera views
+    of the mosaic without copying, for batched inference. Each camera splits its own width into lanes for the relays
+    it drives, and lane_bounds() maps the lanes of the whole mosaic to relay numbers.
+    """
+
+    def __init__(self, cameras: List[Tuple[str, str, List[int]]], resolution: Tuple[int, int],
+                 exp_compensation: float = -2, warmup_time: float = 2.0,
+                 exposure_controller_factory: Optional[Callable] = None):
+        """
+        :param cameras: (name, source, relays) for each camera, from parse_cameras
+        :param resolution: (width, height) of every camera, file sources are resized to it
+        :param exposure_controller_factory: returns a new ExposureController, or None, for each camera
+        """
+        self.logger = LogManager.get_logger(__name__)
+        self.names = [name for name, _, _ in cameras]
+        self.relays = [relays for _, _, relays in cameras]
+        self.streams = []
+
+        for name, source, relays in cameras:
+            if source.isdigit():
+                from utils.video_manager import VideoStream
+
+                exposure_controller = exposure_controller_factory() if exposure_controller_factory else None
+                stream = VideoStream(src=int(source), resolution=resolution, exp_compensation=exp_compensation,
+                                     warmup_time=warmup_time, exposure_controller=exposure_controller)
+                stream.start()
+            else:
+                from utils.frame_reader import FrameReader
+
+                stream = FrameReader(path=source, resolution=resolution)
+
+            self.streams.append(stream)
+            self.logger.info(f"[INFO] Camera '{name}' on {source} drives relays {relays}")
+
+        self.camera_width, self.frame_height = resolution
+        self.frame_width = self.camera_width * len(self.streams)
+        self.input_type = 'camera array'
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return self.frame_width, self.frame_height
+
+    def read(self) -> Optional[np.ndarray]:
+        """Latest frame from every camera in one mosaic, None once any camera stops delivering frames."""
+        frames = [stream.read() for stream in self.streams]
+        if any(frame is None for frame in frames):
+            return None
+
+        # a new array each frame, the recorder and preview threads may still hold the last one
+        mosaic = np.empty((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+        for view, frame in zip(self.split(mosaic), frames):
+            view[:] = frame if frame.shape == view.shape else cv2.resize(frame, (self.camera_width, self.frame_height))
+
+        return mosaic
+
+    def split(self, frame: np.ndarray) -> List[np.ndarray]:
+        return [frame[:, i * self.camera_width:(i + 1) * self.camera_width] for i in range(len(self.streams))]
+
+    def lane_bounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Lane starts and ends across the mosaic in pixels, and the relay each lane drives."""
+        starts, ends, relay_map = [], [], []
+        for camera, relays in enumerate(self.relays):
+            lane_width = self.camera_width / len(relays)
+            offset = camera * self.camera_width
+            starts.extend(offset + int(i * lane_width) for i in range(len(relays)))
+            ends.extend(offset + int(i * lane_width) + lane_width for i in range(len(relays)))
+            relay_map.extend(relays)
+
+        return np.array(starts), np.array(ends), np.array(relay_map)
+
+    @property
+    def frames_dropped(self):
+        dropped = [getattr(stream, 'frames_dropped', None) for stream in self.streams]
+        return None if all(count is None for count in dropped) else sum(count or 0 for count in dropped)
+
+    def stop(self) -> None:
+        for stream in self.streams:
+            stream.stop()
@@ -0,0 +1,166 @@
+import time
+
+from threading import Condition, current_thread
+from utils.log_manager import LogManager
+
+
+class SystemClock:
+    """
+    Wall clock time, sleeps and condition waits, as used by the relay controllers, frame readers and status
+    indicators. Components take a clock instead of calling time directly, so a VirtualClock can be swapped in to run
+    recorded passes faster than real time.
+    """
+    virtual = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, condition: Condition, timeout=None) -> bool:
+        """condition.wait(timeout), the caller holds the condition. True when notified, False on timeout."""
+        return condition.wait(timeout)
+
+    def notify(self, condition: Condition) -> None:
+        """condition.notify(), the caller holds the condition."""
+        condition.notify()
+
+    def track(self, thread) -> None:
+        """Register a started worker thread that sleeps and waits on this clock."""
+        pass
+
+
+class VirtualClock(SystemClock):
+    """
+    Simulated time that only moves when the driving thread (the one that created the clock, normally the one
+    running Owl.hoot) sleeps. A sleep in the driving thread advances time: sleeping workers are woken one deadline
+    at a time, in order, and time does not move on until every worker has blocked on the clock again. Relay on and
+    off times therefore land exactly where they would in a real pass, however long the processing takes.
+
+    Worker threads must do all of their sleeping and waiting through the clock and be registered with track() once
+    started, otherwise time can move on while they are still running.
+    """
+    virtual = True
+
+    # real seconds between checks of a worker waiting on a condition, and the longest wait for workers to block
+    POLL_INTERVAL = 0.0005
+    SETTLE_TIMEOUT = 5.0
+
+    def __init__(self, start: float = None):
+        """
+        :param start: virtual time at the start in seconds since the epoch, the current time if None
+        """
+        self.logger = LogManager.get_logger(__name__)
+        self.now = time.time() if start is None else start
+        self.start = self.now
+        self.driver = current_thread()
+
+        self.lock = Condition()
+        self.blocked = {}           # thread: deadline, None when waiting for a notify only
+        self.awake = set()          # worker threads that are running
+        self.waiting = {}           # thread: id of the condition it waits on
+        self.notified = set()       # waiting threads that have been notified but not woken yet
+
+    def time(self) -> float:
+        with self.lock:
+            return self.now
+
+    @property
+    def elapsed(self) -> float:
+        return self.time() - self.start
+
+    def sleep(self, seconds: float) -> None:
+        if current_thread() is self.driver:
+            self.advance(seconds)
+            return
+
+        thread = current_thread()
+        with self.lock:
+            deadline = self.now + max(seconds, 0)
+            self._block(thread, deadline)
+            while self.now < deadline:
+                self.lock.wait()
+            self._unblock(thread)
+
+    def wait(self, condition: Condition, timeout=None) -> bool:
+        if current_thread() is self.driver:
+            self.advance(timeout or 0)
+            return condition.wait(0)
+
+        thread = current_thread()
+        with self.lock:
+            deadline = None if timeout is None else self.now + max(timeout, 0)
+            self._block(thread, deadline)
+            self.waiting[thread] = id(condition)
+
+        try:
+            # the condition's lock is never taken while holding the clock's, so poll it in short real-time waits.
+            # Notifies are recorded by the clock as well, a timed out wait can miss the condition's own.
+            while True:
+                condition.wait(self.POLL_INTERVAL)
+                with self.lock:
+                    if thread in self.notified:
+                        return True
+                    if deadline is not None and self.now >= deadline:
+                        return False
+        finally:
+            with self.lock:
+                del self.waiting[thread]
+                self.notified.discard(thread)
+                self._unblock(thread)
+
+    def notify(self, condition: Condition) -> None:
+        with self.lock:
+            # with nobody waiting the notify is lost, the worker finds the work when it next checks
+            self.notified.update(thread for thread, key in self.waiting.items() if key == id(condition))
+        condition.notify()
+
+    def track(self, thread) -> None:
+        with self.lock:
+            if thread not in self.blocked:
+                self.awake.add(thread)
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward, waking every worker whose deadline falls within it in deadline order."""
+        with self.lock:
+            target = self.now + max(seconds, 0)
+            while True:
+                self._settle()
+                due = [deadline for deadline in self.blocked.values() if deadline is not None and deadline <= target]
+                if not due:
+                    self.now = target
+                    self.lock.notify_all()
+                    break
+
+                self.now = max(min(due), self.now)
+                self.lock.notify_all()
+
+            self._settle()
+
+    def _block(self, thread, deadline) -> None:
+        self.blocked[thread] = deadline
+        self.awake.discard(thread)
+        self.lock.notify_all()
+
+    def _unblock(self, thread) -> None:
+        del self.blocked[thread]
+        self.awake.add(thread)
+        self.lock.notify_all()
+
+    def _settle(self) -> None:
+        """Wait, holding the lock, until every worker is blocked on a future deadline or a notify."""
+        give_up = time.monotonic() + self.SETTLE_TIMEOUT
+        while True:
+            self.awake = {thread for thread in self.awake if thread.is_alive()}
+            due = any(deadline is not None and deadline <= self.now for deadline in self.blocked.values())
+            if not self.awake and not due and not self.notified:
+                return
+
+            if time.monotonic() > give_up:
+                self.logger.warning(f"[WARNING] Virtual clock moved on with {len(self.awake)} worker(s) still "
+                                    f"running: {', '.join(thread.name for thread in self.awake)}")
+                return
+
+            self.lock.wait(self.POLL_INTERVAL)
@@ -1,9 +1,17 @@
 from pathlib import Path
 from configparser import ConfigParser, Error as ConfigParserError
-from typing import Dict, Set, Tuple
+from datetime import datetime
+from threading import Thread, Event, Lock
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
+import hashlib
+import json
 import logging
+import os
+import re
 import utils.error_manager as errors
+from utils.actuation import LANE_MAPPINGS, ActuationPolicy, parse_class_filter
+from utils.camera_array import parse_cameras
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +21,8 @@ class ConfigValidator:
     REQUIRED_CONFIG = {
         'System': {
             'required_keys': {'algorithm', 'relay_num', 'actuation_duration', 'delay'},
-            'optional_keys': {'input_file_or_directory'}
+            'optional_keys': {'input_file_or_directory', 'hot_reload', 'fast_start', 'lane_mapping',
+                              'min_lane_overlap', 'travel_speed', 'ground_height', 'relay_backend'}
         },
         'Controller': {
             # Base requirements for all controller types
@@ -53,7 +62,8 @@ class ConfigValidator:
         },
         'Camera': {
             'required_keys': {'resolution_width', 'resolution_height'},
-            'optional_keys': {'exp_compensation'}
+            'optional_keys': {'exp_compensation', 'exposure_control', 'exposure_target', 'max_exposure_time',
+                              'max_analogue_gain', 'exposure_interval'}
         },
         'GreenOnBrown': {
             'required_keys': {
@@ -61,11 +71,13 @@ class ConfigValidator:
                 'saturation_min', 'saturation_max', 'brightness_min', 'brightness_max',
                 'min_detection_area'
             },
-            'optional_keys': {'invert_hue'}
+            'optional_keys': {'invert_hue', 'connected_components', 'processing_scale', 'normalise_brightness',
+                              'normalise_interval', 'normalise_smoothing', 'normalise_intensity'}
         },
         'DataCollection': {
             'required_keys': {'sample_images', 'sample_method', 'save_directory'},
-            'optional_keys': {'sample_frequency', 'disable_detection', 'log_fps', 'camera_name'}
+            'optional_keys': {'sample_frequency', 'disable_detection', 'log_fps', 'camera_name', 'log_detections',
+                              'record_session', 'session_compression'}
         },
         'Relays': {
             'required_keys': {'0', '1', '2', '3'},
@@ -89,8 +101,46 @@ class ConfigValidator:
         'resolution_height': ('int', 1, None),
         # Camera settings
         'exp_compensation': ('float', -10, 10),
+        'exposure_target': ('float', 1, 254),
+        'max_exposure_time': ('int', 10, 1000000),
+        'max_analogue_gain': ('float', 1, 64),
+        'exposure_interval': ('int', 1, None),
         # Detection confidence
         'confidence': ('float', 0, 1),
+        # GreenOnGreen model selection
+        'target_fps': ('float', 0.1, 120),
+        # GreenOnBrown downsampling factor
+        'processing_scale': ('float', 0.05, 1),
+        # cached brightness normalisation before GreenOnBrown
+        'normalise_interval': ('int', 1, None),
+        'normalise_smoothing': ('float', 0.01, 1),
+        'normalise_intensity': ('float', 0.1, 2),
+        'min_detection_area': ('float', 0, None),
+        # Actuation timing (seconds)
+        'actuation_duration': ('float', 0, None),
+        'delay': ('float', 0, None),
+        # Lane mapping, speed in km/h and ground distance covered by the frame height in metres
+        'min_lane_overlap': ('float', 0, 1),
+        'travel_speed': ('float', 0, None),
+        'ground_height': ('float', 0, None),
+        # Spray map
+        'boom_width': ('float', 0, None),
+        'fixed_speed': ('float', 0, None),
+        'gps_baud': ('int', 1, None),
+        'encoder_pin': ('pin', 1, 40),
+        'pulses_per_metre': ('float', 0.001, None),
+        # Focus metrics
+        'focus_interval': ('int', 1, None),
+        'focus_roi': ('float', 0.05, 1),
+        'focus_max_size': ('int', 16, None),
+        # Video recorder
+        'fps': ('float', 1, 120),
+        'max_queue': ('int', 1, None),
+        # Network
+        'port': ('int', 1, 65535),
+        'preview_fps': ('float', 0.1, 60),
+        'preview_width': ('int', 16, None),
+        'preview_quality': ('int', 1, 100),
         # GPIO pins
         'switch_pin': ('pin', 1, 40),
         'detection_mode_pin_up': ('pin', 1, 40),
@@ -102,6 +152,8 @@ class ConfigValidator:
     VALID_ALGORITHMS = {'exg', 'exgr', 'maxg', 'nexg', 'exhsv', 'hsv', 'gndvi', 'gog'}
     VALID_CONTROLLER_TYPES = {'none', 'ute', 'advanced'}
     VALID_SWITCH_PURPOSES = {'recording', 'sensitivity'}
+    VALID_RELAY_BACKENDS = {'gpiozero', 'lgpio', 'fake'}
+    VALID_SESSION_COMPRESSIONS = {'png', 'raw'}
 
     # to check for valid ranges
     THRESHOLD_PAIRS = [
@@ -338,6 +390,70 @@ class ConfigValidator:
 
         return True, {}, warnings
 
+    @classmethod
+    def validate_actuation(cls, config: ConfigParser) -> Tuple[bool, Dict[str, Dict[str, str]]]:
+        """Validate the class filter, lane mapping and the optional per-class and per-confidence actuation sections."""
+        actuation_errors = {}
+        try:
+            parse_class_filter(config.get('GreenOnGreen', 'class_filter_id', fallback=None))
+        except ValueError as e:
+            actuation_errors['GreenOnGreen'] = {'class_filter_id': str(e)}
+
+        try:
+            ActuationPolicy.from_config(config)
+        except ValueError as e:
+            actuation_errors['Actuation'] = {'policy': str(e)}
+
+        lane_mapping = config.get('System', 'lane_mapping', fallback='centre').strip().lower()
+        if lane_mapping not in LANE_MAPPINGS:
+            actuation_errors.setdefault('System', {})['lane_mapping'] = f'Must be one of: {", ".join(LANE_MAPPINGS)}'
+
+        return not bool(actuation_errors), actuation_errors
+
+    @classmethod
+    def validate_relay_backend(cls, config: ConfigParser) -> Tuple[bool, Dict[str, Dict[str, str]]]:
+        """Validate the optional [System] relay_backend."""
+        relay_backend_errors = {}
+
+        relay_backend = config.get('System', 'relay_backend', fallback='gpiozero')
+        if relay_backend not in cls.VALID_RELAY_BACKENDS:
+            relay_backend_errors.setdefault('System', {})['relay_backend'] = \
+                f'Must be one of: {", ".join(sorted(cls.VALID_RELAY_BACKENDS))}'
+
+        return not bool(relay_backend_errors), relay_backend_errors
+
+    @classmethod
+    def validate_data_collection(cls, config: ConfigParser) -> Tuple[bool, Dict[str, Dict[str, str]]]:
+        """Validate the optional [DataCollection] session recording keys."""
+        data_collection_errors = {}
+
+        session_compression = config.get('DataCollection', 'session_compression', fallback='png')
+        if session_compression not in cls.VALID_SESSION_COMPRESSIONS:
+            data_collection_errors.setdefault('DataCollection', {})['session_compression'] = \
+                f'Must be one of: {", ".join(sorted(cls.VALID_SESSION_COMPRESSIONS))}'
+
+        return not bool(data_collection_errors), data_collection_errors
+
+    @classmethod
+    def validate_cameras(cls, config: ConfigParser) -> Tuple[bool, Dict[str, Dict[str, str]]]:
+        """Validate the optional [Cameras] section against the configured relays."""
+        try:
+            cameras = parse_cameras(config)
+        except ValueError as e:
+            return False, {'Cameras': {'format': str(e)}}
+
+        if not cameras or not config.has_section('Relays'):
+            return True, {}
+
+        relays = {int(key) for key in config['Relays'].keys() if key.isdigit()}
+        camera_errors = {}
+        for name, _, camera_relays in cameras:
+            unknown = sorted(set(camera_relays) - relays)
+            if unknown:
+                camera_errors[name] = f"Relays {unknown} are not in the [Relays] section"
+
+        return not bool(camera_errors), {'Cameras': camera_errors} if camera_errors else {}
+
     @classmethod
     def load_and_validate_config(cls, config_path: Path) -> ConfigParser:
         """Load and validate configuration file."""
@@ -400,6 +516,26 @@ class ConfigValidator:
             if section_errors:
                 validation_errors[section] = section_errors
 
+        # Validate class filter and actuation policies
+        is_valid, actuation_errors = cls.validate_actuation(config)
+        if not is_valid:
+            validation_errors.update(actuation_errors)
+
+        # Validate relay backend
+        is_valid, relay_backend_errors = cls.validate_relay_backend(config)
+        if not is_valid:
+            validation_errors.update(relay_backend_errors)
+
+        # Validate session recording
+        is_valid, data_collection_errors = cls.validate_data_collection(config)
+        if not is_valid:
+            validation_errors.update(data_collection_errors)
+
+        # Validate cameras
+        is_valid, camera_errors = cls.validate_cameras(config)
+        if not is_valid:
+            validation_errors.update(camera_errors)
+
         # Validate relay configuration
         is_valid, relay_errors, relay_warnings = cls.validate_relays(config)
         if not is_valid:
@@ -437,4 +573,122 @@ class ConfigValidator:
             raise errors.ConfigValueError(validation_errors, config_path)
 
         logger.info(f"Successfully loaded and validated config: {config_path}")
-        return config
\ No newline at end of file
+        return config
+
+class ConfigWatcher:
+    """
+    Watches the config file for changes by polling its modification time. New versions are validated (and
+    optionally prepared, e.g. loading a new model) on the watcher thread, then handed to the main loop with poll()
+    so they can be applied in one step between frames. The result of each reload is written to a JSON status file
+    next to the config so the web interface can show which version is running.
+    """
+
+    def __init__(self, config_path: Path,
+                 poll_interval: float = 1.0,
+                 settle_time: float = 0.2,
+                 prepare: Optional[Callable[[ConfigParser], Any]] = None) -> None:
+        self.config_path = Path(config_path)
+        self.status_path = self.config_path.with_suffix('.status.json')
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.prepare = prepare
+
+        self.version = 0
+        self._pending: Optional[Tuple[ConfigParser, Any, Optional[str]]] = None
+        self._applying_digest: Optional[str] = None
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._last_stat = self._stat()
+
+        self.thread = Thread(target=self._watch, name='ConfigWatcher', daemon=True)
+
+    def start(self) -> 'ConfigWatcher':
+        self._write_status(status='running', digest=self._digest())
+        self.thread.start()
+        return self
+
+    def poll(self) -> Optional[Tuple[ConfigParser, Any]]:
+        """Return the next validated (config, prepared) pair, or None. Cheap enough to call every frame."""
+        if self._pending is None:
+            return None
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+
+        config, prepared, digest = pending
+        self._applying_digest = digest
+        return config, prepared
+
+    def report_applied(self, changes: Dict[str, Any]) -> None:
+        """Called by the main loop once a polled config is in use."""
+        self.version += 1
+        self._write_status(status='applied', digest=self._applying_digest, changes=changes)
+        logger.info(f"Applied config version {self.version}: {changes}")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=self.poll_interval + 1)
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            stat = self._stat()
+            if stat is None or stat == self._last_stat:
+                continue
+
+            # editors and the web tool may still be writing, wait until the file stops changing
+            self._stop_event.wait(self.settle_time)
+            settled = self._stat()
+            if settled != stat:
+                continue
+
+            self._last_stat = settled
+            digest = self._digest()
+
+            try:
+                config = ConfigValidator.load_and_validate_config(self.config_path)
+                prepared = self.prepare(config) if self.prepare else None
+
+            except Exception as e:
+                logger.error(f"Rejected config change in {self.config_path}: {e}")
+                # OWL errors are coloured for the terminal, strip the escape codes for the web interface
+                self._write_status(status='rejected', digest=digest, error=re.sub(r'\x1b\[[0-9;]*m', '', str(e)).strip())
+                continue
+
+            with self._lock:
+                self._pending = (config, prepared, digest)
+
+            logger.info(f"Config change detected in {self.config_path}, applying on next frame.")
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def _digest(self) -> Optional[str]:
+        try:
+            return hashlib.sha1(self.config_path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def _write_status(self, status: str, digest: Optional[str] = None, **details: Any) -> None:
+        report = {
+            'status': status,
+            'version': self.version,
+            'sha1': digest,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            **details
+        }
+
+        # write to a temporary file and rename so readers never see a partial report
+        tmp_path = self.status_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(report, f, default=str)
+            os.replace(tmp_path, self.status_path)
+
+        except OSError as e:
+            logger.warning(f"Could not write config status file {self.status_path}: {e}")
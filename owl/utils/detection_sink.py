@@ -0,0 +1,199 @@
+import queue
+import time
+import numpy as np
+
+from datetime import datetime, date
+from pathlib import Path
+from queue import Queue
+from threading import Thread, Event
+from typing import Optional, Union
+from utils.log_manager import LogManager
+
+# one fixed-width little-endian record per detection (32 bytes)
+DETECTION_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('frame_id', '<u4'),
+    ('x', '<i2'),
+    ('y', '<i2'),
+    ('w', '<i2'),
+    ('h', '<i2'),
+    ('cx', '<i2'),
+    ('cy', '<i2'),
+    ('lane', '<i2'),
+    ('class_id', '<i2'),
+    ('confidence', '<f4'),
+])
+
+MAGIC = b'OWLDET01'
+HEADER = np.dtype([('magic', 'S8'), ('record_size', '<u4'), ('reserved', '<u4')])
+FILE_SUFFIX = '.owldet'
+
+
+class DetectionSink:
+    """
+    Writes detections as fixed-width binary records. The main loop builds one small structured array per frame and
+    queues it; a worker thread concatenates the queued arrays and appends them to the current chunk file in batches.
+    Chunks rotate after max_records or when the date changes, and are named by their start time so a day's
+    detections can be found by file name alone.
+    """
+
+    def __init__(self, directory: Union[str, Path], batch_size: int = 1000, flush_interval: float = 1.0,
+                 max_records: int = 1_000_000, max_queue: int = 1000):
+        self.logger = LogManager.get_logger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_records = max_records
+
+        self.queue = Queue(maxsize=max_queue)
+        self.dropped_frames = 0
+        self.records_written = 0
+
+        self._file = None
+        self._file_day = None
+        self._file_records = 0
+
+        self.stop_event = Event()
+        self.worker = Thread(target=self._process_queue, name='DetectionSink', daemon=True)
+        self.worker.start()
+
+    def write(self, frame_id: int, timestamp: float, boxes, centres, lanes=None, confidences=None,
+              class_ids=None) -> None:
+        """Queue all detections from one frame. Arrays are (N, 4) boxes and (N, 2) centres; never blocks."""
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        if len(boxes) == 0:
+            return
+
+        centres = np.asarray(centres).reshape(-1, 2)
+        records = np.empty(len(boxes), dtype=DETECTION_DTYPE)
+        records['timestamp'] = timestamp
+        records['frame_id'] = frame_id
+        records['x'], records['y'], records['w'], records['h'] = boxes.T
+        records['cx'], records['cy'] = centres.T
+        records['lane'] = -1 if lanes is None else lanes
+        records['class_id'] = -1 if class_ids is None else class_ids
+        records['confidence'] = np.nan if confidences is None else confidences
+
+        try:
+            self.queue.put_nowait(records)
+        except queue.Full:
+            self.dropped_frames += 1
+
+    def _process_queue(self) -> None:
+        batch = []
+        batch_records = 0
+        last_flush = time.time()
+
+        while not self.stop_event.is_set() or not self.queue.empty():
+            try:
+                records = self.queue.get(timeout=0.1)
+                batch.append(records)
+                batch_records += len(records)
+
+            except queue.Empty:
+                pass
+
+            if batch and (batch_records >= self.batch_size or time.time() - last_flush >= self.flush_interval):
+                self._flush(batch)
+                batch, batch_records = [], 0
+                last_flush = time.time()
+
+        if batch:
+            self._flush(batch)
+
+        if self._file is not None:
+            self._file.close()
+
+    def _flush(self, batch: list) -> None:
+        try:
+            records = np.concatenate(batch)
+            today = date.today()
+            if self._file is None or self._file_day != today or self._file_records >= self.max_records:
+                self._rotate(today)
+
+            records.tofile(self._file)
+            self._file.flush()
+            self._file_records += len(records)
+            self.records_written += len(records)
+
+        except Exception as e:
+            self.logger.error(f"Error writing detections: {e}", exc_info=True)
+
+    def _rotate(self, today: date) -> None:
+        if self._file is not None:
+            self._file.close()
+
+        path = self.directory / f"detections_{datetime.now().strftime('%Y%m%dT%H%M%S_%f')}{FILE_SUFFIX}"
+        self._file = open(path, 'wb')
+        header = np.zeros(1, dtype=HEADER)
+        header['magic'] = MAGIC
+        header['record_size'] = DETECTION_DTYPE.itemsize
+        header.tofile(self._file)
+
+        self._file_day = today
+        self._file_records = 0
+        self.logger.info(f"[INFO] Writing detections to {path}")
+
+    def stop(self) -> None:
+        """Write anything still queued and close the current chunk."""
+        self.stop_event.set()
+        self.worker.join()
+
+
+def read_detection_file(path: Union[str, Path]) -> np.ndarray:
+    """Memory-map one chunk file. A partially written final record (e.g. after a power cut) is ignored."""
+    path = Path(path)
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{path} is not an OWL detection file")
+    if header['record_size'][0] != DETECTION_DTYPE.itemsize:
+        raise ValueError(f"{path} has {header['record_size'][0]} byte records, expected {DETECTION_DTYPE.itemsize}")
+
+    count = (path.stat().st_size - HEADER.itemsize) // DETECTION_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=DETECTION_DTYPE)
+
+    return np.memmap(path, dtype=DETECTION_DTYPE, mode='r', offset=HEADER.itemsize, shape=(count,))
+
+
+def load_detections(directory: Union[str, Path], day: Optional[Union[str, date]] = None) -> np.ndarray:
+    """
+    Load all detections in a directory, or only those from chunks started on one day, into a single structured array.
+    :param directory: directory written by DetectionSink
+    :param day: a date or 'YYYY-MM-DD' / 'YYYYMMDD' string, all days if None
+    """
+    if isinstance(day, date):
+        day = day.strftime('%Y%m%d')
+    elif day is not None:
+        day = day.replace('-', '')
+
+    pattern = f"detections_{day or ''}*{FILE_SUFFIX}"
+    chunks = [read_detection_file(path) for path in sorted(Path(directory).glob(pattern))]
+    if not chunks:
+        return np.empty(0, dtype=DETECTION_DTYPE)
+
+    return np.concatenate(chunks)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.detection_sink logs/detections --day 2025-10-19
+    ap = argparse.ArgumentParser(description='Summarise binary OWL detection logs.')
+    ap.add_argument('directory', type=str, help='directory containing .owldet files')
+    ap.add_argument('--day', type=str, default=None, help='only load this day (YYYY-MM-DD)')
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    detections = load_detections(args.directory, day=args.day)
+    load_time = time.perf_counter() - start
+
+    print(f"Loaded {len(detections)} detections in {load_time * 1000:.1f} ms")
+    if len(detections):
+        print(f"From {datetime.fromtimestamp(detections['timestamp'].min())} "
+              f"to {datetime.fromtimestamp(detections['timestamp'].max())}")
+        print(f"Frames with detections: {len(np.unique(detections['frame_id']))}")
+        lanes, counts = np.unique(detections['lane'], return_counts=True)
+        print('Detections per lane: ' + ', '.join(f'{lane}: {count}' for lane, count in zip(lanes, counts)))
@@ -0,0 +1,121 @@
+import numpy as np
+
+from typing import Dict, Optional
+from utils.log_manager import LogManager
+
+
+class ExposureController:
+    """
+    Histogram based exposure loop for picamera2. Every interval frames the capture thread hands over the latest
+    frame; the controller takes a subsampled luminance histogram (1 in step x step pixels) and moves the exposure
+    time and analogue gain towards target_brightness. Exposure time is raised first, up to max_exposure_time to
+    limit motion blur, and gain makes up the rest. Changes are damped so the loop does not oscillate with the
+    sensor's frame latency, and overexposed highlights always pull the exposure down.
+    """
+
+    def __init__(self, target_brightness: float = 110, max_exposure_time: int = 2000, min_exposure_time: int = 50,
+                 max_gain: float = 8.0, interval: int = 10, step: int = 8, tolerance: float = 8,
+                 damping: float = 0.5, max_clipped: float = 0.02):
+        """
+        :param target_brightness: mean luminance to aim for (0 - 255)
+        :param max_exposure_time: longest exposure in microseconds
+        :param min_exposure_time: shortest exposure in microseconds
+        :param max_gain: highest analogue gain
+        :param interval: frames between updates
+        :param step: subsampling step for the histogram
+        :param tolerance: no change while the mean is within this of the target
+        :param damping: fraction of the correction applied per update, in log space
+        :param max_clipped: fraction of saturated pixels that forces the exposure down
+        """
+        self.logger = LogManager.get_logger(__name__)
+        self.target_brightness = target_brightness
+        self.max_exposure_time = max_exposure_time
+        self.min_exposure_time = min_exposure_time
+        self.max_gain = max_gain
+        self.interval = max(interval, 1)
+        self.step = max(step, 1)
+        self.tolerance = tolerance
+        self.damping = damping
+        self.max_clipped = max_clipped
+
+        self.exposure_time = max_exposure_time
+        self.gain = 1.0
+        self.brightness = None
+        self.frames = 0
+
+    @classmethod
+    def from_config(cls, config) -> 'ExposureController':
+        return cls(target_brightness=config.getfloat('Camera', 'exposure_target', fallback=110),
+                   max_exposure_time=config.getint('Camera', 'max_exposure_time', fallback=2000),
+                   max_gain=config.getfloat('Camera', 'max_analogue_gain', fallback=8.0),
+                   interval=config.getint('Camera', 'exposure_interval', fallback=10))
+
+    def start(self, exposure_time: Optional[float] = None, gain: Optional[float] = None) -> Dict[str, float]:
+        """Take over from the sensor's auto exposure, starting from its last values where known."""
+        if exposure_time:
+            self.exposure_time = min(max(int(exposure_time), self.min_exposure_time), self.max_exposure_time)
+        if gain:
+            self.gain = min(max(float(gain), 1.0), self.max_gain)
+
+        self.logger.info(f"[INFO] Exposure control started at {self.exposure_time} us, gain {self.gain:.2f}, "
+                         f"target brightness {self.target_brightness}")
+        return self.controls()
+
+    def controls(self) -> Dict[str, float]:
+        return {'AeEnable': False, 'ExposureTime': int(self.exposure_time), 'AnalogueGain': float(self.gain)}
+
+    def measure(self, frame: np.ndarray):
+        """Mean luminance and fraction of saturated pixels of a subsampled BGR frame."""
+        sample = frame[::self.step, ::self.step]
+        if sample.ndim == 3:
+            # integer BT.601 luma on the sample only
+            sample = sample.astype(np.uint16)
+            sample = (29 * sample[..., 0] + 150 * sample[..., 1] + 77 * sample[..., 2]) >> 8
+
+        hist = np.bincount(sample.ravel(), minlength=256)
+        total = max(hist.sum(), 1)
+        mean = float(np.dot(hist, np.arange(len(hist)))) / total
+        clipped = float(hist[250:].sum()) / total
+
+        return mean, clipped
+
+    def update(self, frame: np.ndarray) -> Optional[Dict[str, float]]:
+        """Call for every captured frame. Returns new controls to set, or None when nothing changes."""
+        self.frames += 1
+        if self.frames % self.interval:
+            return None
+
+        self.brightness, clipped = self.measure(frame)
+        ratio = self.target_brightness / max(self.brightness, 1.0)
+        if clipped > self.max_clipped:
+            ratio = min(ratio, 0.8)
+        elif abs(self.brightness - self.target_brightness) <= self.tolerance:
+            return None
+
+        total = self.exposure_time * self.gain * ratio ** self.damping
+        exposure_time = min(max(total, self.min_exposure_time), self.max_exposure_time)
+        gain = min(max(total / exposure_time, 1.0), self.max_gain)
+
+        if int(exposure_time) == int(self.exposure_time) and abs(gain - self.gain) < 0.01:
+            # at a limit, nothing more can be done
+            return None
+
+        self.exposure_time, self.gain = exposure_time, gain
+        return self.controls()
+
+
+if __name__ == "__main__":
+    # run from the owl directory: python -m utils.exposure
+    # simulates a scene that darkens under cloud and then brightens, with a sensor that responds linearly
+    controller = ExposureController(target_brightness=110, max_exposure_time=2000, max_gain=8, interval=1)
+    controller.start(exposure_time=1000, gain=1.0)
+
+    rng = np.random.default_rng(0)
+    texture = rng.uniform(0.6, 1.4, size=(240, 320, 1))
+    for frame_number, scene in enumerate([0.25] * 10 + [0.08] * 15 + [1.0] * 15):
+        # brightness proportional to scene radiance x exposure x gain, saturating at 255
+        signal = scene * controller.exposure_time * controller.gain / 4
+        frame = np.clip(texture * signal, 0, 255).astype(np.uint8).repeat(3, axis=2)
+        controller.update(frame)
+        print(f"frame {frame_number:2d} scene {scene:.2f} brightness {controller.brightness:6.1f} "
+              f"exposure {int(controller.exposure_time):5d} us gain {controller.gain:.2f}")
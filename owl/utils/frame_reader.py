@@ -4,14 +4,19 @@ import cv2
 import logging
 from typing import Optional, Tuple, Union
 from imutils.video import FileVideoStream
+from utils.clock import SystemClock
 
 logger = logging.getLogger(__name__)
 
+# frames per second for image directories and videos without a frame rate, when reading on a virtual clock
+DEFAULT_FRAME_RATE = 30.0
+
 
 class FrameReader:
     """Handles reading of different media types for OWL processing."""
 
-    def __init__(self, path: Union[str, Path], resolution: Optional[Tuple[int, int]] = None, loop_time: float = 5.0):
+    def __init__(self, path: Union[str, Path], resolution: Optional[Tuple[int, int]] = None, loop_time: float = 5.0,
+                 clock: Optional[SystemClock] = None, frame_rate: Optional[float] = None):
         """
         Initialize media reader for images, videos or directories.
 
@@ -19,11 +24,18 @@ class FrameReader:
             path: Path to media (directory, image, or video)
             resolution: Optional (width, height) to resize media
             loop_time: Time between frames when reading from directory
+            clock: Clock for loop_time and frame pacing, the system clock if None
+            frame_rate: Deliver at most this many frames per second of clock time. On a virtual clock it defaults
+                to the video's frame rate, so each read advances simulated time by one recorded frame.
         """
         self.path = Path(path)
         self._resolution = None
         self.loop_time = loop_time
-        self.loop_start_time = time.time()
+        self.clock = clock or SystemClock()
+        self.frame_rate = frame_rate
+        self.next_frame_time = None
+        self.video_frame_rate = None
+        self.loop_start_time = self.clock.time()
         self.cam = None
         self.curr_image = None
         self.files = None
@@ -41,6 +53,9 @@ class FrameReader:
         if resolution:
             self._resolution = resolution
 
+        if self.frame_rate is None and self.clock.virtual:
+            self.frame_rate = self.video_frame_rate or DEFAULT_FRAME_RATE
+
         logger.info(f"Initialized FrameReader for {self.path} with resolution {self._resolution}")
 
     def _setup_directory(self):
@@ -81,6 +96,7 @@ class FrameReader:
             w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             self._resolution = (w, h)
+            self.video_frame_rate = cap.get(cv2.CAP_PROP_FPS) or None
             cap.release()
 
             # Initialize video stream
@@ -97,6 +113,9 @@ class FrameReader:
 
     def read(self):
         """Read next frame/image from the source."""
+        if self.frame_rate:
+            self._pace()
+
         if self.single_image:
             return self.cam
 
@@ -105,9 +124,18 @@ class FrameReader:
 
         return self._read_from_video()
 
+    def _pace(self):
+        """Hold each frame for one frame period of clock time, on a virtual clock this advances simulated time."""
+        now = self.clock.time()
+        if self.next_frame_time is not None and self.next_frame_time > now:
+            self.clock.sleep(self.next_frame_time - now)
+            now = self.next_frame_time
+
+        self.next_frame_time = now + 1.0 / self.frame_rate
+
     def _read_from_directory(self):
         """Handle reading from image directory."""
-        if self.curr_image is None or (time.time() - self.loop_start_time) > self.loop_time:
+        if self.curr_image is None or (self.clock.time() - self.loop_start_time) > self.loop_time:
             try:
                 img_path = next(self.files)
                 self.curr_image = cv2.imread(str(img_path))
@@ -117,7 +145,7 @@ class FrameReader:
                 if self._resolution:
                     self.curr_image = cv2.resize(self.curr_image, self._resolution,
                                                  interpolation=cv2.INTER_AREA)
-                self.loop_start_time = time.time()
+                self.loop_start_time = self.clock.time()
             except StopIteration:
                 self.files = iter(self.path.glob("*.[jp][pn][g]"))
                 return self._read_from_directory()
@@ -139,7 +167,8 @@ class FrameReader:
         elif self.input_type == "video":
             self.cam.stop()
             self.cam = FileVideoStream(str(self.path)).start()
-        self.loop_start_time = time.time()
+        self.loop_start_time = self.clock.time()
+        self.next_frame_time = None
 
     def stop(self):
         """Clean up resources."""
@@ -4,11 +4,38 @@ import numpy as np
 import cv2
 
 
+def make_clip_lut(exg_min, exg_max):
+    """np.uint8(np.abs(np.clip(x, exg_min, exg_max))) for every uint8 value x, as a cv2.LUT table."""
+    return np.uint8(np.abs(np.clip(np.arange(256), exg_min, exg_max)))
+
+
 class GreenOnBrown:
-    def __init__(self, algorithm='exg', label_file='models/labels.txt'):
+    # threshold pairs kept in the clip lookup cache, trackbar changes add a new pair each time
+    MAX_CLIP_LUTS = 64
+
+    def __init__(self, algorithm='exg', label_file='models/labels.txt', use_connected_components=False,
+                 processing_scale=1.0, normaliser=None):
         self.algorithm = algorithm
         self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
 
+        # label the threshold mask in one call instead of looping over contours in Python
+        self.use_connected_components = use_connected_components
+
+        # run detection on a downsampled frame and map the results back to full resolution
+        if not 0 < processing_scale <= 1.0:
+            raise ValueError(f"processing_scale must be in (0, 1], got {processing_scale}")
+        self.processing_scale = processing_scale
+
+        # keep the adaptive threshold neighbourhood the same physical size at lower resolutions (must be odd)
+        self.block_size = max(3, int(31 * processing_scale) | 1)
+
+        # optional BrightnessNormaliser, applied after downsampling so the lookup covers fewer pixels
+        self.normaliser = normaliser
+
+        # (exg_min, exg_max): clip lookup table. Sensitivity profiles add theirs to profile_luts, which is never evicted
+        self.clip_luts = {}
+        self.profile_luts = {}
+
         # Dictionary mapping algorithm names to functions
         self.algorithms = {
             'exg': exg,
@@ -37,51 +64,129 @@ class GreenOnBrown:
                   invert_hue=False,
                   label='WEED'):
         threshed_already = False
+        full_image = image
+
+        if self.processing_scale < 1.0:
+            image, scale_x, scale_y = self._downscale(image)
+            min_detection_area = min_detection_area * self.processing_scale ** 2
+
+        if self.normaliser is not None:
+            image = self.normaliser.apply(image)
 
         # Handle special cases for functions with additional parameters
-        if algorithm == 'exhsv':
-            output = func(image, hue_min=hue_min, hue_max=hue_max, brightness_min=brightness_min,
+        if self.algorithm == 'exhsv':
+            output = self.func(image, hue_min=hue_min, hue_max=hue_max, brightness_min=brightness_min,
                           brightness_max=brightness_max, saturation_min=saturation_min,
                           saturation_max=saturation_max, invert_hue=invert_hue)
-        elif algorithm == 'hsv':
-            output, threshed_already = func(image, hue_min=hue_min, hue_max=hue_max, brightness_min=brightness_min,
+        elif self.algorithm == 'hsv':
+            output, threshed_already = self.func(image, hue_min=hue_min, hue_max=hue_max, brightness_min=brightness_min,
                                             brightness_max=brightness_max, saturation_min=saturation_min,
                                             saturation_max=saturation_max, invert_hue=invert_hue)
         else:
-            output = func(image)
+            output = self.func(image)
 
         weed_centres = []
         boxes = []
 
         if not threshed_already:
-            output = np.clip(output, exg_min, exg_max)
-            output = np.uint8(np.abs(output))
+            if output.dtype == np.uint8:
+                output = cv2.LUT(output, self.clip_lut(exg_min, exg_max))
+            else:
+                output = np.clip(output, exg_min, exg_max)
+                output = np.uint8(np.abs(output))
             if show_display:
                 cv2.imshow("HSV Threshold on ExG", output)
             threshold_out = cv2.adaptiveThreshold(output, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
-                                                  31, 2)
+                                                  self.block_size, 2)
             # threshold_out = cv2.threshold(output, exg_min, exg_max, cv2.THRESH_BINARY)
             threshold_out = cv2.morphologyEx(threshold_out, cv2.MORPH_CLOSE, self.kernel, iterations=1)
         else:
             threshold_out = cv2.morphologyEx(output, cv2.MORPH_CLOSE, self.kernel, iterations=5)
 
-        contours, _ = cv2.findContours(threshold_out, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if self.use_connected_components:
+            contours = None
+            boxes, weed_centres = self._connected_components(threshold_out, min_detection_area)
+
+        else:
+            contours, _ = cv2.findContours(threshold_out, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-        for c in contours:
-            if cv2.contourArea(c) > min_detection_area:
-                x, y, w, h = cv2.boundingRect(c)
-                boxes.append([x, y, w, h])
-                weed_centres.append([x + w // 2, y + h // 2])
+            for c in contours:
+                if cv2.contourArea(c) > min_detection_area:
+                    x, y, w, h = cv2.boundingRect(c)
+                    boxes.append([x, y, w, h])
+                    weed_centres.append([x + w // 2, y + h // 2])
+
+        # contours are left at the processing resolution, boxes and centres are mapped back to the full frame
+        if self.processing_scale < 1.0:
+            boxes, weed_centres = self._rescale_detections(boxes, scale_x, scale_y)
+            if not self.use_connected_components:
+                boxes, weed_centres = boxes.tolist(), weed_centres.tolist()
 
         if show_display:
-            image_out = image.copy()
+            image_out = full_image.copy()
             for box in boxes:
                 startX, startY, boxW, boxH = box
                 endX = startX + boxW
                 endY = startY + boxH
-                cv2.putText(image_out, label, (startX, startY + 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 0, 0), 2)
-                cv2.rectangle(image_out, (int(startX), int(startY)), (endX, endY), (0, 0, 255), 2)
+                cv2.putText(image_out, label, (int(startX), int(startY) + 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 0, 0), 2)
+                cv2.rectangle(image_out, (int(startX), int(startY)), (int(endX), int(endY)), (0, 0, 255), 2)
 
             return contours, boxes, weed_centres, image_out
 
         return contours, boxes, weed_centres, None
+
+    def clip_lut(self, exg_min, exg_max):
+        lut = self.profile_luts.get((exg_min, exg_max))
+        if lut is None:
+            lut = self.clip_luts.get((exg_min, exg_max))
+        if lut is None:
+            if len(self.clip_luts) >= self.MAX_CLIP_LUTS:
+                self.clip_luts.clear()
+            lut = self.clip_luts[(exg_min, exg_max)] = make_clip_lut(exg_min, exg_max)
+
+        return lut
+
+    def _downscale(self, image):
+        """
+        Downsamples the frame by processing_scale with INTER_AREA (pixel area averaging).
+        :param image: full resolution BGR image
+        :return: the downsampled image and the x and y factors to map coordinates back to full resolution
+        """
+        height, width = image.shape[:2]
+        scaled_width = max(1, int(round(width * self.processing_scale)))
+        scaled_height = max(1, int(round(height * self.processing_scale)))
+        small = cv2.resize(image, (scaled_width, scaled_height), interpolation=cv2.INTER_AREA)
+
+        return small, width / scaled_width, height / scaled_height
+
+    @staticmethod
+    def _rescale_detections(boxes, scale_x, scale_y):
+        """
+        Maps boxes found on the downsampled frame back to full resolution coordinates.
+        :return: boxes as an (N, 4) array of x, y, w, h and weed centres as an (N, 2) array of x, y
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        boxes = np.rint(boxes * np.array([scale_x, scale_y, scale_x, scale_y], dtype=np.float32)).astype(np.int32)
+        weed_centres = boxes[:, :2] + boxes[:, 2:] // 2
+
+        return boxes, weed_centres
+
+    @staticmethod
+    def _connected_components(threshold_out, min_detection_area):
+        """
+        Labels the binary mask with cv2.connectedComponentsWithStats and filters the components by pixel area.
+        Note the area is a pixel count, where the contour path uses the polygon area from cv2.contourArea.
+        :param threshold_out: binary uint8 mask
+        :param min_detection_area: components with an area at or below this are discarded
+        :return: boxes as an (N, 4) array of x, y, w, h and weed centres as an (N, 2) array of x, y
+        """
+        _, _, stats, _ = cv2.connectedComponentsWithStats(threshold_out, connectivity=8)
+
+        # label 0 is the background
+        stats = stats[1:]
+        stats = stats[stats[:, cv2.CC_STAT_AREA] > min_detection_area]
+
+        boxes = stats[:, [cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT]]
+        weed_centres = boxes[:, :2] + boxes[:, 2:] // 2
+
+        return boxes, weed_centres
@@ -3,18 +3,22 @@ from pathlib import Path
 from typing import Tuple, List, Optional
 import numpy as np
 import logging
+import time
 import cv2
 from ultralytics import YOLO
 
 logger = logging.getLogger(__name__)
 
 class GreenOnGreen:
-    def __init__(self, model_path: str = 'models') -> None:
-        """Initialize YOLO model for weed detection."""
+    def __init__(self, model_path: str = 'models', input_size: Optional[int] = None) -> None:
+        """Initialize YOLO model for weed detection. input_size is the model input in pixels, if fixed by the export."""
         self.model_path = Path(model_path)
+        self.predict_args = {'imgsz': input_size} if input_size else {}
         self.model = self._load_model()
         self.weed_centers: List[List[int]] = []
         self.boxes: List[List[int]] = []
+        self.confidences: List[float] = []
+        self.class_ids: List[int] = []
 
     def _load_model(self) -> YOLO:
         """Load YOLO model, supporting both .pt and NCNN formats."""
@@ -46,37 +50,85 @@ class GreenOnGreen:
 
         return YOLO(str(self.model_path), task='detect')
 
+    def warmup(self, frame_shape: Tuple[int, int, int], runs: int = 2, batch: int = 1) -> List[float]:
+        """
+        Run inference on blank frames of the camera frame shape so graph setup and memory allocation happen before
+        the first real frame. batch is the number of cameras sharing the model. Returns the latency of each run in
+        seconds, the first being the cold start.
+        """
+        blank = np.zeros(frame_shape, dtype=np.uint8)
+        source = [blank] * batch if batch > 1 else blank
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.model.predict(source=source, conf=0.99, verbose=False, **self.predict_args)
+            latencies.append(time.perf_counter() - start)
+
+        return latencies
+
     def inference(self,
                     image: np.ndarray,
                     confidence: float = 0.5,
-                    show_display: bool = False) -> Tuple[None, List[List[int]], List[List[int]], Optional[np.ndarray]]:
-        """Run inference on image and return detections."""
+                    show_display: bool = False,
+                    classes: Optional[List[int]] = None) -> Tuple[None, List[List[int]], List[List[int]], Optional[np.ndarray]]:
+        """Run inference on image and return detections. classes limits detection to those class ids, the filtering
+        happens in the model's NMS so boxes of other classes are never decoded."""
         self.weed_centers = []
         self.boxes = []
-        results = self.model.predict(source=image, conf=confidence, verbose=False)
-
-        if show_display:
-            image_out = image.copy()
-        else:
-            image_out = None
+        self.confidences = []
+        self.class_ids = []
+        results = self.model.predict(source=image, conf=confidence, classes=classes, verbose=False,
+                                     **self.predict_args)
 
-        # Process each detection
+        image_out = image.copy() if show_display else None
         for result in results:
-            for box in result.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                w = x2 - x1
-                h = y2 - y1
-
-                self.boxes.append([x1, y1, w, h])
-                center_x = x1 + w // 2
-                center_y = y1 + h // 2
-                self.weed_centers.append([center_x, center_y])
-
-                if show_display:
-                    conf = float(box.conf[0])
-                    label = f'{int(conf * 100)}% weed'
-                    cv2.rectangle(image_out, (x1, y1), (x2, y2), (0, 0, 255), 2)
-                    cv2.putText(image_out, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX,
-                                    1.0, (255, 0, 0), 2)
-
-            return None, self.boxes, self.weed_centers, image_out
+            self._add_detections(result, image_out)
+
+        return None, self.boxes, self.weed_centers, image_out
+
+    def inference_batch(self,
+                        images: List[np.ndarray],
+                        confidence: float = 0.5,
+                        show_display: bool = False,
+                        classes: Optional[List[int]] = None,
+                        offsets: Optional[List[int]] = None) -> Tuple[None, List[List[int]], List[List[int]], List]:
+        """
+        Run one batched prediction over frames from several cameras, so the model is loaded once and the per-call
+        overhead is shared. offsets shift each frame's boxes along x into a shared coordinate space, e.g. the camera
+        mosaic built by CameraArray. Returns the same as inference(), with one annotated image per frame.
+        """
+        self.weed_centers = []
+        self.boxes = []
+        self.confidences = []
+        self.class_ids = []
+        results = self.model.predict(source=list(images), conf=confidence, classes=classes, verbose=False,
+                                     **self.predict_args)
+
+        images_out = []
+        for i, (image, result) in enumerate(zip(images, results)):
+            image_out = image.copy() if show_display else None
+            self._add_detections(result, image_out, x_offset=offsets[i] if offsets else 0)
+            images_out.append(image_out)
+
+        return None, self.boxes, self.weed_centers, images_out
+
+    def _add_detections(self, result, image_out: Optional[np.ndarray], x_offset: int = 0) -> None:
+        for box in result.boxes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0])
+            w = x2 - x1
+            h = y2 - y1
+
+            self.boxes.append([x1 + x_offset, y1, w, h])
+            center_x = x1 + w // 2
+            center_y = y1 + h // 2
+            self.weed_centers.append([center_x + x_offset, center_y])
+
+            conf = float(box.conf[0])
+            self.confidences.append(conf)
+            self.class_ids.append(int(box.cls[0]))
+
+            if image_out is not None:
+                label = f'{int(conf * 100)}% weed'
+                cv2.rectangle(image_out, (x1, y1), (x2, y2), (0, 0, 255), 2)
+                cv2.putText(image_out, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX,
+                                1.0, (255, 0, 0), 2)
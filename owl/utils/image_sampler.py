@@ -17,9 +17,10 @@ class ImageRecorder:
         self.max_processes = max_processes
         self.processes = []
         self.running = True
-        self.start_new_process()
+        self.dropped_frames = 0
 
         self.logger = LogManager.get_logger(__name__)
+        self.start_new_process()
 
     def start_new_process(self):
         if len(self.processes) < self.max_processes:
@@ -87,6 +88,7 @@ class ImageRecorder:
         if not self.queue.full():
             self.queue.put((frame, frame_id, boxes, centres))
         else:
+            self.dropped_frames += 1
             self.logger.info("[INFO] Queue is full, spinning up new process. Frame skipped.")
 
         if self.queue.qsize() > self.new_process_threshold and len(self.processes) < self.max_processes:
@@ -1,10 +1,9 @@
 import time
 import platform
-import configparser
-import subprocess
-import cv2
 import logging
 
+from utils.control_block import DETECTION_ON, DETECTION_OFF, ALL_NOZZLES_ON, SENSITIVITY_HIGH, SENSITIVITY_LOW
+
 logger = logging.getLogger(__name__)
 
 def is_raspberry_pi() -> bool:
@@ -25,7 +24,7 @@ class UteController:
     def __init__(self, detection_state,
                  sample_state,
                  stop_flag,
-                 owl_instance,
+                 control_block,
                  status_indicator,
                  switch_purpose='recording',
                  switch_board_pin='BOARD37',
@@ -37,7 +36,8 @@ class UteController:
         self.detection_state = detection_state
         self.sample_state = sample_state
 
-        self.owl = owl_instance
+        # switch changes go to the shared control block, the detection loop applies them between frames
+        self.control_block = control_block
         self.status_indicator = status_indicator
         self.status_indicator.start_storage_indicator()
 
@@ -56,7 +56,7 @@ class UteController:
         if self.switch_purpose == 'detection':
             with self.detection_state.get_lock():
                 self.detection_state.value = is_active
-            self.owl.disable_detection = not is_active
+            self.control_block.update(detection_mode=DETECTION_ON if is_active else DETECTION_OFF)
             if is_active:
                 self.status_indicator.enable_weed_detection()
             else:
@@ -65,7 +65,7 @@ class UteController:
         elif self.switch_purpose == 'recording':
             with self.sample_state.get_lock():
                 self.sample_state.value = is_active
-            self.owl.sample_images = is_active
+            self.control_block.update(recording=is_active)
             if is_active:
                 self.status_indicator.enable_image_recording()
             else:
@@ -94,10 +94,8 @@ class AdvancedController:
                  sensitivity_state,
                  detection_mode_state,
                  stop_flag,
-                 owl_instance,
+                 control_block,
                  status_indicator,
-                 low_sensitivity_config,
-                 high_sensitivity_config,
                  detection_mode_bpin_down='BOARD35',
                  detection_mode_bpin_up='BOARD36',
                  recording_bpin='BOARD38',
@@ -115,23 +113,20 @@ class AdvancedController:
 
         self.stop_flag = stop_flag
 
-        # set up instances for owl and status
-        self.owl = owl_instance
+        # switch changes go to the shared control block, the detection loop applies them between frames
+        self.control_block = control_block
         self.status_indicator = status_indicator
         self.status_indicator.start_storage_indicator()
 
-        self.low_sensitivity_settings = self._read_config(low_sensitivity_config)
-        self.high_sensitivity_settings = self._read_config(high_sensitivity_config)
-
         # Set up switch handlers
         self.recording_switch.when_pressed = self.update_recording_state
         self.recording_switch.when_released = self.update_recording_state
         self.sensitivity_switch.when_pressed = self.update_sensitivity_state
         self.sensitivity_switch.when_released = self.update_sensitivity_state
-        self.detection_mode_switch_up.when_pressed = lambda: self.set_detection_mode(2)  # All solenoids on
-        self.detection_mode_switch_up.when_released = lambda: self.set_detection_mode(1)  # Off
-        self.detection_mode_switch_down.when_pressed = lambda: self.set_detection_mode(0)  # Detection on
-        self.detection_mode_switch_down.when_released = lambda: self.set_detection_mode(1)  # Off
+        self.detection_mode_switch_up.when_pressed = lambda: self.set_detection_mode(ALL_NOZZLES_ON)
+        self.detection_mode_switch_up.when_released = lambda: self.set_detection_mode(DETECTION_OFF)
+        self.detection_mode_switch_down.when_pressed = lambda: self.set_detection_mode(DETECTION_ON)
+        self.detection_mode_switch_down.when_released = lambda: self.set_detection_mode(DETECTION_OFF)
 
         # Initialize states based on initial switch positions
         self.update_state()
@@ -147,10 +142,9 @@ class AdvancedController:
             self.recording_state.value = self.recording_switch.is_pressed
         if self.recording_state.value:
             self.status_indicator.enable_image_recording()
-            self.owl.sample_images = True
         else:
             self.status_indicator.disable_image_recording()
-            self.owl.sample_images = False
+        self.control_block.update(recording=self.recording_state.value)
 
     def update_sensitivity_state(self):
         with self.sensitivity_state.get_lock():
@@ -159,53 +153,32 @@ class AdvancedController:
 
     def update_sensitivity_settings(self):
         self.status_indicator.generic_notification()
-        settings = self.low_sensitivity_settings if self.sensitivity_state.value else self.high_sensitivity_settings
-
-        # Update Owl instance settings
-        self.owl.exg_min = settings['exg_min']
-        self.owl.exg_max = settings['exg_max']
-        self.owl.hue_min = settings['hue_min']
-        self.owl.hue_max = settings['hue_max']
-        self.owl.saturation_min = settings['saturation_min']
-        self.owl.saturation_max = settings['saturation_max']
-        self.owl.brightness_min = settings['brightness_min']
-        self.owl.brightness_max = settings['brightness_max']
-
-        # Update trackbars if show_display is True
-        if self.owl.show_display:
-            cv2.setTrackbarPos("ExG-Min", self.owl.window_name, self.owl.exg_min)
-            cv2.setTrackbarPos("ExG-Max", self.owl.window_name, self.owl.exg_max)
-            cv2.setTrackbarPos("Hue-Min", self.owl.window_name, self.owl.hue_min)
-            cv2.setTrackbarPos("Hue-Max", self.owl.window_name, self.owl.hue_max)
-            cv2.setTrackbarPos("Sat-Min", self.owl.window_name, self.owl.saturation_min)
-            cv2.setTrackbarPos("Sat-Max", self.owl.window_name, self.owl.saturation_max)
-            cv2.setTrackbarPos("Bright-Min", self.owl.window_name, self.owl.brightness_min)
-            cv2.setTrackbarPos("Bright-Max", self.owl.window_name, self.owl.brightness_max)
+        # the detection loop switches to the matching profile, compiled from the sensitivity configs at startup
+        self.control_block.update(sensitivity=SENSITIVITY_LOW if self.sensitivity_state.value else SENSITIVITY_HIGH)
 
     def set_detection_mode(self, mode):
         with self.detection_mode_state.get_lock():
             self.detection_mode_state.value = mode
         self.status_indicator.generic_notification()
 
-        if mode == 0:  # Detection on
+        # the relays are switched all on or all off by the detection loop when it applies the mode
+        if mode == DETECTION_ON:
             self.status_indicator.enable_weed_detection()
-            self.owl.disable_detection = False
-        elif mode == 2: # all solenoids on
+        elif mode == ALL_NOZZLES_ON:
             self.status_indicator.disable_weed_detection()
-            self.owl.relay_controller.relay.all_on()
-            self.owl.disable_detection = True
         else:  # off or any other unexpected value
             self.status_indicator.disable_weed_detection()
-            self.owl.relay_controller.relay.all_off()
-            self.owl.disable_detection = True
+            mode = DETECTION_OFF
+
+        self.control_block.update(detection_mode=mode)
 
     def update_detection_mode_state(self):
         if self.detection_mode_switch_up.is_pressed:
-            self.set_detection_mode(2)  # All solenoids on
+            self.set_detection_mode(ALL_NOZZLES_ON)
         elif self.detection_mode_switch_down.is_pressed:
-            self.set_detection_mode(0)  # Detection on
+            self.set_detection_mode(DETECTION_ON)
         else:
-            self.set_detection_mode(1)  # Off
+            self.set_detection_mode(DETECTION_OFF)
 
     def weed_detect_indicator(self):
         self.status_indicator.weed_detect_indicator()
@@ -221,24 +194,10 @@ class AdvancedController:
         with self.stop_flag.get_lock():
             self.stop_flag.value = True
 
-    def _read_config(self, config_file):
-        config = configparser.ConfigParser()
-        config.read(config_file)
-        return {
-            'exg_min': config.getint('GreenOnBrown', 'exg_min'),
-            'exg_max': config.getint('GreenOnBrown', 'exg_max'),
-            'hue_min': config.getint('GreenOnBrown', 'hue_min'),
-            'hue_max': config.getint('GreenOnBrown', 'hue_max'),
-            'saturation_min': config.getint('GreenOnBrown', 'saturation_min'),
-            'saturation_max': config.getint('GreenOnBrown', 'saturation_max'),
-            'brightness_min': config.getint('GreenOnBrown', 'brightness_min'),
-            'brightness_max': config.getint('GreenOnBrown', 'brightness_max')
-        }
-
 def get_rpi_version():
     try:
-        cmd = ["cat", "/proc/device-tree/model"]
-        model = subprocess.check_output(cmd).decode('utf-8').rstrip('\x00').strip()
+        with open('/proc/device-tree/model', 'r') as f:
+            model = f.read().rstrip('\x00').strip()
 
         if 'Pi 5' in model:
             return 'rpi-5'
@@ -251,7 +210,7 @@ def get_rpi_version():
 
     except FileNotFoundError:
         return 'non-rpi'
-    except subprocess.CalledProcessError:
+    except OSError:
 
         raise ValueError("Error reading Raspberry Pi version.")
 
@@ -0,0 +1,333 @@
+import json
+import re
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# console lines: '2025-05-12 07:17:24 - INFO - [__main__] - message' or, before logging is set up,
+# '2025-05-11 18:52:49,017 - INFO - message'. Records from different threads are sometimes written onto the same
+# line, so a line is split wherever a new timestamp header starts.
+RECORD_HEADER = re.compile(
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?:,\d+)? - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (?:\[([^\]]+)\] - )?')
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+FPS_MESSAGE = re.compile(r'Approximate FPS: ([\d.]+)')
+VERSION_MESSAGE = re.compile(r'Starting OWL version (\S+)')
+HARDWARE_MESSAGE = re.compile(r'Hardware: (.+)')
+RPI_MESSAGE = re.compile(r'Raspberry Pi version: (\S+)')
+CONFIG_MESSAGE = re.compile(r'(?:loaded and validated config|Applied config version \d+ from): (\S+)')
+MODEL_MESSAGE = re.compile(r'(?:Using|Loading) (?:NCNN|PyTorch) model (?:from )?(\S+)')
+
+# a run logs the import check first, then 'Initializing OWL...' once the imports succeed. Older logs have only
+# the second, so it starts a session unless the current one has not reached it yet.
+SESSION_START = 'Starting OWL - checking imports'
+SESSION_INIT = 'Initializing OWL'
+
+# the Pi has no real-time clock, so the time can jump by hours when NTP syncs after boot. Gaps between records
+# longer than this are counted as clock jumps rather than run time.
+MAX_RECORD_GAP = 600  # seconds
+
+
+@dataclass
+class LogRecord:
+    timestamp: datetime
+    level: str
+    logger: Optional[str]
+    message: str
+    source: str
+
+
+@dataclass
+class SessionSummary:
+    """Running statistics for one OWL run, from its first start message to the next start or the end of the log."""
+    source: str
+    start: datetime
+    end: datetime = None
+    run_time: float = 0.0
+    clock_jumps: int = 0
+    version: Optional[str] = None
+    hardware: Optional[str] = None
+    rpi_version: Optional[str] = None
+    config: Optional[str] = None
+    model: Optional[str] = None
+    fps_count: int = 0
+    fps_total: float = 0.0
+    fps_min: Optional[float] = None
+    fps_max: Optional[float] = None
+    warnings: int = 0
+    errors: int = 0
+    camera_errors: int = 0
+    critical: Optional[str] = None
+    error_messages: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def fps_mean(self) -> Optional[float]:
+        return self.fps_total / self.fps_count if self.fps_count else None
+
+    def add(self, record: LogRecord) -> None:
+        if self.end is not None:
+            gap = (record.timestamp - self.end).total_seconds()
+            if 0 <= gap <= MAX_RECORD_GAP:
+                self.run_time += gap
+            else:
+                self.clock_jumps += 1
+        self.end = record.timestamp
+        message = record.message
+
+        fps = FPS_MESSAGE.search(message)
+        if fps:
+            value = float(fps.group(1))
+            self.fps_count += 1
+            self.fps_total += value
+            self.fps_min = value if self.fps_min is None else min(self.fps_min, value)
+            self.fps_max = value if self.fps_max is None else max(self.fps_max, value)
+            return
+
+        for pattern, attribute in ((VERSION_MESSAGE, 'version'), (HARDWARE_MESSAGE, 'hardware'),
+                                   (RPI_MESSAGE, 'rpi_version'), (CONFIG_MESSAGE, 'config'),
+                                   (MODEL_MESSAGE, 'model')):
+            match = pattern.search(message)
+            if match:
+                setattr(self, attribute, match.group(1).strip())
+                return
+
+        is_error = record.level in ('ERROR', 'CRITICAL') or 'CRITICAL ERROR' in message
+        if record.level == 'WARNING':
+            self.warnings += 1
+
+        if is_error:
+            self.errors += 1
+            if 'camera' in message.lower():
+                self.camera_errors += 1
+
+            # count distinct errors by their first line, long messages are trimmed to keep the report readable
+            key = message.strip().split('\n')[0][:120]
+            self.error_messages[key] = self.error_messages.get(key, 0) + 1
+
+            if 'CRITICAL ERROR' in message or record.level == 'CRITICAL':
+                self.critical = key
+
+    def to_dict(self) -> Dict:
+        return {
+            'source': self.source,
+            'start': self.start.isoformat(sep=' '),
+            'end': self.end.isoformat(sep=' ') if self.end else None,
+            'run_time_s': self.run_time,
+            'clock_jumps': self.clock_jumps,
+            'version': self.version,
+            'hardware': self.hardware,
+            'rpi_version': self.rpi_version,
+            'config': self.config,
+            'model': self.model,
+            'fps_samples': self.fps_count,
+            'fps_mean': self.fps_mean,
+            'fps_min': self.fps_min,
+            'fps_max': self.fps_max,
+            'warnings': self.warnings,
+            'errors': self.errors,
+            'camera_errors': self.camera_errors,
+            'critical': self.critical,
+            'error_messages': self.error_messages
+        }
+
+
+def iter_text_log(path: Union[str, Path]) -> Iterator[LogRecord]:
+    """
+    Stream records from a console capture (owl_*.log). Lines without a header (tracebacks, libcamera output) are
+    appended to the previous record's message.
+    """
+    path = Path(path)
+    pending = None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = ANSI_ESCAPE.sub('', line.rstrip('\n'))
+            headers = list(RECORD_HEADER.finditer(line))
+
+            if not headers:
+                if pending is not None and line.strip():
+                    pending.message += '\n' + line
+                continue
+
+            if pending is not None and headers[0].start() > 0:
+                pending.message += '\n' + line[:headers[0].start()]
+
+            for header, following in zip(headers, headers[1:] + [None]):
+                if pending is not None:
+                    yield pending
+
+                end = following.start() if following else len(line)
+                timestamp, level, logger = header.groups()
+                pending = LogRecord(timestamp=datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S'), level=level,
+                                    logger=logger, message=line[header.end():end], source=path.name)
+
+    if pending is not None:
+        yield pending
+
+
+def iter_jsonl_log(path: Union[str, Path]) -> Iterator[LogRecord]:
+    """Stream records from owl.jsonl, skipping lines damaged by a power cut rather than failing."""
+    path = Path(path)
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            # a truncated write leaves NUL padding in front of the next record
+            line = line.strip().strip('\x00')
+            if not line:
+                continue
+
+            try:
+                entry = json.loads(line)
+                timestamp = datetime.strptime(entry['timestamp'].split(',')[0], '%Y-%m-%d %H:%M:%S')
+            except (ValueError, KeyError, AttributeError):
+                continue
+
+            yield LogRecord(timestamp=timestamp, level=entry.get('level', 'INFO'), logger=entry.get('logger'),
+                            message=ANSI_ESCAPE.sub('', entry.get('message', '')), source=path.name)
+
+
+def find_log_files(paths: Iterable[Union[str, Path]], text: bool = False) -> List[Path]:
+    """
+    Expand directories into their log files, oldest first. Console captures and owl.jsonl contain the same records,
+    so only one kind is read from a directory: owl.jsonl and its rotated backups by default, owl_*.log with text=True.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_file():
+            files.append(path)
+        elif text:
+            files.extend(sorted(path.glob('owl_*.log')))
+        else:
+            # RotatingFileHandler backups: owl.jsonl.1 is the newest, so read the highest number first
+            backups = sorted(path.glob('owl.jsonl.*'), key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0)
+            files.extend(reversed(backups))
+            if (path / 'owl.jsonl').exists():
+                files.append(path / 'owl.jsonl')
+
+    return files
+
+
+def iter_records(files: Iterable[Path]) -> Iterator[LogRecord]:
+    for path in files:
+        reader = iter_jsonl_log if path.name.startswith('owl.jsonl') or path.suffix == '.jsonl' else iter_text_log
+        yield from reader(path)
+
+
+def iter_sessions(records: Iterable[LogRecord]) -> Iterator[SessionSummary]:
+    """Group a record stream into sessions; only the current session is held in memory."""
+    session = None
+    initialised = False
+    for record in records:
+        new_source = session is not None and record.source != session.source
+        initialising = record.message.startswith(SESSION_INIT)
+        if (session is None or new_source or record.message.startswith(SESSION_START)
+                or (initialising and initialised)):
+            if session is not None:
+                yield session
+            session = SessionSummary(source=record.source, start=record.timestamp)
+            initialised = False
+
+        initialised = initialised or initialising
+
+        session.add(record)
+
+    if session is not None:
+        yield session
+
+
+def check_session(session: SessionSummary, min_fps: float, max_camera_errors: int) -> List[str]:
+    """Return the regression flags raised by one session."""
+    flags = []
+    if session.fps_mean is not None and session.fps_mean < min_fps:
+        flags.append(f"low FPS ({session.fps_mean:.1f} < {min_fps})")
+    if session.camera_errors >= max_camera_errors:
+        flags.append(f"{session.camera_errors} camera errors")
+    if session.critical:
+        flags.append(f"stopped: {session.critical}")
+    if session.fps_count == 0 and session.run_time < 60:
+        flags.append('no detection loop')
+
+    return flags
+
+
+class DailyReport:
+    """Per-day totals built from session summaries as they are streamed."""
+
+    def __init__(self):
+        self.days = {}
+
+    def add(self, session: SessionSummary, flags: List[str]) -> None:
+        day = self.days.setdefault(session.start.date().isoformat(), {
+            'sessions': 0, 'restarts': 0, 'flagged': 0, 'run_time_s': 0.0,
+            'fps_samples': 0, 'fps_total': 0.0, 'errors': 0, 'camera_errors': 0})
+
+        day['restarts'] += 1 if day['sessions'] else 0
+        day['sessions'] += 1
+        day['flagged'] += 1 if flags else 0
+        day['run_time_s'] += session.run_time
+        day['fps_samples'] += session.fps_count
+        day['fps_total'] += session.fps_total
+        day['errors'] += session.errors
+        day['camera_errors'] += session.camera_errors
+
+    def to_dict(self) -> Dict:
+        report = {}
+        for day, totals in sorted(self.days.items()):
+            totals = dict(totals)
+            fps_total = totals.pop('fps_total')
+            totals['fps_mean'] = fps_total / totals['fps_samples'] if totals['fps_samples'] else None
+            report[day] = totals
+
+        return report
+
+
+def analyse(files: Iterable[Path], min_fps: float = 5.0, max_camera_errors: int = 2, verbose: bool = True,
+            as_json: bool = False) -> Dict:
+    """Stream the files once and print a per-session and per-day report."""
+    daily = DailyReport()
+    flagged = []
+
+    for session in iter_sessions(iter_records(files)):
+        flags = check_session(session, min_fps, max_camera_errors)
+        daily.add(session, flags)
+        if flags:
+            flagged.append({**session.to_dict(), 'flags': flags})
+
+        if verbose and not as_json:
+            fps = f"{session.fps_mean:6.2f}" if session.fps_mean is not None else '     -'
+            print(f"{session.start:%Y-%m-%d %H:%M:%S}  {session.run_time / 60:7.1f} min  FPS {fps}  "
+                  f"errors {session.errors:3d}  {session.model or '-':<28}  {'; '.join(flags)}")
+
+    report = {'days': daily.to_dict(), 'flagged_sessions': flagged}
+
+    if as_json:
+        print(json.dumps(report, indent=2, default=str))
+        return report
+
+    print('\nDay         sessions  restarts  run time  mean FPS  errors  camera  flagged')
+    for day, totals in report['days'].items():
+        fps = f"{totals['fps_mean']:8.2f}" if totals['fps_mean'] is not None else '       -'
+        print(f"{day}  {totals['sessions']:8d}  {totals['restarts']:8d}  {totals['run_time_s'] / 3600:6.2f} h  "
+              f"{fps}  {totals['errors']:6d}  {totals['camera_errors']:6d}  {totals['flagged']:7d}")
+
+    print(f"\n{len(flagged)} flagged sessions")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.log_analyzer logs
+    ap = argparse.ArgumentParser(description='Summarise OWL field sessions from the log files.')
+    ap.add_argument('paths', nargs='*', default=['logs'], help='log files or directories (default: logs)')
+    ap.add_argument('--text', action='store_true', help='read owl_*.log console captures instead of owl.jsonl')
+    ap.add_argument('--min-fps', type=float, default=5.0, help='flag sessions with a lower mean FPS')
+    ap.add_argument('--max-camera-errors', type=int, default=2, help='flag sessions with this many camera errors')
+    ap.add_argument('--quiet', action='store_true', help='only print the daily report')
+    ap.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = ap.parse_args()
+
+    analyse(find_log_files(args.paths, text=args.text), min_fps=args.min_fps,
+            max_camera_errors=args.max_camera_errors, verbose=not args.quiet, as_json=args.json)
@@ -1,14 +1,17 @@
+import atexit
 import logging
 import json
+import multiprocessing
+import os
 import queue
 import sys
 
 from pathlib import Path
 from queue import Queue
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 from typing import Dict, Any
-from time import time
-from logging.handlers import RotatingFileHandler
+from time import time, monotonic
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 
 class JSONFormatter(logging.Formatter):
@@ -38,6 +41,73 @@ class ConsoleFormatter(logging.Formatter):
         return f"{self.formatTime(record, self.datefmt)} - {record.levelname} - [{record.name}] - {record.getMessage()}"
 
 
+class RateLimitFilter(logging.Filter):
+    """
+    Collapses bursts of repeated messages, e.g. a 'Queue is full' warning raised every frame. Records are grouped by
+    their call site; after `burst` records from one site within `interval` seconds the rest are dropped, and the next
+    record let through from that site reports how many were suppressed.
+    """
+
+    def __init__(self, interval: float = 10.0, burst: int = 5):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._sites = {}
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.pathname, record.lineno)
+        now = monotonic()
+
+        with self._lock:
+            window_start, count, suppressed = self._sites.get(key, (now, 0, 0))
+            if now - window_start >= self.interval:
+                window_start, count = now, 0
+
+            if count >= self.burst:
+                self._sites[key] = (window_start, count, suppressed + 1)
+                return False
+
+            self._sites[key] = (window_start, count + 1, 0)
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+            record.args = None
+
+        return True
+
+
+class OWLQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without ever blocking the caller. The message is merged once here and then
+    shared by every handler on the listener; if the queue is full the record is dropped and counted instead. The
+    queue is a multiprocessing queue, so records from forked processes (the controller, image sampling) reach the
+    listener in the main process too, and the record is made picklable here.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped_records = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+
+        # tracebacks cannot be pickled, keep the formatted text which the formatters use instead
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+
+
 class LogManager:
     """Centralized logging management for OWL"""
     _instance = None
@@ -45,6 +115,9 @@ class LogManager:
 
     BACKUP_COUNT = 100
     MAX_BYTES = 10 * 1024 * 1024  # 10MB per file
+    QUEUE_SIZE = 10000
+    RATE_LIMIT_INTERVAL = 10.0  # seconds
+    RATE_LIMIT_BURST = 5
 
     def __new__(cls):
         if cls._instance is None:
@@ -61,6 +134,9 @@ class LogManager:
         self.batch_size = 100
         self.flush_interval = 1.0  # seconds
         self.last_flush = time()
+        self.listener = None
+        self.listener_pid = None
+        self.queue_handler = None
 
         # Define instance-wide loggers
         self.logger = logging.getLogger("LogManager")
@@ -72,20 +148,21 @@ class LogManager:
 
     @classmethod
     def setup(cls, log_dir: Path, log_level: str = 'INFO') -> None:
-        """Initialize the logging system"""
+        """
+        Initialize the logging system. Loggers only put records on a queue; formatting and all console and file I/O
+        happen on a single listener thread so logging from the detection loop never waits on a write. Child processes
+        forked after setup log through the same queue.
+        """
         instance = cls()
 
         log_dir.mkdir(exist_ok=True)
 
-        root_logger = logging.getLogger()
-        root_logger.setLevel(log_level)
-        root_logger.handlers = []
+        instance._stop_listener()
 
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(ConsoleFormatter(
             fmt='%(asctime)s - %(levelname)s - [%(name)s] - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'))
-        root_logger.addHandler(console_handler)
 
         main_handler = RotatingFileHandler(
             filename=log_dir / 'owl.jsonl',
@@ -93,7 +170,6 @@ class LogManager:
             backupCount=cls.BACKUP_COUNT)
 
         main_handler.setFormatter(JSONFormatter())
-        root_logger.addHandler(main_handler)
 
         detection_handler = RotatingFileHandler(
             filename=log_dir / 'detections.jsonl',
@@ -102,14 +178,34 @@ class LogManager:
 
         detection_handler.setFormatter(JSONFormatter())
 
-        # Configure detection logger
+        # one listener serves both the root and the detection logger, so route the records by logger name
+        console_handler.addFilter(lambda record: record.name != 'detection')
+        main_handler.addFilter(lambda record: record.name != 'detection')
+        detection_handler.addFilter(logging.Filter('detection'))
+
+        log_queue = multiprocessing.Queue(maxsize=cls.QUEUE_SIZE)
+        queue_handler = OWLQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter(interval=cls.RATE_LIMIT_INTERVAL, burst=cls.RATE_LIMIT_BURST))
+
+        root_logger = logging.getLogger()
+        root_logger.setLevel(log_level)
+        root_logger.handlers = [queue_handler]
+
+        # Configure detection logger, batches are already rate limited by the detection worker
         detection_logger = logging.getLogger('detection')
-        detection_logger.handlers = [detection_handler]
+        detection_logger.handlers = [OWLQueueHandler(log_queue)]
         detection_logger.propagate = False  # Don't propagate to root logger
 
+        instance.listener = QueueListener(log_queue, console_handler, main_handler, detection_handler,
+                                          respect_handler_level=True)
+        instance.listener.start()
+        instance.listener_pid = os.getpid()
+        atexit.register(instance._stop_listener)
+
         # Update the instance-level loggers
         instance.logger = root_logger
         instance.detection_logger = detection_logger
+        instance.queue_handler = queue_handler
 
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
@@ -157,6 +253,19 @@ class LogManager:
             )
 
     def stop(self) -> None:
-        """Stop the background worker"""
+        """Stop the background worker and write out any queued log records"""
         self.stop_event.set()
         self.worker.join()
+        self._stop_listener()
+
+    def _stop_listener(self) -> None:
+        """Flush the log queue to the handlers and stop the listener thread, safe to call more than once"""
+        # forked children share the queue but not the listener, only the process that started it may stop it
+        if self.listener is None or self.listener_pid != os.getpid():
+            return
+
+        if self.queue_handler is not None and self.queue_handler.dropped_records:
+            self.logger.warning(f"[WARNING] Log queue was full, {self.queue_handler.dropped_records} records dropped.")
+
+        self.listener.stop()
+        self.listener = None
@@ -0,0 +1,229 @@
+import json
+import shutil
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Lock
+from typing import Any, Callable, Dict, Optional
+from utils.log_manager import LogManager
+
+CPU_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+
+def get_cpu_temperature() -> Optional[float]:
+    """Read the SoC temperature in degrees C, None if unavailable (e.g. not on a Raspberry Pi)."""
+    try:
+        with open(CPU_TEMP_PATH, 'r') as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+def get_storage(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        total, used, free = shutil.disk_usage(path)
+    except OSError:
+        return None
+
+    return {'path': path, 'total_gb': total / 1e9, 'free_gb': free / 1e9, 'percent_used': 100 * used / total}
+
+
+class OwlMetrics:
+    """
+    Live performance counters updated once per frame from Owl.hoot. Stage latencies and FPS are exponential moving
+    averages so an update is a handful of float operations and never allocates on the hot path.
+    """
+
+    def __init__(self, smoothing: float = 0.1):
+        self.smoothing = smoothing
+        self.lock = Lock()
+
+        self.start_time = time.time()
+        self.frame_count = 0
+        self.fps = 0.0
+        self.stage_latency = {}
+        self.last_frame_time = None
+
+    def update(self, **stage_times: float) -> None:
+        """Record the time in seconds spent in each stage of one frame, e.g. update(capture=0.01, detection=0.05)."""
+        now = time.perf_counter()
+        alpha = self.smoothing
+
+        with self.lock:
+            self.frame_count += 1
+            if self.last_frame_time is not None:
+                interval = now - self.last_frame_time
+                if interval > 0:
+                    self.fps = 1.0 / interval if self.fps == 0 else (1 - alpha) * self.fps + alpha / interval
+            self.last_frame_time = now
+
+            for stage, seconds in stage_times.items():
+                previous = self.stage_latency.get(stage)
+                self.stage_latency[stage] = seconds if previous is None else (1 - alpha) * previous + alpha * seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'uptime_s': time.time() - self.start_time,
+                'frames': self.frame_count,
+                'fps': self.fps,
+                'stage_latency_ms': {stage: 1000 * seconds for stage, seconds in self.stage_latency.items()}
+            }
+
+
+class MetricsServer:
+    """
+    Lightweight HTTP/JSON endpoint running on its own thread inside the OWL process.
+
+    GET  /metrics   live FPS, stage latency, relay duty cycles, queue depths, dropped frames, temperature, storage
+    GET  /settings  current runtime settings
+    POST /settings  JSON object of settings to change, applied by the main loop between frames
+
+    Requests never touch the detection loop directly: metrics come from the snapshot callable and setting changes are
+    validated here and then picked up by the main loop with poll_settings().
+    """
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Any]],
+                 settings: Callable[[], Dict[str, Any]],
+                 validate_settings: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 host: str = '0.0.0.0',
+                 port: int = 8001):
+        self.logger = LogManager.get_logger(__name__)
+        self.snapshot = snapshot
+        self.settings = settings
+        self.validate_settings = validate_settings
+
+        self.routes = {
+            ('GET', '/metrics'): self._get_metrics,
+            ('GET', '/settings'): self._get_settings,
+            ('POST', '/settings'): self._post_settings
+        }
+
+        self._pending_settings = {}
+        self._settings_lock = Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self.thread = Thread(target=self.httpd.serve_forever, name='MetricsServer', daemon=True)
+
+    def start(self) -> 'MetricsServer':
+        self.thread.start()
+        self.logger.info(f"[INFO] Metrics server listening on http://{self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        # shutdown() waits for serve_forever to exit and never returns if the server was not started
+        if self.thread.is_alive():
+            self.httpd.shutdown()
+            self.thread.join(timeout=1)
+        self.httpd.server_close()
+
+    def add_route(self, method: str, path: str, handler: Callable) -> None:
+        """Register another endpoint. The handler receives the request handler and writes its own response."""
+        self.routes[(method, path)] = handler
+
+    def poll_settings(self) -> Optional[Dict[str, Any]]:
+        """Return settings received since the last call, or None. Called from the main loop every frame."""
+        if not self._pending_settings:
+            return None
+
+        with self._settings_lock:
+            pending, self._pending_settings = self._pending_settings, {}
+
+        return pending
+
+    def _get_metrics(self, request):
+        request.send_json(self.snapshot())
+
+    def _get_settings(self, request):
+        request.send_json(self.settings())
+
+    def _post_settings(self, request):
+        try:
+            length = int(request.headers.get('Content-Length', 0))
+            changes = json.loads(request.rfile.read(length) or b'{}')
+            if not isinstance(changes, dict):
+                raise ValueError('Expected a JSON object of setting names and values')
+
+            accepted = self.validate_settings(changes)
+
+        except ValueError as e:
+            request.send_json({'error': str(e)}, status=400)
+            return
+
+        with self._settings_lock:
+            self._pending_settings.update(accepted)
+
+        request.send_json({'accepted': accepted}, status=202)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def send_json(self, payload, status=200):
+                body = json.dumps(payload, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                # read-only endpoints may be polled from a dashboard on another origin, the control endpoints may not
+                if self.command == 'GET':
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _dispatch(self, method):
+                route = server.routes.get((method, self.path.split('?')[0]))
+                if route is None:
+                    self.send_json({'error': f'Unknown endpoint {method} {self.path}'}, status=404)
+                    return
+
+                try:
+                    route(self)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                except Exception as e:
+                    server.logger.error(f"Error handling {method} {self.path}: {e}", exc_info=True)
+                    self.send_json({'error': str(e)}, status=500)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def log_message(self, format, *args):
+                # keep per-request access logs out of the OWL logs
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    # local client check: start on a free port and exercise each endpoint
+    from urllib.request import Request, urlopen
+
+    metrics = OwlMetrics()
+    settings = {'exg_min': 25}
+
+    def validate(changes):
+        unknown = set(changes) - set(settings)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        return {key: int(value) for key, value in changes.items()}
+
+    metrics_server = MetricsServer(snapshot=metrics.snapshot, settings=lambda: settings,
+                                   validate_settings=validate, host='127.0.0.1', port=0).start()
+    base_url = f'http://127.0.0.1:{metrics_server.port}'
+
+    for _ in range(10):
+        metrics.update(capture=0.005, detection=0.02)
+        time.sleep(0.01)
+
+    print(json.loads(urlopen(f'{base_url}/metrics').read()))
+
+    request = Request(f'{base_url}/settings', data=json.dumps({'exg_min': 30}).encode(), method='POST')
+    print(json.loads(urlopen(request).read()))
+    print('Pending settings:', metrics_server.poll_settings())
+
+    metrics_server.stop()
@@ -0,0 +1,203 @@
+import json
+import os
+import statistics
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from utils.log_manager import LogManager
+
+MANIFEST_NAME = 'manifest.json'
+BENCHMARK_CACHE_NAME = 'benchmarks.json'
+
+logger = LogManager.get_logger(__name__)
+
+
+class ModelVariant:
+    """
+    One entry in models/manifest.json, e.g.
+
+        {"name": "yolo11n-320-int8", "path": "yolo11n_320_int8_ncnn_model", "input_size": 320,
+         "precision": "int8", "format": "ncnn", "accuracy": 0.58, "latency_ms": {"rpi-5": 41, "rpi-4": 118}}
+
+    accuracy is any larger-is-better score measured on the same validation set for every variant (e.g. mAP50) and
+    latency_ms holds measured inference times per Raspberry Pi model, used when this unit has not benchmarked it yet.
+    """
+
+    def __init__(self, entry: Dict[str, Any], model_directory: Path):
+        try:
+            self.name = entry['name']
+            self.path = model_directory / entry['path']
+        except KeyError as e:
+            raise ValueError(f"Model manifest entry is missing {e}") from None
+
+        self.input_size = entry.get('input_size')
+        self.precision = entry.get('precision', 'fp32')
+        self.format = entry.get('format', 'ncnn')
+        self.accuracy = float(entry.get('accuracy') or 0.0)
+        self.latency_ms = entry.get('latency_ms', {})
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def signature(self) -> List[float]:
+        """Size and modification time of the model files, so a replaced model is benchmarked again."""
+        files = sorted(self.path.glob('*')) if self.path.is_dir() else [self.path]
+        return [value for file in files if file.is_file() for value in (file.stat().st_size, file.stat().st_mtime)]
+
+    def __repr__(self):
+        return f"ModelVariant({self.name}, {self.input_size}px {self.precision.upper()} {self.format})"
+
+
+def find_manifest(model_path: Union[str, Path]) -> Optional[Path]:
+    """The manifest sits in the models directory, either model_path itself or the directory holding it."""
+    model_path = Path(model_path)
+    for directory in (model_path, model_path.parent):
+        if (directory / MANIFEST_NAME).is_file():
+            return directory / MANIFEST_NAME
+
+    return None
+
+
+def load_manifest(manifest_path: Path) -> List[ModelVariant]:
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    return [ModelVariant(entry, manifest_path.parent) for entry in manifest.get('variants', [])]
+
+
+class BenchmarkCache:
+    """Measured latencies per Pi model, saved next to the manifest so variants are only benchmarked on first boot."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            with open(path, 'r') as f:
+                self.results = json.load(f)
+        except (OSError, ValueError):
+            self.results = {}
+
+    def get(self, rpi_version: str, variant: ModelVariant) -> Optional[float]:
+        result = self.results.get(rpi_version, {}).get(variant.name)
+        if result and result.get('signature') == variant.signature():
+            return result['latency_ms']
+
+        return None
+
+    def put(self, rpi_version: str, variant: ModelVariant, latency_ms: float) -> None:
+        self.results.setdefault(rpi_version, {})[variant.name] = {
+            'latency_ms': latency_ms,
+            'signature': variant.signature()
+        }
+
+    def save(self) -> None:
+        temp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(self.results, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"[WARNING] Could not save model benchmarks to {self.path}: {e}")
+
+
+def benchmark_variant(variant: ModelVariant, runs: int = 10) -> float:
+    """Median inference latency in ms on a blank frame of the variant's input size, after two warm-up runs."""
+    from utils.greenongreen import GreenOnGreen
+
+    detector = GreenOnGreen(model_path=str(variant.path), input_size=variant.input_size)
+    size = variant.input_size or 640
+    latencies = detector.warmup((size, size, 3), runs=runs + 2)[2:]
+
+    return 1000 * statistics.median(latencies)
+
+
+def select_variant(variants: List[ModelVariant], rpi_version: str, target_fps: float,
+                   cache: Optional[BenchmarkCache] = None,
+                   benchmark: Optional[Callable[[ModelVariant], float]] = benchmark_variant) -> ModelVariant:
+    """
+    Pick the most accurate variant whose inference latency on this Pi fits in one frame at target_fps. Latency comes
+    from this unit's cached benchmark, then a new benchmark, then the manifest figure for this Pi model. If nothing
+    is fast enough the fastest variant is used.
+    """
+    available = [variant for variant in variants if variant.exists()]
+    if not available:
+        raise FileNotFoundError('None of the models listed in the manifest were found')
+
+    budget_ms = 1000.0 / target_fps
+    latencies = {}
+    measured = False
+
+    for variant in available:
+        latency = cache.get(rpi_version, variant) if cache else None
+
+        if latency is None and benchmark is not None:
+            try:
+                latency = benchmark(variant)
+                measured = True
+                logger.info(f"[INFO] Benchmarked {variant.name} on {rpi_version}: {latency:.1f} ms")
+                if cache:
+                    cache.put(rpi_version, variant, latency)
+
+            except Exception as e:
+                logger.warning(f"[WARNING] Could not benchmark {variant.name}: {e}")
+
+        if latency is None:
+            latency = variant.latency_ms.get(rpi_version)
+
+        if latency is not None:
+            latencies[variant.name] = latency
+
+    if cache and measured:
+        cache.save()
+
+    timed = [variant for variant in available if variant.name in latencies]
+    if not timed:
+        logger.warning(f"[WARNING] No latency known for any model on {rpi_version}, using the most accurate model.")
+        return max(available, key=lambda variant: variant.accuracy)
+
+    fits = [variant for variant in timed if latencies[variant.name] <= budget_ms]
+    if fits:
+        selected = max(fits, key=lambda variant: (variant.accuracy, -latencies[variant.name]))
+    else:
+        selected = min(timed, key=lambda variant: latencies[variant.name])
+        logger.warning(f"[WARNING] No model reaches {target_fps} FPS on {rpi_version}, using the fastest.")
+
+    logger.info(f"[INFO] Selected model {selected.name} ({selected.input_size}px {selected.precision.upper()}, "
+                f"{latencies[selected.name]:.1f} ms, budget {budget_ms:.1f} ms at {target_fps} FPS)")
+
+    return selected
+
+
+def resolve_model(model_path: Union[str, Path], rpi_version: str, target_fps: float,
+                  benchmark: bool = True) -> Tuple[str, Optional[int]]:
+    """
+    Return the model path and input size to load. Without a manifest next to model_path the configured model is used
+    unchanged.
+    """
+    manifest_path = find_manifest(model_path)
+    if manifest_path is None:
+        logger.warning(f"[WARNING] No {MANIFEST_NAME} found for {model_path}, using the configured model.")
+        return str(model_path), None
+
+    variants = load_manifest(manifest_path)
+    cache = BenchmarkCache(manifest_path.parent / BENCHMARK_CACHE_NAME)
+    selected = select_variant(variants, rpi_version, target_fps, cache=cache,
+                              benchmark=benchmark_variant if benchmark else None)
+
+    return str(selected.path), selected.input_size
+
+
+if __name__ == "__main__":
+    import argparse
+    from utils.input_manager import get_rpi_version
+
+    # run from the owl directory: python -m utils.model_selector models --target-fps 10
+    ap = argparse.ArgumentParser(description='Benchmark the models in a manifest and show which would be selected.')
+    ap.add_argument('model_path', type=str, help='models directory containing manifest.json')
+    ap.add_argument('--target-fps', type=float, default=10.0)
+    ap.add_argument('--no-benchmark', action='store_true', help='only use cached and manifest latencies')
+    args = ap.parse_args()
+
+    path, input_size = resolve_model(args.model_path, get_rpi_version(), args.target_fps,
+                                     benchmark=not args.no_benchmark)
+    print(f"Selected {path} (input size {input_size})")
@@ -1,11 +1,13 @@
-from threading import Thread, Event, Condition, Lock
+from threading import Thread, Event, Condition, Lock, current_thread
 from utils.vis_manager import RelayVis
+from utils.clock import SystemClock
 from utils.error_manager import OWLAlreadyRunningError
 from utils.log_manager import LogManager
 from enum import Enum
 from collections import deque
 from typing import Optional
 
+import os
 import subprocess
 import shutil
 import time
@@ -77,8 +79,9 @@ class TestLED:
 
 
 class BaseStatusIndicator:
-    def __init__(self, save_directory, no_save=False):
+    def __init__(self, save_directory, no_save=False, clock=None):
         self.logger = LogManager.get_logger(__name__)
+        self.clock = clock or SystemClock()
 
         self.save_directory = save_directory
         self.no_save = no_save
@@ -122,18 +125,19 @@ class BaseStatusIndicator:
         if self.flashing_thread is None or not self.flashing_thread.is_alive():
             self.flashing_thread = Thread(target=self._flash_error_code)
             self.flashing_thread.start()
+            self.clock.track(self.flashing_thread)
 
     def _flash_error_code(self):
         while self.running:
             for _ in range(self.error_code):
                 self._blink_leds()
-                time.sleep(0.2)  # Interval between flashes
-            time.sleep(2)  # Pause after each sequence
+                self.clock.sleep(0.2)  # Interval between flashes
+            self.clock.sleep(2)  # Pause after each sequence
 
     def _blink_leds(self):
         self._set_led_state("ACT", 1)
         self._set_led_state("PWR", 1)
-        time.sleep(0.2)
+        self.clock.sleep(0.2)
         self._set_led_state("ACT", 0)
         self._set_led_state("PWR", 0)
 
@@ -195,8 +199,8 @@ class BaseStatusIndicator:
 
 
 class HeadlessStatusIndicator(BaseStatusIndicator):
-    def __init__(self, save_directory=None, no_save=False):
-        super().__init__(save_directory, no_save)
+    def __init__(self, save_directory=None, no_save=False, clock=None):
+        super().__init__(save_directory, no_save, clock=clock)
 
     def _update_storage_indicator(self, percent_full):
         if percent_full >= 0.90:
@@ -204,8 +208,8 @@ class HeadlessStatusIndicator(BaseStatusIndicator):
 
 
 class UteStatusIndicator(BaseStatusIndicator):
-    def __init__(self, save_directory, record_led_pin='BOARD38', storage_led_pin='BOARD40'):
-        super().__init__(save_directory)
+    def __init__(self, save_directory, record_led_pin='BOARD38', storage_led_pin='BOARD40', clock=None):
+        super().__init__(save_directory, clock=clock)
         LED_class = LED if not testing else TestLED
         self.record_LED = LED_class(pin=record_led_pin)
         self.storage_LED = LED_class(pin=storage_led_pin)
@@ -242,6 +246,7 @@ class UteStatusIndicator(BaseStatusIndicator):
         if self.flashing_thread is None or not self.flashing_thread.is_alive():
             self.flashing_thread = Thread(target=self._flash_error_code)
             self.flashing_thread.start()
+            self.clock.track(self.flashing_thread)
 
     def _flash_error_code(self):
         while self.running:
@@ -249,8 +254,8 @@ class UteStatusIndicator(BaseStatusIndicator):
                 self._blink_leds()
                 self.storage_LED.blink(on_time=0.2, n=1, background=False)  # Flash storage LED
                 self.record_LED.blink(on_time=0.2, n=1, background=False)  # Flash record LED
-                time.sleep(0.2)  # Interval between flashes
-            time.sleep(2)  # Pause after each sequence
+                self.clock.sleep(0.2)  # Interval between flashes
+            self.clock.sleep(2)  # Pause after each sequence
 
     def stop(self):
         super().stop()
@@ -270,8 +275,8 @@ class AdvancedIndicatorState(Enum):
 
 
 class AdvancedStatusIndicator(BaseStatusIndicator):
-    def __init__(self, save_directory, status_led_pin='BOARD37'):
-        super().__init__(save_directory)
+    def __init__(self, save_directory, status_led_pin='BOARD37', clock=None):
+        super().__init__(save_directory, clock=clock)
         LED_class = LED if not testing else TestLED
         self.led = LED_class(pin=status_led_pin)
         self.state = AdvancedIndicatorState.IDLE
@@ -368,14 +373,15 @@ class AdvancedStatusIndicator(BaseStatusIndicator):
         if self.flashing_thread is None or not self.flashing_thread.is_alive():
             self.flashing_thread = Thread(target=self._flash_error_code)
             self.flashing_thread.start()
+            self.clock.track(self.flashing_thread)
 
     def _flash_error_code(self):
         try:
             while self.running:
                 for _ in range(self.error_code):
                     self._blink_leds()
-                    time.sleep(0.2)
-                time.sleep(2)
+                    self.clock.sleep(0.2)
+                self.clock.sleep(2)
         except KeyboardInterrupt:
             logger.info("[INFO] KeyboardInterrupt received in _flash_error_code. Exiting.")
         except Exception as e:
@@ -390,13 +396,116 @@ class AdvancedStatusIndicator(BaseStatusIndicator):
         self.led.off()
 
 
+# physical header pin to BCM GPIO number, lgpio addresses pins by GPIO number
+BOARD_TO_BCM = {
+    3: 2, 5: 3, 7: 4, 8: 14, 10: 15, 11: 17, 12: 18, 13: 27, 15: 22, 16: 23, 18: 24, 19: 10, 21: 9, 22: 25,
+    23: 11, 24: 8, 26: 7, 27: 0, 28: 1, 29: 5, 31: 6, 32: 12, 33: 13, 35: 19, 36: 16, 37: 26, 38: 20, 40: 21
+}
+
+
+class LgpioRelayBackend:
+    """
+    Claims all relay pins as one lgpio output group, so any combination of relays is switched by a single
+    group_write call and lanes switched together change within the same register write.
+    """
+
+    def __init__(self, relay_dict):
+        import lgpio
+
+        self.lgpio = lgpio
+        self.relays = sorted(relay_dict)
+        self.gpios = [BOARD_TO_BCM[int(relay_dict[relay])] for relay in self.relays]
+        self.bits = {relay: 1 << i for i, relay in enumerate(self.relays)}
+        self.levels = 0
+        self.lock = Lock()
+
+        # the header is gpiochip4 on a Raspberry Pi 5 with older kernels, gpiochip0 otherwise
+        chip = 4 if os.path.exists('/dev/gpiochip4') and 'Raspberry Pi 5' in _board_model() else 0
+        self.handle = lgpio.gpiochip_open(chip)
+        lgpio.group_claim_output(self.handle, self.gpios, [0] * len(self.gpios))
+
+    def write(self, states):
+        """Set several relays at once from a {relay: on} dict."""
+        with self.lock:
+            mask = 0
+            for relay, on in states.items():
+                bit = self.bits[relay]
+                mask |= bit
+                self.levels = self.levels | bit if on else self.levels & ~bit
+
+            if mask:
+                self.lgpio.group_write(self.handle, self.gpios[0], self.levels, mask)
+
+    def close(self):
+        self.write({relay: False for relay in self.relays})
+        self.lgpio.group_free(self.handle, self.gpios[0])
+        self.lgpio.gpiochip_close(self.handle)
+
+
+class FakeRelayBackend:
+    """Records the time of every relay edge instead of switching pins, to measure the skew between lanes."""
+
+    def __init__(self, relay_dict, max_edges=100000, clock=None):
+        self.clock = clock or SystemClock()
+        self.states = {relay: False for relay in relay_dict}
+        self.edges = deque(maxlen=max_edges)
+        self.writes = 0
+        self.lock = Lock()
+
+    def write(self, states):
+        with self.lock:
+            now = self.clock.time()
+            self.writes += 1
+            for relay, on in states.items():
+                if self.states[relay] != on:
+                    self.states[relay] = on
+                    self.edges.append((now, relay, on))
+
+    def skew(self, relays, on=True):
+        """Spread in seconds between the first edges of the given relays in the given direction."""
+        times = {}
+        for edge_time, relay, state in self.edges:
+            if state == on and relay in relays:
+                times.setdefault(relay, edge_time)
+
+        return max(times.values()) - min(times.values()) if len(times) == len(relays) else None
+
+    def close(self):
+        self.write({relay: False for relay in self.states})
+
+
+def _board_model():
+    try:
+        with open('/proc/device-tree/model', 'r') as f:
+            return f.read()
+    except OSError:
+        return ''
+
+
+def relay_backend(name, relay_dict, clock=None):
+    """The grouped relay backend for [System] relay_backend, a FakeRelayBackend when GPIO is unavailable."""
+    if name == 'lgpio' and testing:
+        logger.warning("[WARNING] relay_backend = lgpio but GPIO is unavailable on this platform, "
+                       "using the fake relay backend instead.")
+        return FakeRelayBackend(relay_dict, clock=clock)
+
+    if name == 'fake':
+        return FakeRelayBackend(relay_dict, clock=clock)
+
+    if name == 'lgpio':
+        return LgpioRelayBackend(relay_dict)
+
+    return None
+
+
 # control class for the relay board
 class RelayControl:
-    def __init__(self, relay_dict):
+    def __init__(self, relay_dict, backend=None):
         self.logger = LogManager.get_logger(__name__)
 
         self.testing = True if testing else False
         self.relay_dict = relay_dict
+        self.backend = backend
         self.on = False
 
         # used to toggle activation of GPIO pins for LEDs
@@ -412,38 +521,55 @@ class RelayControl:
                 else:
                     raise
 
-            for relay, board_pin in self.relay_dict.items():
-                self.relay_dict[relay] = OutputDevice(pin=f'BOARD{board_pin}')
+            # with a grouped backend the pins are claimed by the backend instead
+            if self.backend is None:
+                for relay, board_pin in self.relay_dict.items():
+                    self.relay_dict[relay] = OutputDevice(pin=f'BOARD{board_pin}')
 
         else:
             self.buzzer = TestBuzzer()
-            for relay, board_pin in self.relay_dict.items():
-                self.relay_dict[relay] = TestRelay(board_pin)
+            if self.backend is None:
+                for relay, board_pin in self.relay_dict.items():
+                    self.relay_dict[relay] = TestRelay(board_pin)
 
     def relay_on(self, relay_number, verbose=True):
-        relay = self.relay_dict[relay_number]
-        relay.on()
+        self.set_relays({relay_number: True})
 
         if verbose:
             print(f"Relay {relay_number} ON")
 
     def relay_off(self, relay_number, verbose=True):
-        relay = self.relay_dict[relay_number]
-        relay.off()
+        self.set_relays({relay_number: False})
 
         if verbose:
             print(f"Relay {relay_number} OFF")
 
+    def set_relays(self, states):
+        """Switch several relays from a {relay: on} dict, in one write when a grouped backend is used."""
+        if self.backend is not None:
+            self.backend.write({relay: on for relay, on in states.items() if relay in self.relay_dict})
+            return
+
+        for relay_number, on in states.items():
+            if relay_number not in self.relay_dict:
+                continue
+            if on:
+                self.relay_dict[relay_number].on()
+            else:
+                self.relay_dict[relay_number].off()
+
     def beep(self, duration=0.2, repeats=2):
         self.buzzer.beep(on_time=duration, off_time=(duration / 2), n=repeats)
 
     def all_on(self, verbose=False):
-        for relay in self.relay_dict.keys():
-            self.relay_on(relay, verbose=verbose)
+        self.set_relays({relay: True for relay in self.relay_dict})
+        if verbose:
+            print("All relays ON")
 
     def all_off(self, verbose=False):
-        for relay in self.relay_dict.keys():
-            self.relay_off(relay, verbose=verbose)
+        self.set_relays({relay: False for relay in self.relay_dict})
+        if verbose:
+            print("All relays OFF")
 
     def remove(self, relay_number):
         self.relay_dict.pop(relay_number, None)
@@ -454,16 +580,21 @@ class RelayControl:
     def stop(self):
         self.clear()
         self.all_off()
+        if self.backend is not None:
+            self.backend.close()
 
 # this class does the hard work of receiving detection 'jobs' and queuing them to be actuated. It only turns a nozzle on
 # if the sprayDur has not elapsed or if the nozzle isn't already on.
 class RelayController:
-    def __init__(self, relay_dict, vis=False, status_led=None):
+    def __init__(self, relay_dict, vis=False, status_led=None, settle_time=1.0, spray_map=None, clock=None):
         self.logger = LogManager.get_logger(__name__)
 
+        self.clock = clock or SystemClock()
         self.relay_dict = relay_dict
         self.vis = vis
         self.status_led = status_led
+        # anything with record(relay, status, time_stamp), e.g. the spray map and session recorder
+        self.relay_listeners = [spray_map] if spray_map else []
         # instantiate relay control with supplied relay dictionary to map to correct board pins
         try:
             self.relay = RelayControl(self.relay_dict)
@@ -473,6 +604,12 @@ class RelayController:
         self.relay_queue_dict = {}
         self.relay_condition_dict = {}
 
+        # on-time bookkeeping for duty cycle reporting
+        self.start_time = self.clock.time()
+        self.on_since = [None] * len(self.relay_dict)
+        self.on_time_total = [0.0] * len(self.relay_dict)
+        self.activations = [0] * len(self.relay_dict)
+
         # create a job queue and Condition() for each nozzle
         self.logger.info("[INFO] Setting up nozzles...")
         self.relay_vis = RelayVis(relays=len(self.relay_dict.keys()))
@@ -484,8 +621,10 @@ class RelayController:
             relay_thread = Thread(target=self.consumer, args=[relay_number])
             relay_thread.setDaemon(True)
             relay_thread.start()
+            self.clock.track(relay_thread)
 
-        time.sleep(1)
+        # give the consumer threads time to start, skipped on fast start as the queues are ready once created
+        self.clock.sleep(settle_time)
         self.logger.info("[INFO] Nozzle setup complete. Initiating camera...")
         self.relay.beep(duration=0.5)
 
@@ -506,7 +645,7 @@ class RelayController:
         # notifies the consumer thread when something has been added to the queue
         with input_condition:
             input_queue.append(input_queue_message)
-            input_condition.notify()
+            self.clock.notify(input_condition)
 
     def consumer(self, relay):
         """
@@ -527,11 +666,17 @@ class RelayController:
                 job = relay_queue.popleft()
                 input_condition.release()
                 # check to make sure time is positive
-                onDur = 0 if (job[3] - (time.time() - job[1])) <= 0 else (job[3] - (time.time() - job[1]))
+                now = self.clock.time()
+                onDur = 0 if (job[3] - (now - job[1])) <= 0 else (job[3] - (now - job[1]))
 
                 if not relay_on:
-                    time.sleep(job[2]) # add in the delay variable
+                    self.clock.sleep(job[2]) # add in the delay variable
                     self.relay.relay_on(relay, verbose=False)
+                    self.on_since[relay] = self.clock.time()
+                    self.activations[relay] += 1
+                    for listener in self.relay_listeners:
+                        listener.record(relay, True, self.on_since[relay])
+
                     if self.status_led:
                         self.status_led.blink(on_time=0.1, n=1, background=True)
 
@@ -541,24 +686,171 @@ class RelayController:
                     relay_on = True
 
                 try:
-                    time.sleep(onDur)
+                    self.clock.sleep(onDur)
 
                 except ValueError:
-                    time.sleep(0)
+                    self.clock.sleep(0)
 
                 input_condition.acquire()
 
             if len(relay_queue) == 0:
                 self.relay.relay_off(relay, verbose=False)
+                if self.on_since[relay] is not None:
+                    off_time = self.clock.time()
+                    self.on_time_total[relay] += off_time - self.on_since[relay]
+                    self.on_since[relay] = None
+                    for listener in self.relay_listeners:
+                        listener.record(relay, False, off_time)
 
                 if self.vis:
                     self.relay_vis.update(relay=relay, status=False)
                 relay_on = False
 
-            input_condition.wait()
+            self.clock.wait(input_condition)
+
+    def duty_cycles(self):
+        """Fraction of time each relay has been on since the controller started."""
+        now = self.clock.time()
+        elapsed = max(now - self.start_time, 1e-6)
+        duty_cycles = []
+        for total, since in zip(self.on_time_total, self.on_since):
+            if since is not None:
+                total += now - since
+            duty_cycles.append(total / elapsed)
+
+        return duty_cycles
+
+    def queue_depths(self):
+        return [len(self.relay_queue_dict[relay]) for relay in sorted(self.relay_queue_dict)]
+
+    def commit(self):
+        """Jobs are actuated as they are received, see GroupedRelayController for per-frame commits."""
+        pass
 
     def stop(self):
         self.running = False
+        for condition in self.relay_condition_dict.values():
+            with condition:
+                self.clock.notify(condition)
+
+
+class GroupedRelayController(RelayController):
+    """
+    Relay controller for grouped backends. Jobs received during a frame are staged and handed over together by
+    commit(). A single actuator thread keeps the on and off time of every relay and, at each switching time, writes
+    every relay that changes in one backend write. Lanes fired by the same frame share their detection time and
+    delay, so they switch on in the same write instead of one consumer thread after another.
+    """
+
+    def __init__(self, relay_dict, backend, vis=False, status_led=None, settle_time=1.0, spray_map=None,
+                 clock=None):
+        self.logger = LogManager.get_logger(__name__)
+
+        self.clock = clock or SystemClock()
+        self.relay_dict = relay_dict
+        self.vis = vis
+        self.status_led = status_led
+        # anything with record(relay, status, time_stamp), e.g. the spray map and session recorder
+        self.relay_listeners = [spray_map] if spray_map else []
+        try:
+            self.relay = RelayControl(self.relay_dict, backend=backend)
+        except OWLAlreadyRunningError:
+            self.logger.error("Failed to initialize RelayControl: OWL is already running and using GPIO pin 7.")
+            raise
+
+        relay_count = len(self.relay_dict)
+        self.start_time = self.clock.time()
+        self.on_since = [None] * relay_count
+        self.on_time_total = [0.0] * relay_count
+        self.activations = [0] * relay_count
+
+        # staged jobs of the current frame, and the on/off schedule of each relay
+        self.staged = []
+        self.on_at = [None] * relay_count
+        self.off_at = [0.0] * relay_count
+        self.is_on = [False] * relay_count
+        self.condition = Condition()
+
+        self.logger.info(f"[INFO] Setting up {relay_count} nozzles with {type(backend).__name__} group writes...")
+        self.relay_vis = RelayVis(relays=relay_count)
+        self.running = True
+        self.actuator = Thread(target=self._actuate, name='RelayActuator', daemon=True)
+        self.actuator.start()
+        self.clock.track(self.actuator)
+
+        self.clock.sleep(settle_time)
+        self.logger.info("[INFO] Nozzle setup complete. Initiating camera...")
+        self.relay.beep(duration=0.5)
+
+    def receive(self, relay, time_stamp, location=0, delay=0, duration=1):
+        """Stage a job for the current frame, it is scheduled when commit() is called."""
+        self.staged.append((relay, time_stamp + delay, time_stamp + delay + duration))
+
+    def commit(self):
+        """Schedule all jobs staged since the last commit, called once per frame."""
+        if not self.staged:
+            return
+
+        with self.condition:
+            for relay, on_time, off_time in self.staged:
+                if not self.is_on[relay] and (self.on_at[relay] is None or on_time < self.on_at[relay]):
+                    self.on_at[relay] = on_time
+                self.off_at[relay] = max(self.off_at[relay], off_time)
+            self.clock.notify(self.condition)
+
+        self.staged = []
+
+    def _actuate(self):
+        with self.condition:
+            while self.running:
+                now = self.clock.time()
+                changes = {}
+                for relay in range(len(self.is_on)):
+                    if not self.is_on[relay] and self.on_at[relay] is not None and self.on_at[relay] <= now:
+                        self.on_at[relay] = None
+                        if self.off_at[relay] > now:
+                            changes[relay] = True
+                    elif self.is_on[relay] and self.off_at[relay] <= now:
+                        changes[relay] = False
+
+                if changes:
+                    self.relay.set_relays(changes)
+                    self._record(changes, now)
+
+                # sleep until the next switching time or a new commit
+                pending = [t for t in self.on_at if t is not None]
+                pending += [t for t, on in zip(self.off_at, self.is_on) if on]
+                self.clock.wait(self.condition, timeout=max(min(pending) - self.clock.time(), 0) if pending else None)
+
+    def _record(self, changes, now):
+        for relay, on in changes.items():
+            self.is_on[relay] = on
+            if on:
+                self.on_since[relay] = now
+                self.activations[relay] += 1
+                if self.status_led:
+                    self.status_led.blink(on_time=0.1, n=1, background=True)
+            elif self.on_since[relay] is not None:
+                self.on_time_total[relay] += now - self.on_since[relay]
+                self.on_since[relay] = None
+
+            for listener in self.relay_listeners:
+                listener.record(relay, on, now)
+
+            if self.vis:
+                self.relay_vis.update(relay=relay, status=on)
+
+    def queue_depths(self):
+        return [1 if on_time is not None else 0 for on_time in self.on_at]
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.clock.notify(self.condition)
+
+        # let a write in progress finish, so nothing switches back on after the relays are turned off
+        if self.actuator is not current_thread():
+            self.actuator.join(timeout=1.0)
 
 
 if __name__ == "__main__":
@@ -582,4 +874,25 @@ if __name__ == "__main__":
     advanced_indicator.show_error(2)  # Show an error with 2 flashes
     advanced_indicator.stop()
 
+    # Compare the switching skew between lanes fired by the same frame, using the fake backend's edge times
+    print("\nTesting relay skew across 10 lanes fired together...")
+    lanes = list(range(10))
+    for controller_class in (RelayController, GroupedRelayController):
+        backend = FakeRelayBackend({lane: lane for lane in lanes})
+        if controller_class is RelayController:
+            controller = RelayController({lane: lane for lane in lanes}, settle_time=0.2)
+            controller.relay.backend = backend
+        else:
+            controller = GroupedRelayController({lane: lane for lane in lanes}, backend=backend, settle_time=0)
+
+        fired = time.time()
+        for lane in lanes:
+            controller.receive(relay=lane, time_stamp=fired, duration=0.2)
+        controller.commit()
+        time.sleep(0.5)
+        controller.stop()
+
+        print(f"{controller_class.__name__}: on skew {1000 * backend.skew(lanes, on=True):.3f} ms, "
+              f"off skew {1000 * backend.skew(lanes, on=False):.3f} ms, {backend.writes} writes")
+
     print("\nTest complete.")
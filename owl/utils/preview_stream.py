@@ -0,0 +1,172 @@
+import time
+import cv2
+import numpy as np
+
+from threading import Thread, Event, Condition, Lock
+from utils.log_manager import LogManager
+
+PREVIEW_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>OWL Preview</title>
+    <style>body { margin: 0; background: #111; } img { width: 100%; height: auto; }</style>
+</head>
+<body><img src="/preview.mjpg" alt="OWL preview"></body>
+</html>
+"""
+
+
+class PreviewStream:
+    """
+    Low-bandwidth MJPEG preview of the detections for headless units. The main loop only hands over a reference to
+    the latest frame and its boxes; downscaling, drawing and JPEG encoding happen on the encoder thread. If the encoder
+    is still busy, the waiting frame is replaced rather than queued, so the preview drops frames instead of slowing
+    detection. Nothing is encoded while no client is connected.
+    """
+
+    BOUNDARY = 'owlframe'
+
+    def __init__(self, max_fps=5.0, width=480, quality=60):
+        self.logger = LogManager.get_logger(__name__)
+        self.min_interval = 1.0 / max_fps
+        self.width = width
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+
+        self.clients = 0
+        self._clients_lock = Lock()
+        self.dropped_frames = 0
+        self.last_submit = 0.0
+
+        self._latest = None
+        self._latest_lock = Lock()
+        self._new_frame = Event()
+
+        self.jpeg = None
+        self.jpeg_id = 0
+        self._jpeg_condition = Condition()
+
+        self.running = True
+        self.thread = Thread(target=self._encode_loop, name='PreviewStream', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def submit(self, frame, boxes=None, text=None):
+        """Offer a frame to the preview. Returns immediately and never copies the frame."""
+        if not self.clients:
+            return
+
+        now = time.perf_counter()
+        if now - self.last_submit < self.min_interval:
+            return
+        self.last_submit = now
+
+        with self._latest_lock:
+            if self._latest is not None:
+                self.dropped_frames += 1
+            self._latest = (frame, boxes, text)
+
+        self._new_frame.set()
+
+    def _encode_loop(self):
+        while self.running:
+            if not self._new_frame.wait(timeout=0.5):
+                continue
+            self._new_frame.clear()
+
+            with self._latest_lock:
+                latest, self._latest = self._latest, None
+
+            if latest is None:
+                continue
+
+            try:
+                jpeg = self._encode(*latest)
+            except Exception as e:
+                self.logger.error(f"Error encoding preview frame: {e}", exc_info=True)
+                continue
+
+            with self._jpeg_condition:
+                self.jpeg = jpeg
+                self.jpeg_id += 1
+                self._jpeg_condition.notify_all()
+
+    def _encode(self, frame, boxes, text):
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.width / width)
+
+        # resize always returns a new array, so drawing never touches the frame used by detection
+        if scale < 1.0:
+            preview = cv2.resize(frame, (self.width, int(round(height * scale))), interpolation=cv2.INTER_AREA)
+        else:
+            preview = frame.copy()
+
+        if boxes is not None and len(boxes) > 0:
+            scaled_boxes = np.rint(np.asarray(boxes, dtype=np.float32).reshape(-1, 4) * scale).astype(int)
+            for x, y, w, h in scaled_boxes:
+                cv2.rectangle(preview, (x, y), (x + w, y + h), (0, 0, 255), 1)
+
+        if text:
+            cv2.putText(preview, text, (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (80, 80, 255), 1)
+
+        success, encoded = cv2.imencode('.jpg', preview, self.encode_params)
+        if not success:
+            raise ValueError('JPEG encoding failed')
+
+        return encoded.tobytes()
+
+    def wait_for_frame(self, last_id, timeout=2.0):
+        """Block a client thread until a newer JPEG than last_id is available. Returns (jpeg_id, jpeg)."""
+        with self._jpeg_condition:
+            self._jpeg_condition.wait_for(lambda: self.jpeg_id != last_id or not self.running, timeout=timeout)
+            return self.jpeg_id, self.jpeg
+
+    def handle_page(self, request):
+        body = PREVIEW_PAGE.encode('utf-8')
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def handle_stream(self, request):
+        """Serve multipart/x-mixed-replace JPEG frames until the client disconnects."""
+        request.send_response(200)
+        request.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={self.BOUNDARY}')
+        request.send_header('Cache-Control', 'no-cache, private')
+        request.send_header('Pragma', 'no-cache')
+        request.end_headers()
+
+        with self._clients_lock:
+            self.clients += 1
+
+        last_id = None
+        try:
+            while self.running:
+                jpeg_id, jpeg = self.wait_for_frame(last_id)
+                if jpeg is None or jpeg_id == last_id:
+                    continue
+                last_id = jpeg_id
+
+                request.wfile.write(f'--{self.BOUNDARY}\r\n'.encode())
+                request.wfile.write(b'Content-Type: image/jpeg\r\n')
+                request.wfile.write(f'Content-Length: {len(jpeg)}\r\n\r\n'.encode())
+                request.wfile.write(jpeg)
+                request.wfile.write(b'\r\n')
+
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+        finally:
+            with self._clients_lock:
+                self.clients -= 1
+
+    def stop(self):
+        self.running = False
+        self._new_frame.set()
+        with self._jpeg_condition:
+            self._jpeg_condition.notify_all()
+
+        self.thread.join(timeout=1)
@@ -0,0 +1,146 @@
+import configparser
+
+from pathlib import Path
+from typing import Dict
+from utils.control_block import SENSITIVITY_HIGH, SENSITIVITY_LOW, THRESHOLDS
+from utils.error_manager import ConfigFileError
+from utils.greenonbrown import make_clip_lut
+from utils.log_manager import LogManager
+
+
+class SensitivityProfile:
+    """
+    One sensitivity setting, compiled once: the GreenOnBrown thresholds, the detection confidence and the lookup
+    table GreenOnBrown clips the ExG index with. Profiles never change after they are built, so switching between
+    them is swapping the active profile and copying its values, with nothing rebuilt before the next frame.
+    """
+
+    def __init__(self, name: str, settings: Dict[str, int], confidence: float):
+        """
+        :param name: label for logs and metrics, normally the config file name
+        :param settings: the eight GreenOnBrown thresholds
+        :param confidence: GreenOnGreen detection confidence
+        """
+        self.name = name
+        self.settings = dict(settings)
+        self.confidence = confidence
+
+        self.clip_range = (self.settings['exg_min'], self.settings['exg_max'])
+        self.clip_lut = make_clip_lut(*self.clip_range)
+        self.clip_lut.flags.writeable = False
+
+    @classmethod
+    def from_config_file(cls, config_file, confidence: float = 0.5) -> 'SensitivityProfile':
+        """
+        :param config_file: OWL config with the profile's [GreenOnBrown] thresholds
+        :param confidence: used when the file has no [GreenOnGreen] confidence
+        """
+        config_file = Path(config_file)
+        config = configparser.ConfigParser()
+        if not config.read(config_file):
+            raise ConfigFileError(config_file, 'Sensitivity profile not found')
+
+        try:
+            settings = {key: config.getint('GreenOnBrown', key) for key in THRESHOLDS}
+        except (configparser.Error, ValueError) as e:
+            raise ConfigFileError(config_file, f'Invalid sensitivity profile: {e}')
+
+        return cls(name=config_file.stem,
+                   settings=settings,
+                   confidence=config.getfloat('GreenOnGreen', 'confidence', fallback=confidence))
+
+
+class SensitivityProfiles:
+    """The compiled profiles selectable from the controller's sensitivity switch, keyed by control block value."""
+
+    def __init__(self, profiles: Dict[int, SensitivityProfile]):
+        self.logger = LogManager.get_logger(__name__)
+        self.profiles = profiles
+        self.active = None
+
+    @classmethod
+    def from_config(cls, config, confidence: float = 0.5) -> 'SensitivityProfiles':
+        return cls({
+            SENSITIVITY_LOW: SensitivityProfile.from_config_file(
+                config.get('Controller', 'low_sensitivity_config'), confidence=confidence),
+            SENSITIVITY_HIGH: SensitivityProfile.from_config_file(
+                config.get('Controller', 'high_sensitivity_config'), confidence=confidence)
+        })
+
+    def select(self, sensitivity: int) -> SensitivityProfile:
+        profile = self.profiles.get(sensitivity)
+        if profile is None:
+            self.logger.warning(f"[WARNING] No sensitivity profile for switch value {sensitivity}, keeping "
+                                f"{self.active.name if self.active else 'the config file thresholds'}.")
+            return self.active
+
+        self.active = profile
+        return profile
+
+    def register(self, detector) -> None:
+        """Hand the compiled clip tables to a GreenOnBrown detector, other detectors have no use for them."""
+        if hasattr(detector, 'profile_luts'):
+            detector.profile_luts.update({profile.clip_range: profile.clip_lut for profile in self.profiles.values()})
+
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+    from utils.control_block import ControlBlock
+    from utils.greenonbrown import GreenOnBrown
+
+    # run from the owl directory: python -m utils.sensitivity
+    config_file = Path('config/DAY_SENSITIVITY_2.ini')
+    runs = 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        high = SensitivityProfile.from_config_file(config_file)
+    compile_time = (time.perf_counter() - start) / runs
+
+    low = SensitivityProfile('low', dict(high.settings, exg_min=high.settings['exg_min'] + 10), high.confidence)
+    profiles = SensitivityProfiles({SENSITIVITY_HIGH: high, SENSITIVITY_LOW: low})
+
+    start = time.perf_counter()
+    for i in range(runs):
+        profiles.select(i % 2)
+    select_time = (time.perf_counter() - start) / runs
+    print(f"Compile a profile from its config file: {1e6 * compile_time:.0f} us, switch profiles: "
+          f"{1e6 * select_time:.2f} us")
+
+    # switch to effect: the controller writes the switch, the detection loop polls, switches and runs the next frame
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    block = ControlBlock()
+
+    def switch_to_effect(detector, compiled):
+        """
+        Median ms from the switch write until the detector is ready for the new profile, and until the end of the
+        first detection that uses it.
+        """
+        ready_times, effect_times = [], []
+        for i in range(200):
+            start = time.perf_counter()
+            block.update(sensitivity=i % 2)
+            sensitivity = block.poll()['sensitivity']
+            if compiled:
+                settings = profiles.select(sensitivity).settings
+            else:
+                # the profile read from its file on the switch and its clip table built on the next frame
+                detector.clip_luts.clear()
+                settings = SensitivityProfile.from_config_file(config_file).settings
+            detector.clip_lut(settings['exg_min'], settings['exg_max'])
+            ready_times.append(time.perf_counter() - start)
+
+            detector.inference(frame, **settings)
+            effect_times.append(time.perf_counter() - start)
+
+        return 1000 * np.median(ready_times), 1000 * np.median(effect_times)
+
+    for compiled in (True, False):
+        detector = GreenOnBrown(algorithm='exg')
+        if compiled:
+            profiles.register(detector)
+        ready, effect = switch_to_effect(detector, compiled)
+        print(f"{'Compiled profiles' if compiled else 'Rebuilt on switch':<18} switch to ready: {ready:.3f} ms, "
+              f"switch to the end of the first detection: {effect:.3f} ms")
@@ -0,0 +1,394 @@
+import io
+import json
+import os
+import queue
+import tempfile
+import time
+import cv2
+import numpy as np
+
+from configparser import ConfigParser
+from datetime import datetime
+from pathlib import Path
+from queue import Queue
+from threading import Thread, Event
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from utils.clock import SystemClock
+from utils.log_manager import LogManager
+
+MAGIC = b'OWLSES01'
+FILE_SUFFIX = '.owlsession'
+
+# record kinds, key is the frame id for frames and detections and the relay number for relay events
+CONFIG, FRAME, DETECTIONS, RELAY = 0, 1, 2, 3
+KIND_NAMES = {CONFIG: 'config', FRAME: 'frame', DETECTIONS: 'detections', RELAY: 'relay'}
+
+RECORD_HEADER = np.dtype([('kind', 'u1'), ('key', '<u4'), ('timestamp', '<f8'), ('size', '<u4')])
+INDEX_DTYPE = np.dtype([('kind', 'u1'), ('key', '<u4'), ('timestamp', '<f8'), ('offset', '<u8'), ('size', '<u4')])
+TRAILER = np.dtype([('index_offset', '<u8'), ('count', '<u8'), ('magic', 'S8')])
+
+NPY_MAGIC = b'\x93NUMPY'
+
+
+def encode_frame(frame: np.ndarray, compression: str = 'png', level: int = 1) -> bytes:
+    """Lossless frame payload, PNG or the raw array in .npy format."""
+    if compression == 'raw':
+        buffer = io.BytesIO()
+        np.save(buffer, frame, allow_pickle=False)
+        return buffer.getvalue()
+
+    ok, encoded = cv2.imencode('.png', frame, [cv2.IMWRITE_PNG_COMPRESSION, level])
+    if not ok:
+        raise ValueError('Could not encode frame as PNG')
+    return encoded.tobytes()
+
+
+def decode_frame(payload: bytes) -> np.ndarray:
+    if payload.startswith(NPY_MAGIC):
+        return np.load(io.BytesIO(payload), allow_pickle=False)
+    return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+
+
+class SessionRecorder:
+    """
+    Records a session into one indexed file: the active config, every frame losslessly with its capture time, the
+    detections and relay jobs of every frame with the time they were actuated, and every relay on/off event. The
+    main loop only queues references; a worker thread encodes and appends the records and, on stop, writes an index
+    of all records at the end of the file. A file cut short by a power cut is still readable, the reader rebuilds
+    the index by scanning the records.
+    """
+
+    def __init__(self, directory: Union[str, Path], config: ConfigParser, compression: str = 'png',
+                 max_queue: int = 128, clock: Optional[SystemClock] = None):
+        """
+        :param directory: where the session file is written
+        :param config: the config the session runs with, stored in the file for replay
+        :param compression: 'png' for lossless PNG frames, 'raw' for uncompressed arrays
+        :param clock: the clock frames and relay events are timed with
+        """
+        if compression not in ('png', 'raw'):
+            raise ValueError(f"session_compression must be png or raw, got '{compression}'")
+
+        self.logger = LogManager.get_logger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"session_{datetime.now().strftime('%Y%m%dT%H%M%S')}{FILE_SUFFIX}"
+        self.compression = compression
+        self.clock = clock or SystemClock()
+
+        self.queue = Queue(maxsize=max_queue)
+        self.dropped_frames = 0
+        self.frames_written = 0
+        self.index = []
+
+        config_text = io.StringIO()
+        config.write(config_text)
+        self._put(CONFIG, 0, self.clock.time(), config_text.getvalue().encode())
+
+        self.stop_event = Event()
+        self.worker = Thread(target=self._process_queue, name='SessionRecorder', daemon=True)
+        self.worker.start()
+        self.logger.info(f"[INFO] Recording session to {self.path}")
+
+    def add_frame(self, frame_id: int, frame: np.ndarray, capture_time: float) -> bool:
+        """Queue a frame, it is encoded on the worker thread. Never blocks; returns False if the frame was dropped."""
+        if not self._put(FRAME, frame_id, capture_time, frame):
+            self.dropped_frames += 1
+            return False
+        return True
+
+    def add_detections(self, frame_id: int, actuation_time: float, boxes, relays, durations, delay: float = 0):
+        """Boxes of one frame and the relay jobs sent for it, at the time they were sent."""
+        self._put(DETECTIONS, frame_id, actuation_time, json.dumps({
+            'boxes': np.asarray(boxes).reshape(-1, 4).tolist(),
+            'relays': [int(relay) for relay in relays],
+            'durations': [float(duration) for duration in durations],
+            'delay': delay
+        }).encode())
+
+    def record(self, relay: int, status: bool, time_stamp: Optional[float] = None) -> None:
+        """Called by the relay threads when a relay switches on (status True) or off."""
+        time_stamp = self.clock.time() if time_stamp is None else time_stamp
+        self._put(RELAY, relay, time_stamp, b'\x01' if status else b'\x00')
+
+    def _put(self, kind, key, timestamp, payload) -> bool:
+        try:
+            self.queue.put_nowait((kind, key, timestamp, payload))
+            return True
+        except queue.Full:
+            return False
+
+    def _process_queue(self) -> None:
+        try:
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC)
+                last_flush = time.time()
+
+                while not self.stop_event.is_set() or not self.queue.empty():
+                    try:
+                        kind, key, timestamp, payload = self.queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+
+                    if kind == FRAME:
+                        payload = encode_frame(payload, self.compression)
+                        self.frames_written += 1
+
+                    header = np.array([(kind, key, timestamp, len(payload))], dtype=RECORD_HEADER)
+                    self.index.append((kind, key, timestamp, f.tell() + RECORD_HEADER.itemsize, len(payload)))
+                    f.write(header.tobytes())
+                    f.write(payload)
+
+                    if time.time() - last_flush >= 1.0:
+                        f.flush()
+                        last_flush = time.time()
+
+                index = np.array(self.index, dtype=INDEX_DTYPE)
+                trailer = np.zeros(1, dtype=TRAILER)
+                trailer['index_offset'], trailer['count'], trailer['magic'] = f.tell(), len(index), MAGIC
+                f.write(index.tobytes())
+                f.write(trailer.tobytes())
+
+        except Exception as e:
+            self.logger.error(f"Error in session recorder: {e}", exc_info=True)
+
+    def stop(self) -> None:
+        """Write everything still queued, then the index."""
+        self.stop_event.set()
+        self.worker.join()
+
+        if self.dropped_frames:
+            self.logger.warning(f"[WARNING] Session recorder dropped {self.dropped_frames} frames, queue was full. "
+                                f"Use session_compression = raw or a lower resolution.")
+        self.logger.info(f"[INFO] Session saved to {self.path} ({self.frames_written} frames)")
+
+
+class SessionReader:
+    """Random access to a session file through its index, rebuilt by scanning when the file was not closed."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not an OWL session file")
+
+        self.index = self._read_index()
+        if len(self.index) == 0 or self.index['kind'][0] != CONFIG:
+            raise ValueError(f"{self.path} has no config record")
+
+    def _read_index(self) -> np.ndarray:
+        size = self.path.stat().st_size
+        if size >= len(MAGIC) + TRAILER.itemsize:
+            trailer = np.fromfile(self.path, dtype=TRAILER, count=1, offset=size - TRAILER.itemsize)
+            if trailer['magic'][0] == MAGIC:
+                return np.fromfile(self.path, dtype=INDEX_DTYPE, count=int(trailer['count'][0]),
+                                   offset=int(trailer['index_offset'][0]))
+
+        entries = []
+        with open(self.path, 'rb') as f:
+            offset = len(MAGIC)
+            while offset + RECORD_HEADER.itemsize <= size:
+                f.seek(offset)
+                header = np.frombuffer(f.read(RECORD_HEADER.itemsize), dtype=RECORD_HEADER)[0]
+                payload_offset = offset + RECORD_HEADER.itemsize
+                if header['kind'] not in KIND_NAMES or payload_offset + header['size'] > size:
+                    # a partially written final record
+                    break
+
+                entries.append((header['kind'], header['key'], header['timestamp'], payload_offset, header['size']))
+                offset = payload_offset + int(header['size'])
+
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def payload(self, entry) -> bytes:
+        with open(self.path, 'rb') as f:
+            f.seek(int(entry['offset']))
+            return f.read(int(entry['size']))
+
+    def entries(self, kind: int) -> np.ndarray:
+        return self.index[self.index['kind'] == kind]
+
+    @property
+    def config_text(self) -> str:
+        return self.payload(self.index[0]).decode()
+
+    def config(self) -> ConfigParser:
+        config = ConfigParser()
+        config.read_string(self.config_text)
+        return config
+
+    @property
+    def start_time(self) -> float:
+        frames = self.entries(FRAME)
+        return float(frames['timestamp'][0]) if len(frames) else float(self.index['timestamp'][0])
+
+    def frames(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """(frame id, capture time, frame) in recorded order, decoded one at a time."""
+        with open(self.path, 'rb') as f:
+            for entry in self.entries(FRAME):
+                f.seek(int(entry['offset']))
+                yield int(entry['key']), float(entry['timestamp']), decode_frame(f.read(int(entry['size'])))
+
+    def detections(self) -> Dict[int, Tuple[float, Dict]]:
+        """{frame id: (actuation time, boxes, relays, durations and delay)}"""
+        return {int(entry['key']): (float(entry['timestamp']), json.loads(self.payload(entry)))
+                for entry in self.entries(DETECTIONS)}
+
+    def relay_events(self) -> List[Tuple[float, int, bool]]:
+        """(time, relay, on) for every relay edge, in the order they were recorded."""
+        return [(float(entry['timestamp']), int(entry['key']), self.payload(entry) == b'\x01')
+                for entry in self.entries(RELAY)]
+
+    def jobs(self) -> List[Tuple[int, float, float]]:
+        """(relay, start time, duration) of every relay job, as logged by SimulationRunner."""
+        jobs = []
+        for actuation_time, detection in self.detections().values():
+            for relay, duration in zip(detection['relays'], detection['durations']):
+                jobs.append((relay, actuation_time + detection['delay'], duration))
+        return jobs
+
+    def summary(self) -> Dict:
+        frames = self.entries(FRAME)
+        duration = float(frames['timestamp'][-1] - frames['timestamp'][0]) if len(frames) > 1 else 0.0
+        frame_ids = set(int(key) for key in frames['key'])
+        return {
+            'frames': len(frames),
+            'duration': duration,
+            'fps': (len(frames) - 1) / duration if duration else 0.0,
+            'missing_frames': len(set(self.detections()) - frame_ids),
+            'relay_events': len(self.entries(RELAY)),
+            'bytes': self.path.stat().st_size,
+        }
+
+
+class SessionReplay:
+    """
+    Frame source that plays a session back through Owl.hoot. Each read() moves the clock to the time the frame was
+    actuated in the field, or captured when nothing was actuated, so on a VirtualClock the relay jobs of a replay
+    carry the recorded times, processing delays included. On the system clock the recorded spacing is kept.
+    """
+
+    def __init__(self, path: Union[str, Path], clock: Optional[SystemClock] = None):
+        self.reader = SessionReader(path)
+        self.clock = clock or SystemClock()
+        self.frame_iterator = self.reader.frames()
+        self.actuation_times = {frame_id: actuation_time
+                                for frame_id, (actuation_time, _) in self.reader.detections().items()}
+
+        frames = self.reader.entries(FRAME)
+        if len(frames) == 0:
+            raise ValueError(f"{path} has no frames")
+
+        first_frame = decode_frame(self.reader.payload(frames[0]))
+        self._resolution = (first_frame.shape[1], first_frame.shape[0])
+        self.offset = None
+        self.input_type = 'session'
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return self._resolution
+
+    def read(self) -> Optional[np.ndarray]:
+        frame_id, capture_time, frame = next(self.frame_iterator, (None, None, None))
+        if frame is None:
+            return None
+
+        target = max(self.actuation_times.get(frame_id, capture_time), capture_time)
+        if self.offset is None:
+            # recorded times are used as they are on a virtual clock started at the session start
+            self.offset = 0.0 if self.clock.virtual else self.clock.time() - target
+
+        self.clock.sleep(target + self.offset - self.clock.time())
+        return frame
+
+    def stop(self) -> None:
+        self.frame_iterator.close()
+
+
+def replay_session(path: Union[str, Path], tolerance: float = 0.005) -> Dict:
+    """
+    Replay a session through Owl on a VirtualClock and compare it with the recording. The recorded config is used
+    with session recording off and fast start on, and relays switch the fake backend. Returns the SimulationRunner
+    report with the recorded jobs and relay intervals that the replay did not reproduce.
+    """
+    from utils.simulation import SimulationRunner, on_intervals
+
+    reader = SessionReader(path)
+    config = reader.config()
+    config.set('DataCollection', 'record_session', 'False')
+    config.set('System', 'fast_start', 'True')
+
+    handle, config_path = tempfile.mkstemp(suffix='.ini', prefix='owl_replay_')
+    try:
+        with os.fdopen(handle, 'w') as f:
+            config.write(f)
+
+        runner = SimulationRunner(config_path, str(path), start=reader.start_time, tolerance=tolerance)
+        report = runner.run()
+    finally:
+        os.remove(config_path)
+
+    recorded_jobs = sorted(reader.jobs())
+    replayed_jobs = sorted(runner.jobs)
+    unmatched_jobs = [job for job in recorded_jobs if not any(
+        job[0] == other[0] and abs(job[1] - other[1]) <= tolerance and abs(job[2] - other[2]) <= tolerance
+        for other in replayed_jobs)]
+
+    # relays still on when the session stopped were switched off without an event, they are left out
+    recorded_intervals = {relay: [(on, off) for on, off in spans if off != float('inf')]
+                          for relay, spans in on_intervals(reader.relay_events(), end_time=float('inf')).items()}
+    unmatched_intervals, truncated_intervals = [], 0
+    for relay, spans in recorded_intervals.items():
+        replayed = report['intervals'].get(relay, [])
+        for on, off in spans:
+            if off > report['end_time']:
+                # switched off after the last frame, the replay stops before that
+                truncated_intervals += 1
+            elif not any(abs(on - other_on) <= tolerance and abs(off - other_off) <= tolerance
+                       for other_on, other_off in replayed):
+                unmatched_intervals.append((relay, on, off))
+
+    report.update({
+        'recorded_jobs': len(recorded_jobs),
+        'replayed_jobs': len(replayed_jobs),
+        'unmatched_jobs': unmatched_jobs,
+        'recorded_intervals': sum(len(spans) for spans in recorded_intervals.values()),
+        'unmatched_intervals': unmatched_intervals,
+        'truncated_intervals': truncated_intervals,
+    })
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.session logs/sessions/session_20251019T101500.owlsession --replay
+    ap = argparse.ArgumentParser(description='Summarise or replay an OWL session file.')
+    ap.add_argument('path', type=str, help='.owlsession file')
+    ap.add_argument('--replay', action='store_true', help='replay the session in simulated time and compare')
+    ap.add_argument('--tolerance', type=float, default=0.005, help='allowed timing difference in seconds')
+    ap.add_argument('--export', type=str, default=None, help='write the frames as PNG images to this directory')
+    args = ap.parse_args()
+
+    session = SessionReader(args.path)
+    info = session.summary()
+    print(f"{info['frames']} frames over {info['duration']:.1f} s ({info['fps']:.1f} FPS), "
+          f"{info['relay_events']} relay events, {info['bytes'] / 1e6:.1f} MB")
+    if info['missing_frames']:
+        print(f"{info['missing_frames']} frames were dropped by the recorder")
+
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+        for exported_id, exported_time, exported_frame in session.frames():
+            cv2.imwrite(os.path.join(args.export, f"frame_{exported_id:06d}_{exported_time:.3f}.png"), exported_frame)
+
+    if args.replay:
+        result = replay_session(args.path, tolerance=args.tolerance)
+        print(f"Replayed in {result['real_seconds']:.1f} s: {result['replayed_jobs']} of {result['recorded_jobs']} "
+              f"jobs, {len(result['unmatched_jobs'])} recorded jobs not reproduced")
+        compared = result['recorded_intervals'] - result['truncated_intervals']
+        print(f"{compared - len(result['unmatched_intervals'])} of {compared} recorded relay intervals reproduced "
+              f"within {1000 * args.tolerance:.0f} ms, {result['truncated_intervals']} ended after the last frame")
+        for relay_number, on_time, off_time in result['unmatched_intervals'][:10]:
+            print(f"Not reproduced: relay {relay_number} on {on_time:.3f} off {off_time:.3f}")
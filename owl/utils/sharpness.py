@@ -0,0 +1,226 @@
+import time
+import cv2
+import numpy as np
+
+from typing import Callable, Dict, Iterable
+
+# metrics that can be computed, in the order they are shown on the display
+METRICS = ('fft', 'laplacian', 'gradient', 'variance_of_gradient', 'tenengrad', 'entropy', 'wavelet')
+
+
+class FrameIntermediates:
+    """
+    Per-frame cache of the images the metrics are built from. The centre ROI is cut from the frame, converted to
+    grey and downsampled once; Sobel gradients, the gradient magnitude and the histogram are computed the first time a
+    metric asks for them and shared by every metric that needs them.
+    """
+
+    def __init__(self, frame: np.ndarray, roi: float = 0.5, max_size: int = 256):
+        h, w = frame.shape[:2]
+        roi_h, roi_w = max(int(h * roi), 8), max(int(w * roi), 8)
+        top, left = (h - roi_h) // 2, (w - roi_w) // 2
+        crop = frame[top:top + roi_h, left:left + roi_w]
+
+        grey = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+        scale = max_size / max(roi_h, roi_w)
+        if scale < 1:
+            grey = cv2.resize(grey, (int(roi_w * scale), int(roi_h * scale)), interpolation=cv2.INTER_AREA)
+
+        self.grey = grey
+        self._cache = {}
+
+    def _cached(self, key, compute: Callable):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def grey_float(self) -> np.ndarray:
+        return self._cached('grey_float', lambda: self.grey.astype(np.float32))
+
+    def gradients(self, ksize: int = 3):
+        return self._cached(('gradients', ksize), lambda: (cv2.Sobel(self.grey_float, cv2.CV_32F, 1, 0, ksize=ksize),
+                                                           cv2.Sobel(self.grey_float, cv2.CV_32F, 0, 1, ksize=ksize)))
+
+    def gradient_magnitude(self, ksize: int = 3) -> np.ndarray:
+        return self._cached(('magnitude', ksize), lambda: cv2.magnitude(*self.gradients(ksize)))
+
+    @property
+    def histogram(self) -> np.ndarray:
+        return self._cached('histogram', lambda: cv2.calcHist([self.grey], [0], None, [256], [0, 256]).ravel())
+
+
+def fft_sharpness(frame: FrameIntermediates, cutoff: float = 0.06) -> float:
+    """
+    fft_blur on the ROI with a real FFT: low frequencies up to cutoff (a fraction of the Nyquist frequency) are
+    removed and the mean log magnitude of what remains is returned. rfft2 only computes the non-redundant half of
+    the spectrum, so removing the low frequencies means zeroing the corners instead of shifting the spectrum.
+    """
+    grey = frame.grey_float
+    h, w = grey.shape
+    size = max(int(cutoff * min(h, w) / 2), 1)
+
+    spectrum = np.fft.rfft2(grey)
+    spectrum[:size, :size] = 0
+    spectrum[-size:, :size] = 0
+    recon = np.fft.irfft2(spectrum, s=grey.shape)
+
+    return float(np.mean(20 * np.log(np.abs(recon) + 1e-6)))
+
+
+def laplacian_sharpness(frame: FrameIntermediates) -> float:
+    return float(cv2.Laplacian(frame.grey_float, cv2.CV_32F).var())
+
+
+def gradient_sharpness(frame: FrameIntermediates) -> float:
+    return float(np.mean(frame.gradient_magnitude(3)))
+
+
+def variance_of_gradient_sharpness(frame: FrameIntermediates) -> float:
+    return float(np.var(frame.gradient_magnitude(3)))
+
+
+def tenengrad_sharpness(frame: FrameIntermediates) -> float:
+    return float(np.mean(np.square(frame.gradient_magnitude(5))))
+
+
+def entropy_sharpness(frame: FrameIntermediates) -> float:
+    hist = frame.histogram / frame.grey.size
+    hist = hist[hist > 0]
+    return float(-np.sum(hist * np.log2(hist)))
+
+
+def wavelet_sharpness(frame: FrameIntermediates) -> float:
+    # approximation (LL) band of a single level Haar transform, computed directly instead of with pywt
+    grey = frame.grey_float
+    h, w = grey.shape[0] // 2 * 2, grey.shape[1] // 2 * 2
+    grey = grey[:h, :w]
+    ll = (grey[0::2, 0::2] + grey[1::2, 0::2] + grey[0::2, 1::2] + grey[1::2, 1::2]) / 2
+    return float(np.sum(np.square(ll)) / (h * w))
+
+
+METRIC_FUNCTIONS = {
+    'fft': fft_sharpness,
+    'laplacian': laplacian_sharpness,
+    'gradient': gradient_sharpness,
+    'variance_of_gradient': variance_of_gradient_sharpness,
+    'tenengrad': tenengrad_sharpness,
+    'entropy': entropy_sharpness,
+    'wavelet': wavelet_sharpness,
+}
+
+
+class SharpnessEngine:
+    """
+    Focus metrics for the --focus mode. Every update_interval frames the selected metrics are computed from one
+    shared set of intermediates on a downsampled centre ROI; in between the last values are returned, so focusing
+    costs little more than a normal detection loop. Values are comparable between frames of one setup, not between
+    ROI or size settings.
+    """
+
+    def __init__(self, metrics: Iterable[str] = ('fft',), update_interval: int = 5, roi: float = 0.5,
+                 max_size: int = 256):
+        """
+        :param metrics: names from METRICS to compute
+        :param update_interval: compute every this many frames
+        :param roi: fraction of the frame width and height, centred, that is measured
+        :param max_size: the ROI is downsampled so its longest side is at most this many pixels
+        """
+        self.metrics = [metric.strip() for metric in metrics if metric.strip()]
+        unknown = set(self.metrics) - set(METRICS)
+        if unknown or not self.metrics:
+            raise ValueError(f"focus_metrics must be one or more of {', '.join(METRICS)}, got {', '.join(metrics)}")
+
+        self.update_interval = max(update_interval, 1)
+        self.roi = roi
+        self.max_size = max_size
+
+        self.values = {}
+        self.frames = 0
+
+    @classmethod
+    def from_config(cls, config) -> 'SharpnessEngine':
+        return cls(metrics=config.get('Visualisation', 'focus_metrics', fallback='fft').split(','),
+                   update_interval=config.getint('Visualisation', 'focus_interval', fallback=5),
+                   roi=config.getfloat('Visualisation', 'focus_roi', fallback=0.5),
+                   max_size=config.getint('Visualisation', 'focus_max_size', fallback=256))
+
+    def measure(self, frame: np.ndarray) -> Dict[str, float]:
+        intermediates = FrameIntermediates(frame, roi=self.roi, max_size=self.max_size)
+        return {metric: METRIC_FUNCTIONS[metric](intermediates) for metric in self.metrics}
+
+    def update(self, frame: np.ndarray) -> Dict[str, float]:
+        """Metrics for the latest frame, recomputed every update_interval frames."""
+        if self.frames % self.update_interval == 0:
+            self.values = self.measure(frame)
+        self.frames += 1
+
+        return self.values
+
+
+def benchmark(frame: np.ndarray, runs: int = 50, roi: float = 0.5, max_size: int = 256) -> Dict[str, Dict[str, float]]:
+    """
+    Mean time in ms of each metric on its own (including building the intermediates it needs), of all metrics
+    sharing one set of intermediates, and of the full-frame functions in utils.algorithms they replace (wavelet_blur
+    is left out as it needs pywt).
+    """
+    from utils import algorithms
+
+    def timed(function: Callable, *args) -> float:
+        function(*args)
+        start = time.perf_counter()
+        for _ in range(runs):
+            function(*args)
+        return 1000 * (time.perf_counter() - start) / runs
+
+    results = {'engine': {}, 'full_frame': {}}
+    for metric in METRICS:
+        engine = SharpnessEngine(metrics=[metric], roi=roi, max_size=max_size)
+        results['engine'][metric] = timed(engine.measure, frame)
+
+    results['engine']['all'] = timed(SharpnessEngine(metrics=METRICS, roi=roi, max_size=max_size).measure, frame)
+
+    legacy = {
+        'fft': lambda: algorithms.fft_blur(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), size=30),
+        'laplacian': lambda: algorithms.laplacian_blur(frame),
+        'gradient': lambda: algorithms.gradient_blur(frame),
+        'variance_of_gradient': lambda: algorithms.variance_of_gradient_blur(frame),
+        'tenengrad': lambda: algorithms.tenengrad_blur(frame),
+        'entropy': lambda: algorithms.entropy_blur(frame),
+    }
+    for metric, function in legacy.items():
+        results['full_frame'][metric] = timed(function)
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.sharpness --image some_frame.jpg
+    ap = argparse.ArgumentParser(description='Benchmark the focus metrics metric by metric.')
+    ap.add_argument('--image', type=str, default=None, help='frame to measure, a synthetic frame if not given')
+    ap.add_argument('--width', type=int, default=1024)
+    ap.add_argument('--height', type=int, default=768)
+    ap.add_argument('--runs', type=int, default=50)
+    ap.add_argument('--roi', type=float, default=0.5)
+    ap.add_argument('--max-size', type=int, default=256)
+    args = ap.parse_args()
+
+    if args.image:
+        test_frame = cv2.imread(args.image)
+        if test_frame is None:
+            raise SystemExit(f"Could not read {args.image}")
+    else:
+        rng = np.random.default_rng(0)
+        test_frame = cv2.GaussianBlur(rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8), (5, 5), 0)
+
+    timings = benchmark(test_frame, runs=args.runs, roi=args.roi, max_size=args.max_size)
+    values = SharpnessEngine(metrics=METRICS, roi=args.roi, max_size=args.max_size).measure(test_frame)
+
+    print(f"Frame {test_frame.shape[1]}x{test_frame.shape[0]}, ROI {args.roi}, max size {args.max_size} px")
+    print(f"{'metric':<22}{'value':>12}{'engine ms':>12}{'full frame ms':>16}")
+    for name in METRICS:
+        full_frame = f"{timings['full_frame'][name]:.2f}" if name in timings['full_frame'] else '-'
+        print(f"{name:<22}{values[name]:>12.2f}{timings['engine'][name]:>12.2f}{full_frame:>16}")
+    print(f"{'all, shared':<22}{'':>12}{timings['engine']['all']:>12.2f}")
@@ -0,0 +1,145 @@
+import time
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from utils.clock import VirtualClock
+from utils.output_manager import FakeRelayBackend
+
+
+def on_intervals(edges, end_time: float) -> Dict[int, List[Tuple[float, float]]]:
+    """(on, off) times of every relay from FakeRelayBackend edges, relays still on are closed at end_time."""
+    intervals = defaultdict(list)
+    on_since = {}
+    for edge_time, relay, on in edges:
+        if on:
+            on_since.setdefault(relay, edge_time)
+        elif relay in on_since:
+            intervals[relay].append((on_since.pop(relay), edge_time))
+
+    for relay, since in on_since.items():
+        intervals[relay].append((since, end_time))
+
+    return intervals
+
+
+def check_actuation(jobs, edges, end_time: float, tolerance: float = 0.005) -> Dict:
+    """
+    Compare the jobs sent to the relay controller with the relay edges that followed. A job is met when its relay
+    was on from its start time until its start time plus duration, within tolerance. Jobs that would have run past
+    the end of the recording are counted separately, the relays are switched off when the pass ends.
+
+    :param jobs: (relay, start time, duration) for every job
+    :param edges: (time, relay, on) for every relay edge
+    """
+    intervals = on_intervals(edges, end_time)
+    met, missed, truncated = 0, [], 0
+    max_on_delay = 0.0
+
+    for relay, start, duration in jobs:
+        end = start + duration
+        if end > end_time:
+            truncated += 1
+            continue
+
+        overlapping = [(on, off) for on, off in intervals.get(relay, []) if on <= end and off >= start]
+        if any(on <= start + tolerance and off >= end - tolerance for on, off in overlapping):
+            met += 1
+        else:
+            missed.append((relay, start, duration))
+
+        if overlapping:
+            max_on_delay = max(max_on_delay, overlapping[0][0] - start)
+
+    return {'jobs': len(jobs), 'met': met, 'missed': missed, 'truncated': truncated,
+            'max_on_delay': max_on_delay, 'intervals': intervals}
+
+
+class SimulationRunner:
+    """
+    Runs Owl.hoot over a recorded video or image directory on a VirtualClock. Each frame read advances simulated
+    time by one recorded frame, relays switch on the fake relay backend at the simulated times they would in the
+    field, and the run takes only as long as the detection itself. Every job sent to the relay controller is logged
+    and checked against the relay edges afterwards.
+    """
+
+    def __init__(self, config_file: str, input_file_or_directory: str, start: float = 0.0,
+                 tolerance: float = 0.005):
+        """
+        :param config_file: config path relative to the owl directory, as for Owl
+        :param input_file_or_directory: recorded video, image or directory of images
+        :param start: simulated start time in seconds since the epoch
+        :param tolerance: seconds a relay edge may differ from its job and still count as met
+        """
+        self.config_file = config_file
+        self.input_file_or_directory = input_file_or_directory
+        self.start = start
+        self.tolerance = tolerance
+        self.jobs = []
+
+    def run(self) -> Dict:
+        from owl import Owl
+
+        clock = VirtualClock(start=self.start)
+        owl = Owl(config_file=self.config_file, input_file_or_directory=self.input_file_or_directory, clock=clock)
+
+        # never drive real relays in a simulation, record the edges instead
+        relay = owl.relay_controller.relay
+        if not isinstance(relay.backend, FakeRelayBackend):
+            if relay.backend is not None:
+                relay.backend.close()
+            relay.backend = FakeRelayBackend(relay.relay_dict, clock=clock)
+        backend = relay.backend
+        backend.edges.clear()
+
+        receive = owl.relay_controller.receive
+
+        def logged_receive(relay, time_stamp, location=0, delay=0, duration=1):
+            self.jobs.append((relay, time_stamp + delay, duration))
+            receive(relay=relay, time_stamp=time_stamp, location=location, delay=delay, duration=duration)
+
+        owl.relay_controller.receive = logged_receive
+
+        real_start = time.perf_counter()
+        try:
+            owl.hoot()
+        except SystemExit:
+            # Owl.stop exits once the recording runs out
+            pass
+        real_seconds = time.perf_counter() - real_start
+
+        end_time = clock.time()
+        report = check_actuation(self.jobs, list(backend.edges), end_time, tolerance=self.tolerance)
+        report.update({
+            'end_time': end_time,
+            'simulated_seconds': clock.elapsed,
+            'real_seconds': real_seconds,
+            'speed_up': clock.elapsed / max(real_seconds, 1e-6),
+            'on_time': {relay: sum(off - on for on, off in spans) for relay, spans in report['intervals'].items()},
+        })
+
+        return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.simulation --input recording.mp4
+    ap = argparse.ArgumentParser(description='Replay a recording through OWL in simulated time and check the relay '
+                                             'timing.')
+    ap.add_argument('--input', type=str, required=True, help='recorded video, image or directory of images')
+    ap.add_argument('--config', type=str, default='config/DAY_SENSITIVITY_2.ini')
+    ap.add_argument('--tolerance', type=float, default=0.005, help='allowed relay timing error in seconds')
+    args = ap.parse_args()
+
+    result = SimulationRunner(args.config, args.input, tolerance=args.tolerance).run()
+
+    print(f"Simulated {result['simulated_seconds']:.1f} s in {result['real_seconds']:.1f} s "
+          f"({result['speed_up']:.1f}x real time)")
+    print(f"Jobs: {result['jobs']}, met {result['met']}, missed {len(result['missed'])}, "
+          f"cut off by the end of the recording {result['truncated']}")
+    print(f"Longest delay from job start to relay on: {1000 * result['max_on_delay']:.1f} ms")
+    for relay_number in sorted(result['on_time']):
+        print(f"Relay {relay_number}: {len(result['intervals'][relay_number])} activations, "
+              f"{result['on_time'][relay_number]:.2f} s on")
+    for relay_number, start_time, duration in result['missed'][:10]:
+        print(f"Missed: relay {relay_number} at {start_time:.3f} s for {duration:.3f} s")
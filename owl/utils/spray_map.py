@@ -0,0 +1,383 @@
+import json
+import math
+import queue
+import time
+
+from datetime import datetime
+from pathlib import Path
+from queue import Queue
+from threading import Thread, Event, Lock
+from typing import Dict, Optional, Tuple, Union
+
+from utils.clock import SystemClock
+from utils.log_manager import LogManager
+
+FILE_SUFFIX = '.geojsonl'
+EARTH_RADIUS = 6371000.0
+METRES_PER_DEGREE = 111320.0
+
+
+class LocationSource:
+    """
+    Where the boom is. position() returns (x, y, heading) and distance() the metres travelled since start. GPS sources
+    give x, y as longitude and latitude, the others as metres along and across the direction of travel in a local frame.
+    Both are called from the relay threads, so they must only read state kept up to date elsewhere.
+    """
+    geographic = False
+
+    def start(self) -> None:
+        pass
+
+    def position(self) -> Optional[Tuple[float, float, float]]:
+        raise NotImplementedError
+
+    def distance(self) -> float:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        pass
+
+
+class FixedSpeedLocation(LocationSource):
+    """Distance from a fixed travel speed, for when there is no GPS or wheel encoder."""
+
+    def __init__(self, speed: float, clock: Optional[SystemClock] = None):
+        """
+        :param speed: travel speed in km/h
+        :param clock: the clock the relay events are timed with, so distance follows simulated time too
+        """
+        self.speed = speed / 3.6
+        self.clock = clock or SystemClock()
+        self.start_time = self.clock.time()
+
+    def start(self) -> None:
+        self.start_time = self.clock.time()
+
+    def distance(self) -> float:
+        return self.speed * (self.clock.time() - self.start_time)
+
+    def position(self) -> Optional[Tuple[float, float, float]]:
+        return self.distance(), 0.0, 0.0
+
+
+class EncoderLocation(LocationSource):
+    """Distance from a wheel encoder counted on a GPIO pin."""
+
+    def __init__(self, pin: int, pulses_per_metre: float):
+        self.logger = LogManager.get_logger(__name__)
+        self.pin = pin
+        self.pulses_per_metre = pulses_per_metre
+        self.pulses = 0
+        self.encoder = None
+
+    def start(self) -> None:
+        try:
+            from gpiozero import DigitalInputDevice
+
+            self.encoder = DigitalInputDevice(pin=f'BOARD{self.pin}')
+            self.encoder.when_activated = self._count
+
+        except Exception as e:
+            self.logger.error(f"[ERROR] Could not start the wheel encoder on pin {self.pin}: {e}")
+
+    def _count(self) -> None:
+        self.pulses += 1
+
+    def distance(self) -> float:
+        return self.pulses / self.pulses_per_metre
+
+    def position(self) -> Optional[Tuple[float, float, float]]:
+        return self.distance(), 0.0, 0.0
+
+    def stop(self) -> None:
+        if self.encoder:
+            self.encoder.close()
+
+
+class GPSLocation(LocationSource):
+    """
+    Latest fix from an NMEA receiver ($GPRMC/$GNRMC sentences) read on a background thread. Uses pyserial if it is
+    installed, otherwise reads the device directly, which works for USB receivers that do not need a baud rate set.
+    """
+    geographic = True
+
+    def __init__(self, port: str = '/dev/ttyACM0', baud: int = 9600, max_age: float = 2.0,
+                 clock: Optional[SystemClock] = None):
+        self.logger = LogManager.get_logger(__name__)
+        self.port = port
+        self.baud = baud
+        self.max_age = max_age
+        self.clock = clock or SystemClock()
+
+        self.lock = Lock()
+        self.fix = None
+        self.fix_time = 0.0
+        self.travelled = 0.0
+
+        self.stop_event = Event()
+        self.reader = Thread(target=self._read, name='GPSLocation', daemon=True)
+
+    def start(self) -> None:
+        self.reader.start()
+
+    def _open(self):
+        try:
+            import serial
+            return serial.Serial(self.port, self.baud, timeout=1)
+        except ImportError:
+            return open(self.port, 'rb', buffering=0)
+
+    def _read(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                with self._open() as device:
+                    self.logger.info(f"[INFO] Reading GPS from {self.port}")
+                    while not self.stop_event.is_set():
+                        line = device.readline()
+                        if line:
+                            self._parse(line.decode('ascii', errors='ignore').strip())
+
+            except OSError as e:
+                self.logger.warning(f"[WARNING] GPS on {self.port} unavailable: {e}")
+                self.stop_event.wait(5)
+
+    def _parse(self, sentence: str) -> None:
+        fields = sentence.split('*')[0].split(',')
+        if len(fields) < 9 or not fields[0].endswith('RMC') or fields[2] != 'A':
+            return
+
+        try:
+            lat = int(fields[3][:2]) + float(fields[3][2:]) / 60
+            lon = int(fields[5][:3]) + float(fields[5][3:]) / 60
+            lat = -lat if fields[4] == 'S' else lat
+            lon = -lon if fields[6] == 'W' else lon
+            heading = float(fields[8]) if fields[8] else None
+        except ValueError:
+            return
+
+        with self.lock:
+            if self.fix is not None:
+                self.travelled += haversine(self.fix[0], self.fix[1], lon, lat)
+                heading = self.fix[2] if heading is None else heading
+            self.fix = (lon, lat, heading or 0.0)
+            self.fix_time = self.clock.time()
+
+    def distance(self) -> float:
+        return self.travelled
+
+    def position(self) -> Optional[Tuple[float, float, float]]:
+        with self.lock:
+            if self.fix is None or self.clock.time() - self.fix_time > self.max_age:
+                return None
+            return self.fix
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Distance in metres between two longitude, latitude points."""
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def location_from_config(config, clock: Optional[SystemClock] = None) -> LocationSource:
+    source = config.get('SprayMap', 'location_source', fallback='speed').strip().lower()
+    if source == 'gps':
+        return GPSLocation(port=config.get('SprayMap', 'gps_port', fallback='/dev/ttyACM0'),
+                           baud=config.getint('SprayMap', 'gps_baud', fallback=9600),
+                           clock=clock)
+    if source == 'encoder':
+        return EncoderLocation(pin=config.getint('SprayMap', 'encoder_pin'),
+                               pulses_per_metre=config.getfloat('SprayMap', 'pulses_per_metre'))
+    if source == 'speed':
+        return FixedSpeedLocation(speed=config.getfloat('SprayMap', 'fixed_speed', fallback=5.0), clock=clock)
+
+    raise ValueError(f"[SprayMap] location_source must be gps, encoder or speed, got '{source}'")
+
+
+class SprayMap:
+    """
+    As-applied map of a session. The RelayController reports each relay switching on and off; every completed on
+    interval becomes one GeoJSON LineString feature along the nozzle's path, queued and appended to a
+    newline-delimited GeoJSON file by a worker thread. Only the open interval of each relay and running totals are
+    kept in memory, so a long session does not grow RAM. The last line is a session feature with the distance
+    travelled and the sprayed and covered areas, which summarise() reads back to compute chemical savings.
+    """
+
+    def __init__(self, directory: Union[str, Path], relay_num: int, boom_width: float, location: LocationSource,
+                 flush_interval: float = 1.0, max_queue: int = 1000, clock: Optional[SystemClock] = None):
+        """
+        :param directory: where the session file is written
+        :param relay_num: number of relays across the boom
+        :param boom_width: width covered by all relays in metres, each relay covers an equal share
+        :param location: where the boom is when relays switch
+        :param clock: the clock the relay events are timed with
+        """
+        self.logger = LogManager.get_logger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"spray_map_{datetime.now().strftime('%Y%m%dT%H%M%S')}{FILE_SUFFIX}"
+
+        self.relay_num = relay_num
+        self.boom_width = boom_width
+        self.nozzle_width = boom_width / relay_num
+        self.location = location
+        self.clock = clock or SystemClock()
+
+        self.open_intervals = [None] * relay_num
+        self.sprayed_length = [0.0] * relay_num
+        self.intervals = 0
+        self.dropped_features = 0
+
+        self.flush_interval = flush_interval
+        self.queue = Queue(maxsize=max_queue)
+        self.stop_event = Event()
+        self.worker = Thread(target=self._process_queue, name='SprayMap', daemon=True)
+
+        self.location.start()
+        self.worker.start()
+        self.logger.info(f"[INFO] Writing spray map to {self.path}")
+
+    def record(self, relay: int, status: bool, time_stamp: Optional[float] = None) -> None:
+        """Called by the relay threads when a relay switches on (status True) or off."""
+        time_stamp = self.clock.time() if time_stamp is None else time_stamp
+        if status:
+            self.open_intervals[relay] = (time_stamp, self.location.position(), self.location.distance())
+            return
+
+        opened = self.open_intervals[relay]
+        self.open_intervals[relay] = None
+        if opened is None:
+            return
+
+        start_time, start_position, start_distance = opened
+        length = self.location.distance() - start_distance
+        self.sprayed_length[relay] += length
+        self.intervals += 1
+
+        end_position = self.location.position()
+        if start_position is None or end_position is None:
+            # no fix, the interval still counts towards the totals
+            return
+
+        self._put({
+            'type': 'Feature',
+            'geometry': {
+                'type': 'LineString',
+                'coordinates': [self._nozzle_position(relay, start_position),
+                                self._nozzle_position(relay, end_position)]
+            },
+            'properties': {
+                'relay': relay,
+                'start': round(start_time, 3),
+                'duration': round(time_stamp - start_time, 3),
+                'length_m': round(length, 3),
+                'area_m2': round(length * self.nozzle_width, 4)
+            }
+        })
+
+    def _nozzle_position(self, relay: int, position: Tuple[float, float, float]) -> list:
+        # offset from the boom centre to the nozzle, at right angles to the heading
+        x, y, heading = position
+        offset = (relay - (self.relay_num - 1) / 2) * self.nozzle_width
+        if not self.location.geographic:
+            return [round(x, 3), round(offset, 3)]
+
+        bearing = math.radians(heading + 90)
+        lat = y + offset * math.cos(bearing) / METRES_PER_DEGREE
+        lon = x + offset * math.sin(bearing) / (METRES_PER_DEGREE * math.cos(math.radians(y)))
+        return [round(lon, 7), round(lat, 7)]
+
+    def _put(self, feature: Dict) -> None:
+        try:
+            self.queue.put_nowait(feature)
+        except queue.Full:
+            self.dropped_features += 1
+
+    def totals(self) -> Dict[str, float]:
+        travelled = self.location.distance()
+        sprayed = sum(self.sprayed_length) * self.nozzle_width
+        covered = travelled * self.boom_width
+        return {
+            'travelled_m': round(travelled, 2),
+            'sprayed_area_m2': round(sprayed, 2),
+            'covered_area_m2': round(covered, 2),
+            'intervals': self.intervals
+        }
+
+    def _process_queue(self) -> None:
+        with open(self.path, 'a') as f:
+            last_flush = time.time()
+            while not self.stop_event.is_set() or not self.queue.empty():
+                try:
+                    feature = self.queue.get(timeout=0.1)
+                    f.write(json.dumps(feature, separators=(',', ':')) + '\n')
+                except queue.Empty:
+                    pass
+                except (OSError, TypeError, ValueError) as e:
+                    self.logger.error(f"Error writing spray map: {e}", exc_info=True)
+
+                if time.time() - last_flush >= self.flush_interval:
+                    f.flush()
+                    last_flush = time.time()
+
+            f.write(json.dumps({'type': 'Feature', 'geometry': None,
+                                'properties': {'session': True, 'boom_width_m': self.boom_width,
+                                               'relay_num': self.relay_num, **self.totals()}},
+                               separators=(',', ':')) + '\n')
+
+    def stop(self) -> None:
+        """Close any open intervals, write the session totals and close the file."""
+        for relay, opened in enumerate(self.open_intervals):
+            if opened is not None:
+                self.record(relay, False)
+
+        self.stop_event.set()
+        self.worker.join()
+        self.location.stop()
+
+        totals = self.totals()
+        self.logger.info(f"[INFO] Spray map: {totals['sprayed_area_m2']} m2 sprayed of "
+                         f"{totals['covered_area_m2']} m2 covered over {totals['travelled_m']} m")
+
+
+def summarise(path: Union[str, Path]) -> Dict[str, float]:
+    """Stream a spray map file and total the sprayed area. Uses the session line for the covered area if present."""
+    sprayed = 0.0
+    intervals = 0
+    session = {}
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                feature = json.loads(line)
+            except ValueError:
+                continue
+
+            properties = feature.get('properties') or {}
+            if properties.get('session'):
+                session = properties
+            else:
+                sprayed += properties.get('area_m2', 0.0)
+                intervals += 1
+
+    summary = {'intervals': intervals, 'mapped_area_m2': round(sprayed, 2)}
+    summary.update({key: session[key] for key in ('travelled_m', 'sprayed_area_m2', 'covered_area_m2')
+                    if key in session})
+    if summary.get('covered_area_m2'):
+        summary['saving_percent'] = round(100 * (1 - summary['sprayed_area_m2'] / summary['covered_area_m2']), 1)
+
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # run from the owl directory: python -m utils.spray_map logs/spray_maps
+    ap = argparse.ArgumentParser(description='Summarise OWL spray maps and the chemical saved against blanket spraying.')
+    ap.add_argument('directory', type=str, help='directory containing .geojsonl spray maps')
+    args = ap.parse_args()
+
+    for map_path in sorted(Path(args.directory).glob(f'*{FILE_SUFFIX}')):
+        print(f"{map_path.name}: {summarise(map_path)}")
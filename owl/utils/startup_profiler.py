@@ -0,0 +1,80 @@
+import time
+
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from utils.log_manager import LogManager
+
+
+def get_uptime() -> Optional[float]:
+    """Seconds since the system booted, None if unavailable (e.g. not on Linux)."""
+    try:
+        with open('/proc/uptime', 'r') as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """
+    Records how long each startup stage takes and when milestones such as the first frame or the first spray are
+    reached. Stages may run on different threads at the same time, so durations are recorded per stage and milestones
+    as the time since the process started. Where /proc/uptime is available the time since power-on is also reported.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.logger = LogManager.get_logger(__name__)
+        self.start = start if start is not None else time.perf_counter()
+
+        # uptime when the process started, so milestones can be reported relative to power-on
+        uptime = get_uptime()
+        self.boot_offset = uptime - (time.perf_counter() - self.start) if uptime is not None else None
+
+        self.stages = {}
+        self.milestones = {}
+        self.lock = Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block, e.g. with profiler.stage('camera'): ..."""
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.stages[name] = time.perf_counter() - stage_start
+
+    def mark(self, name: str) -> float:
+        """Record a milestone once and return the seconds since the process started."""
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.milestones.setdefault(name, elapsed)
+            return self.milestones[name]
+
+    def has(self, name: str) -> bool:
+        return name in self.milestones
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            summary = {
+                'stages_s': dict(self.stages),
+                'milestones_s': dict(self.milestones)
+            }
+
+        if self.boot_offset is not None:
+            summary['since_power_on_s'] = {name: self.boot_offset + elapsed
+                                           for name, elapsed in summary['milestones_s'].items()}
+
+        return summary
+
+    def report(self) -> None:
+        summary = self.summary()
+        stages = ', '.join(f"{name} {seconds:.2f} s" for name, seconds in summary['stages_s'].items())
+        milestones = ', '.join(f"{name} {seconds:.2f} s" for name, seconds in summary['milestones_s'].items())
+
+        self.logger.info(f"[INFO] Startup stages: {stages}")
+        self.logger.info(f"[INFO] Startup milestones since launch: {milestones}")
+        if 'since_power_on_s' in summary:
+            power_on = ', '.join(f"{name} {seconds:.1f} s" for name, seconds in summary['since_power_on_s'].items())
+            self.logger.info(f"[INFO] Startup milestones since power-on: {power_on}")
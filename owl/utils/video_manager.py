@@ -81,7 +81,8 @@ class WebcamStream:
 
 
 class PiCamera2Stream:
-    def __init__(self, src=0, resolution=(416, 320), exp_compensation=-2, **kwargs):
+    def __init__(self, src=0, resolution=(416, 320), exp_compensation=-2, warmup_time=2.0, exposure_controller=None,
+                 **kwargs):
         self.logger = LogManager.get_logger(__name__)
         self.name = 'Picamera2Stream'
         self.logger.info(f'Camera type: {self.name}')
@@ -90,6 +91,10 @@ class PiCamera2Stream:
         self.frame_height = None
         self.frame = None
         self.frame_available = False
+        self.frames_dropped = 0
+
+        # optional histogram exposure loop, run on the capture thread every few frames
+        self.exposure_controller = exposure_controller
 
         self.stopped = Event()
         self.condition = Condition()
@@ -153,8 +158,13 @@ class PiCamera2Stream:
             self.frame_width = self.camera.camera_configuration()['main']['size'][0]
             self.frame_height = self.camera.camera_configuration()['main']['size'][1]
 
-            # allow the camera time to warm up
-            time.sleep(2)
+            # allow the camera time to warm up, on fast start the first frames are used while exposure settles
+            time.sleep(warmup_time)
+
+            if self.exposure_controller:
+                metadata = self.camera.capture_metadata()
+                self.camera.set_controls(self.exposure_controller.start(exposure_time=metadata.get('ExposureTime'),
+                                                                        gain=metadata.get('AnalogueGain')))
 
         except Exception as e:
             self.logger.error(f"Failed to initialize PiCamera2: {e}", exc_info=True)
@@ -177,7 +187,15 @@ class PiCamera2Stream:
             while not self.stopped.is_set():
                 frame = self.camera.capture_array("main")
                 if frame is not None:
+                    if self.exposure_controller:
+                        controls = self.exposure_controller.update(frame)
+                        if controls:
+                            self.camera.set_controls(controls)
+
                     with self.lock:
+                        # the previous frame was never read by the main loop
+                        if self.frame_available:
+                            self.frames_dropped += 1
                         self.frame = frame
                         self.frame_available = True
 
@@ -285,7 +303,8 @@ class PiCameraStream:
 
 # overarching class to determine which stream to use
 class VideoStream:
-    def __init__(self, src=0, resolution=(416, 320), exp_compensation=-2, **kwargs):
+    def __init__(self, src=0, resolution=(416, 320), exp_compensation=-2, warmup_time=2.0, exposure_controller=None,
+                 **kwargs):
         self.CAMERA_VERSION = PICAMERA_VERSION if PICAMERA_VERSION is not None else 'webcam'
         self.logger = LogManager.get_logger(__name__)
         self.frame_height = None
@@ -295,7 +314,8 @@ class VideoStream:
             self.stream = PiCameraStream(resolution=resolution, exp_compensation=exp_compensation, **kwargs)
 
         elif self.CAMERA_VERSION == 'picamera2':
-            self.stream = PiCamera2Stream(src=src, resolution=resolution, exp_compensation=exp_compensation, **kwargs)
+            self.stream = PiCamera2Stream(src=src, resolution=resolution, exp_compensation=exp_compensation,
+                                          warmup_time=warmup_time, exposure_controller=exposure_controller, **kwargs)
 
         elif self.CAMERA_VERSION == 'webcam':
             self.stream = WebcamStream(src=src)
@@ -304,6 +324,9 @@ class VideoStream:
             self.logger.error(f"Unsupported camera version: {self.CAMERA_VERSION}")
             raise ValueError(f"Unsupported camera version: {self.CAMERA_VERSION}")
 
+        if exposure_controller and self.CAMERA_VERSION != 'picamera2':
+            self.logger.warning(f"[WARNING] Exposure control needs picamera2, not available for {self.CAMERA_VERSION}.")
+
         # set the image dimensions directly from the frame streamed
         self.frame_width = self.stream.frame_width
         self.frame_height = self.stream.frame_height
@@ -320,6 +343,11 @@ class VideoStream:
         # return the current frame
         return self.stream.read()
 
+    @property
+    def frames_dropped(self):
+        # captured frames replaced before the main loop read them, where the stream can tell
+        return getattr(self.stream, 'frames_dropped', None)
+
     def stop(self):
         # stop the thread and release any resources
         self.stream.stop()
@@ -0,0 +1,125 @@
+import json
+import os
+import cv2
+import numpy as np
+
+from datetime import datetime
+from queue import Queue, Full, Empty
+from threading import Thread
+from utils.log_manager import LogManager
+
+
+class VideoRecorder:
+    """
+    Records video on a background thread so encoding never shows up in the detection FPS. Frames are queued with
+    their real capture time; the writer repeats or skips frames so the file plays back in real time at the nominal
+    fps, whatever the actual detection rate. A JSON lines sidecar stores the capture time and detections for every
+    recorded frame, so headless units can record raw frames and overlay the detections later.
+    """
+
+    def __init__(self, save_directory='.', codec='mp4v', fps=30.0, max_queue=64, annotate=True, max_repeat=None):
+        self.logger = LogManager.get_logger(__name__)
+        if len(codec) != 4:
+            raise ValueError(f"Video codec must be a four character code (e.g. mp4v, MJPG), got '{codec}'")
+
+        self.save_directory = save_directory
+        self.codec = codec
+        self.fps = fps
+        self.annotate = annotate
+        # cap on repeated frames for a single gap (e.g. a stall), defaults to two seconds of video
+        self.max_repeat = max_repeat if max_repeat is not None else int(2 * fps)
+
+        self.queue = Queue(maxsize=max_queue)
+        self.dropped_frames = 0
+        self.frames_written = 0
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        extension = 'avi' if codec.upper() in ('MJPG', 'XVID', 'FFV1') else 'mp4'
+        self.video_path = os.path.join(save_directory, f"owl_recording_{timestamp}.{extension}")
+        self.metadata_path = os.path.join(save_directory, f"owl_recording_{timestamp}.jsonl")
+
+        self.writer = None
+        self.metadata_file = None
+        self.first_capture_time = None
+
+        self.running = True
+        self.thread = Thread(target=self._run, name='VideoRecorder', daemon=True)
+        self.thread.start()
+        self.logger.info(f"[INFO] Recording video to {self.video_path}")
+
+    def add_frame(self, frame, capture_time, boxes=None, centres=None):
+        """Queue a frame for recording. Never blocks; returns False if the frame was dropped."""
+        try:
+            self.queue.put_nowait((frame, capture_time, boxes, centres))
+            return True
+
+        except Full:
+            self.dropped_frames += 1
+            return False
+
+    def _run(self):
+        try:
+            while self.running or not self.queue.empty():
+                try:
+                    frame, capture_time, boxes, centres = self.queue.get(timeout=0.5)
+                except Empty:
+                    continue
+
+                self._write(frame, capture_time, boxes, centres)
+
+        except Exception as e:
+            self.logger.error(f"Error in video recorder: {e}", exc_info=True)
+
+        finally:
+            if self.writer is not None:
+                self.writer.release()
+            if self.metadata_file is not None:
+                self.metadata_file.close()
+
+    def _open(self, frame, capture_time):
+        height, width = frame.shape[:2]
+        fourcc = cv2.VideoWriter_fourcc(*self.codec)
+        self.writer = cv2.VideoWriter(self.video_path, fourcc, self.fps, (width, height))
+        if not self.writer.isOpened():
+            raise IOError(f"Could not open video writer for {self.video_path} with codec {self.codec}")
+
+        self.metadata_file = open(self.metadata_path, 'w')
+        self.first_capture_time = capture_time
+
+    def _write(self, frame, capture_time, boxes, centres):
+        if self.writer is None:
+            self._open(frame, capture_time)
+
+        # place the frame on the video timeline by its capture time, frames arriving faster than the nominal fps
+        # are skipped in the video but their detections are still kept in the metadata
+        target_index = int(round((capture_time - self.first_capture_time) * self.fps))
+        repeats = min(target_index - self.frames_written + 1, self.max_repeat)
+
+        self.metadata_file.write(json.dumps({
+            'video_frame': self.frames_written if repeats > 0 else self.frames_written - 1,
+            'written': repeats > 0,
+            'capture_time': capture_time,
+            'boxes': np.asarray(boxes).tolist() if boxes is not None else [],
+            'centres': np.asarray(centres).tolist() if centres is not None else []
+        }) + '\n')
+
+        if repeats <= 0:
+            return
+
+        if self.annotate and boxes is not None and len(boxes) > 0:
+            frame = frame.copy()
+            for x, y, w, h in np.asarray(boxes).reshape(-1, 4).astype(int):
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 2)
+
+        for _ in range(repeats):
+            self.writer.write(frame)
+        self.frames_written += repeats
+
+    def stop(self):
+        """Finish writing the queued frames and close the files."""
+        self.running = False
+        self.thread.join()
+
+        if self.dropped_frames:
+            self.logger.warning(f"[WARNING] Video recorder dropped {self.dropped_frames} frames, queue was full.")
+        self.logger.info(f"[INFO] Video saved to {self.video_path} ({self.frames_written} frames)")
@@ -1,7 +1,11 @@
+import os
+import sys
 import time
 import numpy as np
 import warnings
 
+from threading import Thread, Event
+
 class BasicTerminal:
     def __init__(self):
         self.width = 80
@@ -32,7 +36,13 @@ except ModuleNotFoundError:
 
 
 class RelayVis:
-    def __init__(self, relays=4):
+    """
+    Terminal boxes showing which nozzles are on. The relay threads only write their state into an array with
+    update(); a single render thread redraws the boxes that changed at refresh_rate, in one write to stdout, so
+    drawing never holds up a relay. A nozzle that switched on and off between two redraws is still shown on for one.
+    """
+
+    def __init__(self, relays=4, refresh_rate=20.0):
         self.term = Terminal()
         self.relays = relays
         self.width = self.term.width
@@ -40,39 +50,88 @@ class RelayVis:
         self.box_width = 10
         self.active_color = [50, 255, 50]
         self.inactive_color = [100, 100, 100]
+        self.refresh_interval = 1.0 / refresh_rate
 
-        self.status_list = [False for i in range(relays)]
+        self.status_list = np.zeros(relays, dtype=bool)
+        self.switched_on = np.zeros(relays, dtype=bool)
+        self.drawn = np.zeros(relays, dtype=bool)
         self.x_positions = [(relay * self.box_width + relay * 2) for relay in range(relays)]
 
+        # the escape sequences for each box are built once, inactive at index 0 and active at index 1
+        self.box_strings = [[self._box_string(x_pos, color) for color in (self.inactive_color, self.active_color)]
+                            for x_pos in self.x_positions]
+
+        self.stop_event = Event()
+        self.render_thread = None
+
+    def _box_string(self, x_pos, color):
+        r, g, b = color
+        return self.term.move_x(x_pos) + self.term.on_color_rgb(r, g, b) + " " * self.box_width + self.term.normal
+
     def setup(self):
         for id, pos in enumerate(self.x_positions):
             print(self.term.move_x(pos), f'Nozzle {id + 1}', end=' ')
         print('\r')
-        for i, x_pos in enumerate(self.x_positions):
-            r, g, b = self.inactive_color
-            box_str = self.term.on_color_rgb(r, g, b) + " " * (self.box_width) + self.term.normal
-            print(self.term.move_x(x_pos) + f"{box_str}", end='', flush=True)
+        print(''.join(boxes[0] for boxes in self.box_strings), end='', flush=True)
+
+        self.render_thread = Thread(target=self._render_loop, name='RelayVis', daemon=True)
+        self.render_thread.start()
 
     def update(self, relay=1, status=True):
+        """Called from the relay threads, only records the state for the render thread."""
         self.status_list[relay] = status
+        if status:
+            self.switched_on[relay] = True
+
+    def render(self):
+        """Redraw the boxes whose state changed since the last redraw in a single write."""
+        shown = self.status_list | self.switched_on
+        self.switched_on[:] = False
 
-        if self.status_list[relay]:
-            r, g, b = self.active_color
-            box_str = self.term.on_color_rgb(r, g, b) + " " * (self.box_width) + self.term.normal
-            print(self.term.move_x(self.x_positions[relay]) + f"{box_str}", end="", flush=True)
-        else:
-            r, g, b = self.inactive_color
-            box_str = self.term.on_color_rgb(r, g, b) + " " * (self.box_width) + self.term.normal
-            print(self.term.move_x(self.x_positions[relay]) + f"{box_str}", end="", flush=True)
+        changed = np.flatnonzero(shown != self.drawn)
+        if len(changed) == 0:
+            return
+
+        sys.stdout.write(''.join(self.box_strings[relay][int(shown[relay])] for relay in changed))
+        sys.stdout.flush()
+        self.drawn = shown
+
+    def _render_loop(self):
+        while not self.stop_event.wait(self.refresh_interval):
+            self.render()
 
     def close(self):
+        self.stop_event.set()
+        if self.render_thread is not None:
+            self.render_thread.join()
+            self.render()
         print("\n", end='\n')
 
 if __name__ == "__main__":
     box_drawer = RelayVis(relays=4)
+    box_drawer.setup()
 
     for i in range(0, 100):
         relay = np.random.randint(0, 4)
         status = bool(np.random.randint(0, 2))
         box_drawer.update(relay=relay, status=status)
         time.sleep(0.01)
+
+    box_drawer.close()
+
+    # cost of update() on the relay threads compared with printing every edge, written to /dev/null
+    edges = 10000
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        start = time.perf_counter()
+        for i in range(edges):
+            print(box_drawer.box_strings[i % 4][i % 2], end='', flush=True)
+        print_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(edges):
+            box_drawer.update(relay=i % 4, status=bool(i % 2))
+        update_time = time.perf_counter() - start
+        sys.stdout = stdout
+
+    print(f"print per edge: {1e6 * print_time / edges:.2f} us, update per edge: {1e6 * update_time / edges:.2f} us")
@@ -1,5 +1,7 @@
+import json
 import logging
 from dataclasses import dataclass
+from pathlib import Path
 import platform
 import sys
 import subprocess
@@ -61,3 +63,37 @@ class SystemInfo:
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
             SystemInfo.logger.warning("Git information could not be retrieved: %s", e)
             return None
+
+    @staticmethod
+    def get_cached_info(cache_path) -> dict:
+        """
+        Return OS, Python, hardware and git information, reusing the copy saved at cache_path when the OWL version
+        and git HEAD are unchanged. Avoids the git and uname subprocess calls on every boot.
+        """
+        # the repository root is one level above the owl directory, its reflog changes on every pull or checkout
+        git_log = Path(__file__).resolve().parent.parent / '.git' / 'logs' / 'HEAD'
+        key = {'version': str(VERSION), 'git_head': git_log.stat().st_mtime if git_log.exists() else None}
+
+        cache_path = Path(cache_path)
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['info']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        info = {
+            'os': SystemInfo.get_os_info(),
+            'python': SystemInfo.get_python_info(),
+            'rpi': SystemInfo.get_rpi_info(),
+            'git': SystemInfo.get_git_info()
+        }
+
+        try:
+            with open(cache_path, 'w') as f:
+                json.dump({'key': key, 'info': info}, f)
+        except OSError as e:
+            SystemInfo.logger.warning("System information could not be cached: %s", e)
+
+        return info